@@ -0,0 +1,262 @@
+"""
+Benchmark dos algoritmos da classe Sudoku sobre os arquivos de problemas de "arquivos_de_texto".
+
+Uso:
+    python -m benchmark [--algoritmos DLX BACKTRACKING ...] [--corpora ARQ ...] [--timeout S] [--aquecimento N]
+                        [--repeticoes N] [--saida resultados.json]
+    python -m benchmark --comparar ANTIGO.json NOVO.json [--tolerancia 0.1]
+
+Cada problema é resolvido em um processo separado (para que um limite de tempo possa ser imposto), com "aquecimento"
+execuções descartadas e "repeticoes" execuções medidas com time.perf_counter. O tempo de um problema é a mediana das
+repetições; para cada algoritmo e arquivo são registrados p50, p95, máximo e o pico de memória (medido com tracemalloc
+em uma execução à parte, para não distorcer os tempos). Os resultados são gravados em JSON e dois JSONs podem ser
+comparados para apontar regressões.
+"""
+from sudoku import Sudoku, ALGORITMOS
+from medidas import percentil
+from multiprocessing import Pool, TimeoutError
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+CORPORA = [
+    'arquivos_de_texto/top8.txt',
+    'arquivos_de_texto/top50.txt',
+    'arquivos_de_texto/problemas_faceis.txt',
+    'arquivos_de_texto/exemplo_problemas.txt',
+]
+
+
+def mede_problema(algoritmo: str, problema: str, aquecimento: int = 1, repeticoes: int = 3,
+                  medir_memoria: bool = True) -> dict:
+    """
+    :param algoritmo: Nome do algoritmo (uma das chaves de ALGORITMOS)
+    :param problema: String contendo o problema
+    :param aquecimento: Quantidade de execuções descartadas antes das medidas
+    :param repeticoes: Quantidade de execuções medidas
+    :param medir_memoria: Se True, faz uma execução extra com tracemalloc para medir o pico de memória
+    :return: Dicionário com os tempos (em segundos) de cada repetição, o pico de memória (em bytes, ou None) e se a
+             solução encontrada é válida
+    """
+    for _ in range(aquecimento):
+        Sudoku(problema).resolve(algoritmo)
+
+    tempos = []
+    sudoku = None
+    for _ in range(repeticoes):
+        sudoku = Sudoku(problema)
+        t0 = time.perf_counter()
+        sudoku.resolve(algoritmo)
+        tempos.append(time.perf_counter() - t0)
+
+    memoria_pico = None
+    if medir_memoria:
+        tracemalloc.start()
+        Sudoku(problema).resolve(algoritmo)
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    resolvido = sudoku is not None and sudoku.solucao is not None and Sudoku.atingiu_objetivo(sudoku.solucao)
+    return {'tempos': tempos, 'memoria_pico': memoria_pico, 'resolvido': resolvido}
+
+
+def resume(medidas: list) -> dict:
+    """
+    :param medidas: Lista com o retorno de mede_problema de cada problema (ou None, para os que estouraram o tempo ou
+                    foram pulados)
+    :return: Estatísticas agregadas (tempos em segundos e memória em bytes)
+    """
+    tempos = [percentil(m['tempos'], 50) for m in medidas if m is not None]
+    memorias = [m['memoria_pico'] for m in medidas if m is not None and m['memoria_pico'] is not None]
+
+    return {
+        'problemas': len(medidas),
+        'medidos': len(tempos),
+        'resolvidos': sum(1 for m in medidas if m is not None and m['resolvido']),
+        'p50': percentil(tempos, 50),
+        'p95': percentil(tempos, 95),
+        'max': max(tempos) if tempos else None,
+        'media': sum(tempos) / len(tempos) if tempos else None,
+        'memoria_pico': max(memorias) if memorias else None,
+        'tempos': tempos,
+    }
+
+
+def executa_corpus(algoritmo: str, problemas: list, timeout: float, aquecimento: int, repeticoes: int,
+                   medir_memoria: bool, max_timeouts: int) -> dict:
+    """
+    :param algoritmo: Nome do algoritmo (uma das chaves de ALGORITMOS)
+    :param problemas: Lista de strings, cada uma representando um problema
+    :param timeout: Tempo máximo (em segundos) para as execuções de um problema
+    :param aquecimento: Quantidade de execuções descartadas antes das medidas
+    :param repeticoes: Quantidade de execuções medidas
+    :param medir_memoria: Se True, mede o pico de memória de cada problema
+    :param max_timeouts: Depois dessa quantidade de estouros de tempo, os problemas restantes do arquivo são pulados
+    :return: Estatísticas do algoritmo sobre os problemas (ver resume), além do número de estouros e de pulados
+    """
+    medidas = []
+    timeouts = 0
+    pool = Pool(1)
+    try:
+        for problema in problemas:
+            if timeouts >= max_timeouts:
+                medidas.append(None)
+                continue
+
+            tarefa = pool.apply_async(mede_problema, (algoritmo, problema, aquecimento, repeticoes, medir_memoria))
+            try:
+                medidas.append(tarefa.get(timeout))
+            except TimeoutError:  # O processo é encerrado e substituído por um novo
+                pool.terminate()
+                pool = Pool(1)
+                timeouts += 1
+                medidas.append(None)
+    finally:
+        pool.terminate()
+
+    resumo = resume(medidas)
+    resumo['timeouts'] = timeouts
+    resumo['pulados'] = len(problemas) - resumo['medidos'] - timeouts
+    return resumo
+
+
+def executa(algoritmos: list, corpora: list, timeout: float = 10.0, aquecimento: int = 1, repeticoes: int = 3,
+            medir_memoria: bool = True, max_timeouts: int = 3, verboso: bool = True) -> dict:
+    """
+    :param algoritmos: Nomes dos algoritmos (chaves de ALGORITMOS)
+    :param corpora: Caminhos dos arquivos de problemas
+    :param timeout: Tempo máximo (em segundos) para as execuções de um problema
+    :param aquecimento: Quantidade de execuções descartadas antes das medidas
+    :param repeticoes: Quantidade de execuções medidas
+    :param medir_memoria: Se True, mede o pico de memória de cada problema
+    :param max_timeouts: Estouros de tempo tolerados por algoritmo e arquivo antes de pular o restante do arquivo
+    :param verboso: Se True, imprime o resumo de cada algoritmo e arquivo conforme termina
+    :return: Dicionário com os metadados da execução e os resultados por algoritmo e arquivo
+    """
+    resultados = {}
+    for algoritmo in algoritmos:
+        resultados[algoritmo] = {}
+        for corpus in corpora:
+            with open(corpus) as arqv:
+                problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+            resumo = executa_corpus(algoritmo, problemas, timeout, aquecimento, repeticoes, medir_memoria,
+                                    max_timeouts)
+            resultados[algoritmo][os.path.basename(corpus)] = resumo
+            if verboso:
+                print(formata_linha(algoritmo, os.path.basename(corpus), resumo))
+
+    return {
+        'metadados': {
+            'data': dt.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'timeout': timeout,
+            'aquecimento': aquecimento,
+            'repeticoes': repeticoes,
+        },
+        'resultados': resultados,
+    }
+
+
+def _ms(segundos: float or None) -> str:
+    return '-' if segundos is None else f'{segundos * 1000:.3f}'
+
+
+def formata_linha(algoritmo: str, corpus: str, resumo: dict) -> str:
+    """
+    :return: Linha da tabela de resultados (tempos em milissegundos e memória em KiB)
+    """
+    memoria = '-' if resumo['memoria_pico'] is None else f'{resumo["memoria_pico"] / 1024:.1f}'
+    return (f'{algoritmo:<13}{corpus:<26}{resumo["resolvidos"]:>4}/{resumo["problemas"]:<4}'
+            f'{resumo["timeouts"]:>4} {_ms(resumo["p50"]):>11} {_ms(resumo["p95"]):>11} {_ms(resumo["max"]):>11} '
+            f'{memoria:>10}')
+
+
+def compara(antigo: dict, novo: dict, tolerancia: float = 0.10, minimo: float = 0.001) -> list:
+    """
+    :param antigo: Resultados (no formato de executa) usados como referência
+    :param novo: Resultados a serem verificados
+    :param tolerancia: Aumento relativo tolerado antes de considerarmos uma regressão (0.10 = 10%)
+    :param minimo: Diferença absoluta mínima de tempo (em segundos) para considerarmos uma regressão (evita ruído)
+    :return: Lista de mensagens, uma por regressão encontrada (vazia se não houver regressões)
+    """
+    regressoes = []
+    for algoritmo, por_corpus in novo['resultados'].items():
+        for corpus, resumo in por_corpus.items():
+            referencia = antigo['resultados'].get(algoritmo, {}).get(corpus)
+            if referencia is None:
+                continue
+
+            if resumo['timeouts'] > referencia['timeouts']:
+                regressoes.append(f'{algoritmo} em {corpus}: timeouts {referencia["timeouts"]} -> {resumo["timeouts"]}')
+            if resumo['resolvidos'] < referencia['resolvidos']:
+                regressoes.append(f'{algoritmo} em {corpus}: resolvidos '
+                                  f'{referencia["resolvidos"]} -> {resumo["resolvidos"]}')
+
+            for medida in ('p50', 'p95', 'max'):
+                antes, depois = referencia[medida], resumo[medida]
+                if antes is None or depois is None:
+                    continue
+                if depois > antes * (1 + tolerancia) and depois - antes > minimo:
+                    regressoes.append(f'{algoritmo} em {corpus}: {medida} {_ms(antes)} ms -> {_ms(depois)} ms '
+                                      f'(+{(depois / antes - 1) * 100:.1f}%)')
+
+            antes, depois = referencia['memoria_pico'], resumo['memoria_pico']
+            if antes is not None and depois is not None and depois > antes * (1 + tolerancia):
+                regressoes.append(f'{algoritmo} em {corpus}: memória {antes / 1024:.1f} KiB -> {depois / 1024:.1f} KiB')
+
+    return regressoes
+
+
+def le_argumentos(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Benchmark dos algoritmos do Sudoku.')
+    parser.add_argument('--algoritmos', nargs='+', default=list(ALGORITMOS), type=str.upper,
+                        help=f'Algoritmos medidos (padrão: todos, i.e., {" ".join(ALGORITMOS)})')
+    parser.add_argument('--corpora', nargs='+', default=CORPORA, help='Arquivos de problemas (padrão: os de arquivos_de_texto)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Tempo máximo por problema, em segundos (padrão: 10)')
+    parser.add_argument('--max-timeouts', type=int, default=3,
+                        help='Estouros de tempo por algoritmo e arquivo antes de pular o restante (padrão: 3)')
+    parser.add_argument('--aquecimento', type=int, default=1, help='Execuções descartadas por problema (padrão: 1)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Execuções medidas por problema (padrão: 3)')
+    parser.add_argument('--sem-memoria', action='store_true', help='Não mede o pico de memória')
+    parser.add_argument('--saida', default='benchmark.json', help='Arquivo JSON com os resultados (padrão: benchmark.json)')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTIGO', 'NOVO'), help='Compara dois JSONs de resultados')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='Aumento relativo tolerado na comparação (padrão: 0.10, i.e., 10%%)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = le_argumentos(sys.argv[1:])
+
+    if args.comparar:
+        with open(args.comparar[0]) as arqv:
+            antigo = json.load(arqv)
+        with open(args.comparar[1]) as arqv:
+            novo = json.load(arqv)
+
+        regressoes = compara(antigo, novo, args.tolerancia)
+        for regressao in regressoes:
+            print(f'REGRESSÃO: {regressao}')
+        print(f'{len(regressoes)} regressão(ões) encontrada(s).')
+        sys.exit(1 if regressoes else 0)
+
+    invalidos = [a for a in args.algoritmos if a not in ALGORITMOS]
+    if invalidos:
+        print(f'Opção inválida: {", ".join(invalidos)}')
+        sys.exit(2)
+
+    print(f'{"Algoritmo":<13}{"Arquivo":<26}{"Resolv.":<9}{"T.O.":>4} {"p50 (ms)":>11} {"p95 (ms)":>11} '
+          f'{"max (ms)":>11} {"mem (KiB)":>10}')
+    resultado = executa(args.algoritmos, args.corpora, args.timeout, args.aquecimento, args.repeticoes,
+                        not args.sem_memoria, args.max_timeouts)
+
+    with open(args.saida, 'w') as arqv:
+        json.dump(resultado, arqv, indent=2)
+    print(f'Resultados gravados em {args.saida}')
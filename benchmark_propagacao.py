@@ -0,0 +1,50 @@
+"""
+Comparação dos níveis de propagação do backtracking (ver sudoku.NIVEIS_PROPAGACAO): para cada nível, resolve todos os
+problemas de um arquivo e mostra quantos foram resolvidos, os nós expandidos, os retrocessos e o tempo gasto (total e em
+propagação), para escolher o nível com o melhor custo-benefício em cada tipo de problema.
+
+Uso:
+    python -m benchmark_propagacao [ARQUIVO_DE_TEXTO] [LIMITE_DE_PROBLEMAS]
+
+Por padrão usa todos os problemas de "arquivos_de_texto/top50.txt".
+"""
+import sys
+import time
+
+from sudoku import Sudoku, Estatisticas, NIVEIS_PROPAGACAO
+
+
+def mede_nivel(nivel: str, problemas: list) -> dict:
+    """
+    :param nivel: Nível de propagação (um dos NIVEIS_PROPAGACAO)
+    :param problemas: Lista de strings, cada uma representando um problema
+    :return: Dicionário com a quantidade de problemas resolvidos, as estatísticas somadas de todas as resoluções e o
+             tempo total (em segundos)
+    """
+    total = Estatisticas()
+    resolvidos = 0
+    t0 = time.perf_counter()
+    for problema in problemas:
+        estatisticas = Estatisticas()
+        sudoku = Sudoku(problema)
+        sudoku.backtracking(estatisticas=estatisticas, propagacao=nivel)
+        resolvidos += sudoku.solucao is not None
+        for campo in ('nos_expandidos', 'retrocessos', 'tempo_propagacao'):
+            setattr(total, campo, getattr(total, campo) + getattr(estatisticas, campo))
+
+    return {'resolvidos': resolvidos, 'nos_expandidos': total.nos_expandidos, 'retrocessos': total.retrocessos,
+            'tempo_propagacao': total.tempo_propagacao, 'tempo': time.perf_counter() - t0}
+
+
+if __name__ == '__main__':
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else 'arquivos_de_texto/top50.txt'
+    limite = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    with open(arquivo) as arqv:
+        problemas = [linha.strip() for linha in arqv if linha.strip()][:limite]
+
+    print(f'{"Nível":<13}{"Resolvidos":>11}{"Nós":>10}{"Retrocessos":>13}{"Propagação (s)":>16}{"Total (s)":>11}')
+    for nivel in NIVEIS_PROPAGACAO:
+        medida = mede_nivel(nivel, problemas)
+        print(f'{nivel:<13}{medida["resolvidos"]:>6}/{len(problemas):<4}{medida["nos_expandidos"]:>10}'
+              f'{medida["retrocessos"]:>13}{medida["tempo_propagacao"]:>16.3f}{medida["tempo"]:>11.3f}')
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark do índice de vizinhos pré-calculado (VIZINHOS) contra a implementação original de Sudoku.vizinhos, que
+recalculava os 20 vizinhos a cada chamada.
+
+Uso:
+    python -m benchmark_vizinhos [ARQUIVO_DE_TEXTO] [LIMITE_DE_PROBLEMAS]
+
+Por padrão roda o backtracking sobre todos os problemas de "arquivos_de_texto/top50.txt", contando quantas consultas ao
+índice de vizinhos foram feitas, e estima o custo dessas consultas antes (recalculando) e depois (índice).
+"""
+import sys
+import time
+import timeit
+
+import sudoku
+from sudoku import Sudoku
+
+
+def vizinhos_original(no: int) -> set:
+    """
+    :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80)
+    :return: Set contendo todos os vizinhos daquele nó (implementação anterior ao índice, mantida só para comparação)
+    """
+    n_linha = no // 9
+    n_coluna = no % 9
+
+    viz_linha = [n for n in range(9 * n_linha, 9 * (n_linha + 1)) if n != no]
+    viz_coluna = [n for n in range(n_coluna, n_coluna + 81, 9) if n != no]
+    viz_quadrante = [n for k in range(0, 81, 27) for m in range(k, k + 9, 3)
+                     for n in list(range(m, m + 3)) + list(range(m + 9, m + 12)) + list(range(m + 18, m + 21))
+                     if no in range(m, m + 3) or no in range(m + 9, m + 12) or no in range(m + 18, m + 21)
+                     if n != no]
+
+    return set(viz_linha + viz_quadrante + viz_coluna)
+
+
+class ContadorVizinhos:
+    """
+    Substitui temporariamente o índice de vizinhos do tabuleiro 9x9 (sudoku.GEOMETRIA_PADRAO.vizinhos, o mesmo de
+    sudoku.VIZINHOS), contando quantas consultas são feitas a ele.
+    """
+    def __init__(self, indice: tuple) -> None:
+        self.indice = indice
+        self.consultas = 0
+
+    def __getitem__(self, no: int) -> tuple:
+        self.consultas += 1
+        return self.indice[no]
+
+
+def custo_por_chamada(repeticoes: int = 2000) -> tuple:
+    """
+    :param repeticoes: Quantas vezes as 81 casas são consultadas em cada medida
+    :return: Tupla (custo original, custo do índice) em segundos por chamada
+    """
+    n_chamadas = 81 * repeticoes
+    original = timeit.timeit(lambda: [vizinhos_original(no) for no in range(81)], number=repeticoes) / n_chamadas
+    indice = timeit.timeit(lambda: [sudoku.VIZINHOS[no] for no in range(81)], number=repeticoes) / n_chamadas
+    return original, indice
+
+
+if __name__ == '__main__':
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else 'arquivos_de_texto/top50.txt'
+    limite = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    with open(arquivo) as arqv:
+        problemas = [linha for linha in arqv if linha.strip()][:limite]
+
+    contador = ContadorVizinhos(sudoku.GEOMETRIA_PADRAO.vizinhos)
+    sudoku.GEOMETRIA_PADRAO.vizinhos = contador  # Os métodos de Sudoku leem o índice da geometria a cada chamada
+    try:
+        t0 = time.perf_counter()
+        for problema in problemas:
+            Sudoku(problema).backtracking()
+        tempo_total = time.perf_counter() - t0
+    finally:
+        sudoku.GEOMETRIA_PADRAO.vizinhos = contador.indice
+
+    original, indice = custo_por_chamada()
+    print(f'Problemas resolvidos (backtracking): {len(problemas)} em {tempo_total:.3f} s\n'
+          f'Consultas aos vizinhos: {contador.consultas}\n'
+          f'Custo por chamada antes (recalculando): {original * 1e6:.3f} us\n'
+          f'Custo por chamada depois (índice):      {indice * 1e6:.3f} us\n'
+          f'Tempo estimado em vizinhos antes:  {original * contador.consultas:.3f} s\n'
+          f'Tempo estimado em vizinhos depois: {indice * contador.consultas:.3f} s')
@@ -0,0 +1,257 @@
+"""
+Cache de soluções em forma canônica, para não resolver de novo problemas repetidos ou equivalentes por simetria.
+
+Dois problemas são equivalentes quando um pode ser obtido do outro trocando os rótulos dos dígitos, trocando linhas
+dentro de uma mesma faixa (ou colunas dentro de uma mesma pilha), trocando faixas (ou pilhas) inteiras ou transpondo o
+tabuleiro. Cada problema é levado a uma forma canônica: faixas, linhas, pilhas e colunas são ordenadas por invariantes
+dessas simetrias (quantidade de dígitos dados e como eles se cruzam) e, entre as ordens empatadas, escolhe-se a que gera
+a menor string depois de renomear os dígitos por ordem de aparição. A solução é guardada na forma canônica e levada de
+volta, pela mesma transformação, ao problema consultado.
+
+A forma canônica é definida apenas para o tabuleiro 9x9: problemas de outros tamanhos (ver sudoku.Geometria) não são
+guardados nem procurados no cache.
+
+Quando há empates demais (e.g., problemas quase vazios), apenas uma das ordens empatadas é usada: problemas equivalentes
+podem então gerar chaves diferentes (uma falha a mais no cache), mas um acerto continua sempre correto, já que a chave é
+o próprio problema transformado.
+"""
+from collections import OrderedDict
+from itertools import permutations, product
+from sudoku import Sudoku, problema_valido
+import os
+
+# Número máximo de ordens (de linhas vezes de colunas) testadas para um problema
+LIMITE_ORDENS = 512
+
+
+def _chaves(grade: str) -> tuple:
+    """
+    :param grade: String de 81 caracteres
+    :return: Tupla (chaves das linhas, chaves das colunas). A chave de uma linha é a quantidade de dígitos dados nela
+             e as quantidades (ordenadas) das colunas onde eles estão; a das colunas é análoga
+    """
+    cont_linhas = [sum(grade[9 * i + j] != '.' for j in range(9)) for i in range(9)]
+    cont_colunas = [sum(grade[9 * i + j] != '.' for i in range(9)) for j in range(9)]
+    linhas = [(cont_linhas[i], tuple(sorted(cont_colunas[j] for j in range(9) if grade[9 * i + j] != '.')))
+              for i in range(9)]
+    colunas = [(cont_colunas[j], tuple(sorted(cont_linhas[i] for i in range(9) if grade[9 * i + j] != '.')))
+               for j in range(9)]
+    return linhas, colunas
+
+
+def _ordens(chaves: list) -> list:
+    """
+    :param chaves: Chaves das 9 linhas (ou colunas)
+    :return: Lista com todas as ordens (tuplas de 9 índices) que colocam as faixas e as linhas de cada faixa em ordem
+             crescente de chave, variando apenas a ordem dos empatados
+    """
+    faixas = sorted(range(3), key=lambda f: sorted(chaves[3 * f:3 * f + 3]))
+    chave_faixa = {f: sorted(chaves[3 * f:3 * f + 3]) for f in range(3)}
+
+    def empates(itens: list, chave) -> list:
+        # Todas as ordens de "itens" (já ordenados por "chave") trocando apenas elementos com a mesma chave
+        grupos = []
+        for item in itens:
+            if grupos and chave(grupos[-1][0]) == chave(item):
+                grupos[-1].append(item)
+            else:
+                grupos.append([item])
+        return [sum(escolha, ()) for escolha in product(*(list(permutations(g)) for g in grupos))]
+
+    ordens = []
+    for ordem_faixas in empates(faixas, chave_faixa.get):
+        linhas_por_faixa = [empates(sorted(range(3 * f, 3 * f + 3), key=chaves.__getitem__), chaves.__getitem__)
+                            for f in ordem_faixas]
+        ordens.extend(sum(escolha, ()) for escolha in product(*linhas_por_faixa))
+    return ordens
+
+
+def forma_canonica(problema: str) -> tuple:
+    """
+    :param problema: String de 81 caracteres que representa o problema
+    :return: Tupla (forma canônica, transformação), onde a transformação é uma tupla (posicoes, rotulos): a casa k da
+             forma canônica vem da casa posicoes[k] do problema, com o dígito trocado segundo o dicionário "rotulos"
+    """
+    transposto = ''.join(problema[9 * j + i] for i in range(9) for j in range(9))
+    candidatos = []
+    for grade, e_transposto in ((problema, False), (transposto, True)):
+        linhas, colunas = _chaves(grade)
+        assinatura = (sorted(sorted(linhas[3 * f:3 * f + 3]) for f in range(3)),
+                      sorted(sorted(colunas[3 * p:3 * p + 3]) for p in range(3)))
+        candidatos.append((assinatura, e_transposto, linhas, colunas))
+
+    # Só consideramos a orientação (normal ou transposta) de menor assinatura, ou as duas se elas empatarem
+    menor = min(c[0] for c in candidatos)
+    candidatos = [c for c in candidatos if c[0] == menor]
+
+    melhor = None
+    for _, e_transposto, linhas, colunas in candidatos:
+        ordens_linhas, ordens_colunas = _ordens(linhas), _ordens(colunas)
+        if len(ordens_linhas) * len(ordens_colunas) > LIMITE_ORDENS:  # Empates demais: fica com uma ordem só
+            ordens_linhas, ordens_colunas = ordens_linhas[:1], ordens_colunas[:1]
+
+        for ordem_linhas in ordens_linhas:
+            for ordem_colunas in ordens_colunas:
+                if e_transposto:
+                    posicoes = tuple(9 * c + l for l in ordem_linhas for c in ordem_colunas)
+                else:
+                    posicoes = tuple(9 * l + c for l in ordem_linhas for c in ordem_colunas)
+
+                # Renomeia os dígitos pela ordem em que aparecem
+                rotulos = {}
+                canonica = []
+                for pos in posicoes:
+                    caracter = problema[pos]
+                    if caracter != '.':
+                        if caracter not in rotulos:
+                            rotulos[caracter] = str(len(rotulos) + 1)
+                        caracter = rotulos[caracter]
+                    canonica.append(caracter)
+                canonica = ''.join(canonica)
+
+                if melhor is None or canonica < melhor[0]:
+                    melhor = (canonica, posicoes, rotulos)
+
+    canonica, posicoes, rotulos = melhor
+    # Dígitos que não aparecem no problema recebem os rótulos que sobraram (a troca precisa valer para a solução)
+    sobras = iter(str(d) for d in range(len(rotulos) + 1, 10))
+    for digito in '123456789':
+        if digito not in rotulos:
+            rotulos[digito] = next(sobras)
+
+    return canonica, (posicoes, rotulos)
+
+
+def aplica(grade: str, transformacao: tuple) -> str:
+    """
+    :param grade: String de 81 caracteres no referencial do problema original
+    :param transformacao: Transformação dada por forma_canonica
+    :return: A grade no referencial da forma canônica
+    """
+    posicoes, rotulos = transformacao
+    return ''.join(rotulos.get(grade[pos], '.') for pos in posicoes)
+
+
+def desfaz(grade: str, transformacao: tuple) -> str:
+    """
+    :param grade: String de 81 caracteres no referencial da forma canônica
+    :param transformacao: Transformação dada por forma_canonica
+    :return: A grade no referencial do problema original
+    """
+    posicoes, rotulos = transformacao
+    inversos = {canonico: original for original, canonico in rotulos.items()}
+    original = ['.'] * 81
+    for k, pos in enumerate(posicoes):
+        original[pos] = inversos.get(grade[k], '.')
+    return ''.join(original)
+
+
+def _valida(problema: str, solucao: str or None) -> bool:
+    """
+    :param problema: String contendo o problema
+    :param solucao: Solução a ser guardada
+    :return: True se o problema é 9x9 e a solução é completa, válida e respeita os dígitos dados
+    """
+    if solucao is None or len(problema) != 81 or not Sudoku.atingiu_objetivo(solucao):
+        return False
+    return all(p == '.' or p == s for p, s in zip(problema, solucao))
+
+
+class CacheSolucoes:
+    """
+    Cache de soluções indexado pela forma canônica do problema, com descarte do item usado há mais tempo (LRU) quando
+    passa de "tamanho_max" itens. Pode ser gravado em (e lido de) um arquivo de texto com uma linha "forma,solucao" por
+    item, do mais antigo para o mais recente.
+    """
+    def __init__(self, tamanho_max: int = 100_000) -> None:
+        """
+        :param tamanho_max: Quantidade máxima de soluções guardadas
+        """
+        self.tamanho_max = tamanho_max
+        self.dados = OrderedDict()  # Forma canônica -> solução na forma canônica (do menos para o mais recente)
+        self.acertos = 0
+        self.falhas = 0
+        self._ultima = (None, None)  # Último problema canonizado (busca seguida de guarda não canoniza duas vezes)
+
+    def __len__(self) -> int:
+        return len(self.dados)
+
+    def __str__(self) -> str:
+        return f'Cache: {self.acertos} acertos, {self.falhas} falhas ({len(self)} soluções guardadas)'
+
+    def _canoniza(self, problema: str) -> tuple:
+        """
+        :param problema: String contendo o problema
+        :return: O retorno de forma_canonica (reaproveitando o último cálculo, se for o mesmo problema)
+        """
+        if self._ultima[0] != problema:
+            self._ultima = (problema, forma_canonica(problema))
+        return self._ultima[1]
+
+    def busca(self, problema: str) -> str or None:
+        """
+        :param problema: String contendo o problema
+        :return: A solução do problema, se ele (ou algum equivalente) já foi resolvido, ou None
+        """
+        problema = problema.rstrip('\n')
+        if len(problema) != 81 or not problema_valido(problema):  # Só problemas 9x9 (e válidos) passam pelo cache
+            return None
+        canonica, transformacao = self._canoniza(problema)
+        solucao = self.dados.get(canonica)
+        if solucao is None:
+            self.falhas += 1
+            return None
+
+        self.dados.move_to_end(canonica)
+        self.acertos += 1
+        return desfaz(solucao, transformacao)
+
+    def guarda(self, problema: str, solucao: str) -> bool:
+        """
+        :param problema: String contendo o problema
+        :param solucao: Solução encontrada para o problema
+        :return: True se a solução foi guardada (soluções inválidas ou incompletas e problemas que não são 9x9 são
+                 ignorados)
+        """
+        problema = problema.rstrip('\n')
+        if not _valida(problema, solucao):
+            return False
+
+        canonica, transformacao = self._canoniza(problema)
+        self.dados[canonica] = aplica(solucao, transformacao)
+        self.dados.move_to_end(canonica)
+        while len(self.dados) > self.tamanho_max:
+            self.dados.popitem(last=False)  # Descarta a solução usada há mais tempo
+        return True
+
+    def salva(self, caminho: str) -> None:
+        """
+        :param caminho: Arquivo onde o cache é gravado (sobrescrito, se já existir). O arquivo é gravado com outro nome
+                        e só então renomeado, para que uma gravação interrompida não deixe o cache pela metade
+        """
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w') as arqv:
+            for canonica, solucao in self.dados.items():
+                arqv.write(f'{canonica},{solucao}\n')
+        os.replace(temporario, caminho)
+
+    def carrega(self, caminho: str) -> int:
+        """
+        :param caminho: Arquivo gravado por "salva". As soluções lidas entram como as mais recentes
+        :return: Quantidade de linhas inválidas (e.g., truncadas ou corrompidas), que são ignoradas
+        """
+        invalidas = 0
+        with open(caminho) as arqv:
+            for linha in arqv:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                canonica, _, solucao = linha.partition(',')
+                if not _valida(canonica, solucao):
+                    invalidas += 1
+                    continue
+                self.dados[canonica] = solucao
+                self.dados.move_to_end(canonica)
+        while len(self.dados) > self.tamanho_max:
+            self.dados.popitem(last=False)
+        return invalidas
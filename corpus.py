@@ -0,0 +1,219 @@
+"""
+Formato binário para arquivos de problemas: em vez de uma linha de texto por problema, cada problema ocupa um registro
+de tamanho fixo com o estado empacotado (ver sudoku.empacota: 4 bits por casa, i.e., 41 bytes no 9x9, ou 1 byte por
+casa a partir do 16x16). O arquivo começa com um cabeçalho de 16 bytes:
+    - 4 bytes: a assinatura b'SDKB'
+    - 1 byte: a versão do formato (1)
+    - 1 byte: o lado dos quadrantes (k = 3 no 9x9; ver sudoku.Geometria)
+    - 2 bytes: reservados (zero)
+    - 8 bytes: a quantidade de problemas (inteiro sem sinal, little-endian)
+seguido dos registros, um após o outro. Como os registros têm tamanho fixo, o i-ésimo problema é lido direto do arquivo
+mapeado em memória (mmap), sem carregar nem percorrer o restante do arquivo.
+
+Uso:
+    python -m corpus ENTRADA SAIDA
+
+Converte um arquivo de texto (um problema por linha) para o formato binário ou, se a entrada já for binária, de volta
+para texto.
+"""
+from sudoku import Geometria, empacota, desempacota
+import mmap
+import os
+import struct
+import sys
+
+ASSINATURA = b'SDKB'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sBBxxQ')  # Assinatura, versão, k, 2 bytes reservados e quantidade de problemas
+
+
+def eh_binario(caminho: str) -> bool:
+    """
+    :param caminho: Caminho de um arquivo de problemas
+    :return: True se o arquivo está no formato binário (i.e., começa com a assinatura)
+    """
+    with open(caminho, 'rb') as arqv:
+        return arqv.read(len(ASSINATURA)) == ASSINATURA
+
+
+def texto_para_binario(origem, destino: str) -> int:
+    """
+    :param origem: Caminho do arquivo de texto (ou qualquer iterável de linhas, e.g., um arquivo já aberto)
+    :param destino: Caminho do arquivo binário a ser criado
+    :return: Quantidade de problemas convertidos. As linhas são lidas e gravadas uma a uma (linhas vazias são
+             ignoradas) e todos os problemas devem ter o mesmo tamanho
+    """
+    linhas = open(origem) if isinstance(origem, str) else origem
+    try:
+        with open(destino, 'wb') as saida:
+            saida.write(CABECALHO.pack(ASSINATURA, VERSAO, 0, 0))  # Reescrito ao final, com o k e a quantidade
+            geometria = None
+            n = 0
+            for linha in linhas:
+                problema = linha.strip().upper()
+                if not problema:
+                    continue
+                if geometria is None:
+                    geometria = Geometria.do_problema(problema)
+                elif len(problema) != geometria.casas:
+                    raise ValueError(f'O problema {n + 1} tem {len(problema)} casas, mas os anteriores têm '
+                                     f'{geometria.casas}: todos os problemas do arquivo devem ter o mesmo tamanho.')
+                saida.write(empacota(problema, geometria))
+                n += 1
+
+            saida.seek(0)
+            saida.write(CABECALHO.pack(ASSINATURA, VERSAO, geometria.k if geometria is not None else 3, n))
+        return n
+    finally:
+        if linhas is not origem:
+            linhas.close()
+
+
+def binario_para_texto(origem: str, destino) -> int:
+    """
+    :param origem: Caminho do arquivo binário
+    :param destino: Caminho do arquivo de texto a ser criado (ou um arquivo já aberto, e.g., sys.stdout)
+    :return: Quantidade de problemas convertidos
+    """
+    saida = open(destino, 'w') if isinstance(destino, str) else destino
+    try:
+        with CorpusBinario(origem) as corpus:
+            for problema in corpus:
+                saida.write(problema + '\n')
+            return len(corpus)
+    finally:
+        if saida is not destino:
+            saida.close()
+
+
+class CorpusBinario:
+    """
+    Leitor de um arquivo no formato binário, mapeado em memória. Os problemas são acessados por índice (corpus[i]) ou
+    fatia (corpus[a:b], que devolve uma lista), ou percorridos em ordem (for problema in corpus); só as páginas dos
+    registros lidos são carregadas pelo sistema operacional.
+    """
+    def __init__(self, caminho: str) -> None:
+        """
+        :param caminho: Caminho do arquivo binário
+        """
+        self.caminho = caminho
+        with open(caminho, 'rb') as arqv:
+            self._mapa = mmap.mmap(arqv.fileno(), 0, access=mmap.ACCESS_READ)  # O mapa continua válido sem o arquivo
+
+        if len(self._mapa) < CABECALHO.size:
+            self._mapa.close()
+            raise ValueError(f'{caminho} não é um arquivo de problemas no formato binário.')
+        assinatura, versao, k, self._n = CABECALHO.unpack_from(self._mapa)
+        if assinatura != ASSINATURA or versao != VERSAO:
+            self._mapa.close()
+            raise ValueError(f'{caminho} não é um arquivo de problemas no formato binário (versão {VERSAO}).')
+
+        self.geometria = Geometria.para(k)
+        self.tamanho_registro = self.geometria.tamanho_empacotado
+        if len(self._mapa) != CABECALHO.size + self._n * self.tamanho_registro:
+            self._mapa.close()
+            raise ValueError(f'{caminho} está incompleto: o cabeçalho indica {self._n} problemas.')
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, indice: int or slice) -> str or list:
+        """
+        :param indice: Índice (inclusive negativo) ou fatia
+        :return: O problema do índice ou a lista dos problemas da fatia
+        """
+        if isinstance(indice, slice):
+            return [self._le(i) for i in range(*indice.indices(self._n))]
+
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('Índice fora do arquivo de problemas.')
+        return self._le(indice)
+
+    def __iter__(self) -> iter:
+        for i in range(self._n):
+            yield self._le(i)
+
+    def __enter__(self) -> 'CorpusBinario':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.close()
+
+    def _le(self, indice: int) -> str:
+        """
+        :param indice: Índice (entre 0 e len - 1) do problema
+        :return: O problema desempacotado
+        """
+        inicio = CABECALHO.size + indice * self.tamanho_registro
+        return desempacota(self._mapa[inicio:inicio + self.tamanho_registro], self.geometria)
+
+    def close(self) -> None:
+        self._mapa.close()
+
+    def fragmento(self, parte: int, partes: int) -> 'Fragmento':
+        """
+        :param parte: Índice do fragmento (de 0 a partes - 1)
+        :param partes: Em quantos fragmentos contíguos (de tamanhos quase iguais) o arquivo é dividido
+        :return: O fragmento "parte" do arquivo, e.g., para o processo "parte" de um grupo de "partes" processos
+        """
+        return Fragmento(self.caminho, self._n * parte // partes, self._n * (parte + 1) // partes)
+
+    def fragmentos(self, tamanho: int) -> iter:
+        """
+        :param tamanho: Quantidade máxima de problemas por fragmento
+        :return: Gerador que produz, em ordem, fragmentos consecutivos de até "tamanho" problemas cobrindo o arquivo
+        """
+        for inicio in range(0, self._n, tamanho):
+            yield Fragmento(self.caminho, inicio, min(inicio + tamanho, self._n))
+
+
+_abertos = {}  # Caminho -> ((data de modificação, tamanho), CorpusBinario já aberto neste processo) (ver Fragmento)
+
+
+class Fragmento:
+    """
+    Intervalo [inicio, fim) dos problemas de um arquivo binário. Só guarda o caminho e os índices, então é barato de
+    enviar a outros processos, que leem os problemas do próprio arquivo (mapeado uma única vez por processo).
+    """
+    __slots__ = ('caminho', 'inicio', 'fim')
+
+    def __init__(self, caminho: str, inicio: int, fim: int) -> None:
+        self.caminho, self.inicio, self.fim = caminho, inicio, fim
+
+    def __getstate__(self) -> tuple:
+        return self.caminho, self.inicio, self.fim
+
+    def __setstate__(self, estado: tuple) -> None:
+        self.caminho, self.inicio, self.fim = estado
+
+    def __repr__(self) -> str:
+        return f'Fragmento({self.caminho!r}, {self.inicio}, {self.fim})'
+
+    def __len__(self) -> int:
+        return self.fim - self.inicio
+
+    def __iter__(self) -> iter:
+        info = os.stat(self.caminho)
+        versao = (info.st_mtime_ns, info.st_size)
+        aberto = _abertos.get(self.caminho)
+        if aberto is None or aberto[0] != versao:  # Se o arquivo foi reescrito, o mapa antigo é fechado e substituído
+            if aberto is not None:
+                aberto[1].close()
+            aberto = _abertos[self.caminho] = (versao, CorpusBinario(self.caminho))
+        corpus = aberto[1]
+        for i in range(self.inicio, self.fim):
+            yield corpus[i]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print('Uso: python -m corpus ENTRADA SAIDA')
+        sys.exit(1)
+
+    entrada, saida = sys.argv[1], sys.argv[2]
+    if eh_binario(entrada):
+        print(f'{binario_para_texto(entrada, saida)} problemas convertidos para texto.')
+    else:
+        print(f'{texto_para_binario(entrada, saida)} problemas convertidos para o formato binário.')
@@ -0,0 +1,205 @@
+"""
+Resolução incremental, para editores em que o usuário coloca e apaga dígitos um a um: em vez de gerar o CSP e resolver o
+problema do zero a cada edição, um único MotorCSP é mantido entre as edições.
+
+Cada pista colocada é atribuída e propagada sobre o estado atual, e a posição da trilha do motor antes dela é guardada.
+Para apagar uma pista, a trilha é desfeita até essa posição (o que desfaz exatamente o que foi deduzido a partir dela e
+das pistas posteriores) e só as pistas posteriores são atribuídas de novo; apagar a última pista custa apenas desfazer o
+que ela propagou. Como as regras de propagação chegam ao mesmo ponto fixo em qualquer ordem, o estado é sempre o mesmo
+que teríamos propagando as pistas atuais do zero.
+
+A solução é buscada só quando pedida, sobre o estado já propagado (a busca é desfeita em seguida), e fica guardada
+enquanto continuar válida: apagar uma pista nunca a invalida, e colocar uma pista só a invalida se o dígito for
+diferente do da solução naquela casa.
+
+Uso:
+    editor = SudokuIncremental()
+    editor.colocar(0, '5')
+    editor.candidatos(1)  # ('1', '2', '3', '4', '6', '7', '8', '9')
+    editor.solucionavel()  # True
+    editor.remover(0)
+"""
+from sudoku import Sudoku, Geometria, MotorCSP, Orcamento, LimiteEsgotado, ESGOTADO
+
+
+class SudokuIncremental:
+    """
+    Problema editável: pistas são colocadas e removidas uma a uma, e os candidatos de cada casa (domínios após a
+    propagação), a consistência e a solução refletem sempre as pistas atuais.
+
+    Uma pista que contradiz as anteriores (dígito repetido em uma unidade ou eliminado pela propagação) é guardada, mas
+    não é aplicada: ela e as pistas colocadas depois dela ficam pendentes até que a contradição seja desfeita (ver
+    conflito), e os candidatos continuam sendo os do estado anterior a ela.
+    """
+    def __init__(self, problema: str = '.' * 81, propagacao: str = 'SINGLES') -> None:
+        """
+        :param problema: Pistas iniciais, no formato de Sudoku (o tamanho da string define o tamanho do tabuleiro)
+        :param propagacao: Nível de propagação feita a cada edição (um dos NIVEIS_PROPAGACAO; ver MotorCSP)
+        """
+        problema = problema.rstrip('\n').upper()
+        self.geometria = Geometria.do_problema(problema)
+        self.propagacao = propagacao.upper()
+        self.motor = MotorCSP(Sudoku.gera_csp('.' * self.geometria.casas), propagacao=self.propagacao)
+        self.pistas = []  # Lista de (casa, valor, tamanho da trilha antes da pista) das pistas aplicadas, em ordem
+        self.pendentes = []  # Lista de (casa, valor) das pistas não aplicadas; a primeira é a que gerou a contradição
+        self._solucao = None  # Solução válida para as pistas aplicadas (ou None, se ainda não foi buscada)
+        self._sem_solucao = False  # Se a última busca mostrou que as pistas aplicadas não têm solução
+
+        for casa, valor in enumerate(problema):
+            if valor != '.':
+                self.colocar(casa, valor)
+
+    def __repr__(self) -> str:
+        return f'SudokuIncremental({self.problema!r})'
+
+    @property
+    def problema(self) -> str:
+        """
+        :return: As pistas atuais (inclusive as pendentes) no formato de Sudoku
+        """
+        casas = ['.'] * self.geometria.casas
+        for casa, valor, _ in self.pistas:
+            casas[casa] = valor
+        for casa, valor in self.pendentes:
+            casas[casa] = valor
+        return ''.join(casas)
+
+    @property
+    def consistente(self) -> bool:
+        """
+        :return: True se a propagação não encontrou contradição nas pistas (o que não garante que haja solução; ver
+                 solucionavel)
+        """
+        return len(self.pendentes) == 0
+
+    @property
+    def conflito(self) -> int or None:
+        """
+        :return: A casa da primeira pista que contradiz as anteriores (ou None, se as pistas são consistentes)
+        """
+        return self.pendentes[0][0] if self.pendentes else None
+
+    def _verifica_casa(self, casa: int) -> None:
+        """
+        :param casa: Índice da casa (de 0 a casas - 1)
+        """
+        if not 0 <= casa < self.geometria.casas:
+            raise IndexError(f'Casa inválida: {casa} (o tabuleiro tem {self.geometria.casas} casas).')
+
+    def _aplica(self, casa: int, valor: str) -> bool:
+        """
+        :param casa: Casa da pista
+        :param valor: Valor da pista
+        :return: True se a pista foi atribuída e propagada sem contradição ou False caso contrário (e, nesse caso, o
+                 estado do motor volta a ser o de antes da pista)
+        """
+        motor = self.motor
+        marca = len(motor.trilha)
+        if valor not in motor.D[casa] or not motor.atribui(casa, valor):
+            motor.desfaz(marca)
+            return False
+
+        self.pistas.append((casa, valor, marca))
+        if self._solucao is not None and self._solucao[casa] != valor:  # A solução guardada deixou de valer
+            self._solucao = None
+        return True
+
+    def _reaplica(self, pistas: list) -> None:
+        """
+        :param pistas: Lista de (casa, valor) a serem aplicadas em ordem. A partir da primeira contradição, as pistas
+                       ficam pendentes
+        """
+        for casa, valor in pistas:
+            if self.pendentes or not self._aplica(casa, valor):
+                self.pendentes.append((casa, valor))
+
+    def colocar(self, casa: int, valor: str) -> None:
+        """
+        :param casa: Índice da casa (de 0 a casas - 1)
+        :param valor: Símbolo colocado na casa (e.g., '1' a '9' no 9x9). Se a casa já tinha uma pista, ela é trocada
+        """
+        self._verifica_casa(casa)
+        valor = str(valor).upper()
+        if valor not in self.geometria.simbolos:
+            raise ValueError(f'Valor inválido: {valor} (use {", ".join(self.geometria.simbolos)}).')
+
+        if self.problema[casa] == valor:
+            return
+        self.remover(casa)
+        self._reaplica([(casa, valor)])
+
+    def remover(self, casa: int) -> None:
+        """
+        :param casa: Índice da casa cuja pista será apagada (se a casa não tem pista, nada muda)
+        """
+        self._verifica_casa(casa)
+        for i, (outra, _, marca) in enumerate(self.pistas):
+            if outra == casa:
+                # Desfaz a pista e tudo o que veio depois dela, e aplica de novo as pistas posteriores
+                seguintes = [(c, v) for c, v, _ in self.pistas[i + 1:]] + self.pendentes
+                del self.pistas[i:]
+                self.pendentes = []
+                self.motor.desfaz(marca)
+                self._sem_solucao = False
+                self._reaplica(seguintes)
+                return
+
+        for i, (outra, _) in enumerate(self.pendentes):
+            if outra == casa:
+                del self.pendentes[i]
+                if i == 0:  # Era a pista da contradição: as pendentes seguintes podem ser aplicadas de novo
+                    seguintes, self.pendentes = self.pendentes, []
+                    self._reaplica(seguintes)
+                return
+
+    def candidatos(self, casa: int) -> tuple:
+        """
+        :param casa: Índice da casa
+        :return: Os valores que ainda cabem na casa após a propagação, em ordem (um único valor nas casas com pista ou
+                 já deduzidas)
+        """
+        self._verifica_casa(casa)
+        dominio = self.motor.D[casa]
+        return tuple(valor for valor in self.geometria.simbolos if valor in dominio)
+
+    def solucao(self, limite_tempo: float = None, max_nos: int = None) -> str or None:
+        """
+        :param limite_tempo: Tempo máximo (em segundos) da busca, se ela for necessária (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos na busca (opcional)
+        :return: Uma solução para as pistas atuais, None se não há solução (ou se as pistas são inconsistentes) ou
+                 ESGOTADO se os limites acabaram antes da resposta
+        """
+        if self.pendentes or self._sem_solucao:
+            return None
+        if self._solucao is not None:
+            return self._solucao
+
+        motor = self.motor
+        marca = len(motor.trilha)
+        motor.orcamento = Orcamento.prepara(limite_tempo, max_nos)
+        busca = motor.solucoes(propagado=True)  # As pistas já foram propagadas a cada edição
+        try:
+            atribuicao = next(busca, None)
+        except LimiteEsgotado:
+            return ESGOTADO
+        finally:  # A busca parte do estado propagado e é desfeita ao final, deixando só as pistas
+            busca.close()
+            motor.desfaz(marca)
+            motor.orcamento = None
+
+        if atribuicao is None:
+            self._sem_solucao = True
+            return None
+        self._solucao = ''.join(atribuicao[casa] for casa in range(self.geometria.casas))
+        return self._solucao
+
+    def solucionavel(self, limite_tempo: float = None, max_nos: int = None) -> bool or None:
+        """
+        :param limite_tempo: Tempo máximo (em segundos) da busca, se ela for necessária (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos na busca (opcional)
+        :return: True se as pistas atuais têm solução, False se não têm ou None se os limites acabaram antes da resposta
+        """
+        solucao = self.solucao(limite_tempo, max_nos)
+        if solucao == ESGOTADO:
+            return None
+        return solucao is not None
@@ -1,74 +1,528 @@
-from sudoku import Sudoku
+from sudoku import Sudoku, ALGORITMOS, ESGOTADO, MULTIPLAS, INVALIDO, Estatisticas, MEMORIA_MAX_BFS, TAMANHO_LOTE
+from sudoku import NIVEIS_PROPAGACAO, PROPAGACAO_PADRAO, problema_valido
+from cache import CacheSolucoes
+from corpus import CorpusBinario, eh_binario
+from paralelo import BuscaParalela, Portfolio, ALGORITMOS_PARALELOS, PORTFOLIO_PADRAO
+from collections import deque
+from multiprocessing import Pool
+import argparse
 import datetime as dt
+import os
+import queue
 import sys
 
 
-try:
-    algoritmo_busca = sys.argv[1].upper()  # Recebendo o algoritmo que irá realizar a busca
-    input_problemas = sys.argv[2]  # Recebendo o nome do arquivo no terminal
+def resolve_problema(algoritmo_busca: str, problema_sudoku: str, com_estatisticas: bool = False,
+                     opcoes: dict = None) -> tuple:
+    """
+    :param algoritmo_busca: Nome do algoritmo (uma das chaves de ALGORITMOS)
+    :param problema_sudoku: String contendo o problema
+    :param com_estatisticas: Se True, coleta as estatísticas da resolução
+    :param opcoes: Argumentos extras repassados ao método do algoritmo (e.g., {'memoria_max': ...} na BFS)
+    :return: Tupla (problema, solução, tempo gasto, estatísticas em dicionário ou None). A solução é None se não foi
+             encontrada, ESGOTADO se o limite de tempo ou de nós acabou antes, MULTIPLAS se o algoritmo é a
+             UNICIDADE e o problema tem mais de uma solução e INVALIDO se a entrada não é um problema válido (como em
+             Sudoku.resolver_lote). Usada tanto no processo principal quanto nos processos do pool
+    """
+    sudoku = Sudoku(problema_sudoku)  # Cria o jogo sudoku
+    estatisticas = Estatisticas() if com_estatisticas else None
+    if not problema_valido(sudoku.problema):  # Uma linha malformada não interrompe o restante do arquivo
+        return sudoku.problema, INVALIDO, dt.timedelta(0), estatisticas.como_dict() if com_estatisticas else None
+    t0 = dt.datetime.now()  # Iniciando a medida de tempo gasto
+    sudoku.resolve(algoritmo_busca, estatisticas=estatisticas, **(opcoes or {}))
+    tf = dt.datetime.now()  # Calculando tempo final
+    return sudoku.problema, sudoku.situacao(), tf - t0, estatisticas.como_dict() if com_estatisticas else None
 
-    with open(input_problemas) as arqv:
-        problemas = arqv.readlines()  # Problemas é uma lista em que cada elemente é uma string representando um problema
 
-    if algoritmo_busca not in ['BFS', 'DFS', 'A*', 'AC3', 'BACKTRACKING']:
-        print("Opção inválida!")
-        sys.exit()
+def resolve_paralelo(busca: BuscaParalela or Portfolio, algoritmo_busca: str, problema_sudoku: str,
+                     com_estatisticas: bool = False, opcoes: dict = None) -> tuple:
+    """
+    :param busca: Pool que divide o problema entre seus processos (paralelo.BuscaParalela) ou que faz os algoritmos
+                  correrem sobre ele (paralelo.Portfolio)
+    :param algoritmo_busca: Nome do algoritmo (um dos ALGORITMOS_PARALELOS, ou PORTFOLIO)
+    :param problema_sudoku: String contendo o problema
+    :param com_estatisticas: Se True, devolve as estatísticas do algoritmo vencedor (só no portfólio)
+    :param opcoes: Argumentos extras repassados ao algoritmo (e.g., limite_tempo e max_nos)
+    :return: Tupla no formato de resolve_problema
+    """
+    problema_sudoku = problema_sudoku.rstrip('\n').upper()
+    if not problema_valido(problema_sudoku):
+        return problema_sudoku, INVALIDO, dt.timedelta(0), Estatisticas().como_dict() if com_estatisticas else None
 
-    T0 = dt.datetime.now()
-    for problema_sudoku in problemas:
-        sudoku = Sudoku(problema_sudoku)  # Cria o jogo sudoku
-        print(f'========================================\n'
-              f'Estado inicial:\n\n{sudoku}\n')
-        t0 = dt.datetime.now()  # Iniciando a medida de tempo gasto
-
-        if algoritmo_busca == 'BFS':
-            sudoku.busca_largura()  # Inicia busca em largura
-        elif algoritmo_busca == 'DFS':
-            sudoku.busca_profundidade()  # Inicia busca em profundidade
-        elif algoritmo_busca == 'A*':
-            sudoku.busca_A_estrela()  # Inicia busca A*
-        elif algoritmo_busca == 'AC3':
-            sudoku.ac3()  # Inicia processo de AC-3
-        else:  # i.e., Backtracking:
-            sudoku.backtracking()  # Inicia busca usando backtracking
-
-        tf = dt.datetime.now()  # Calculando tempo final
+    t0 = dt.datetime.now()
+    solucao = busca.resolve(problema_sudoku, algoritmo_busca, **(opcoes or {}))
+    tempo = dt.datetime.now() - t0
+    return problema_sudoku, solucao, tempo, busca.estatisticas if com_estatisticas else None
+
+
+def resolve_lote(algoritmo_busca: str, problemas: list, opcoes: dict = None) -> list:
+    """
+    :param algoritmo_busca: Algoritmo usado nos problemas que a propagação vetorizada não termina
+    :param problemas: Lista de strings, cada uma representando um problema
+    :param opcoes: Argumentos extras repassados ao algoritmo (e.g., limite_tempo e max_nos)
+    :return: Lista de tuplas no formato de resolve_problema (sem estatísticas). Os problemas são resolvidos juntos por
+             Sudoku.resolver_lote, então o tempo de cada um é o tempo médio do lote
+    """
+    t0 = dt.datetime.now()
+    solucoes = Sudoku.resolver_lote(problemas, busca=algoritmo_busca, tamanho_bloco=max(len(problemas), 1),
+                                    **(opcoes or {}))
+    tempo = (dt.datetime.now() - t0) / max(len(problemas), 1)
+    return [(problema.rstrip('\n'), solucao, tempo, None) for problema, solucao in zip(problemas, solucoes)]
+
+
+def _resolve_bloco(args: tuple) -> list:
+    """
+    :param args: Tupla (algoritmo, lista de problemas, com_estatisticas, opcoes, lote), já que o pool passa um único
+                 argumento
+    :return: Lista com o retorno de resolve_problema para cada problema do bloco (ou de resolve_lote, se "lote")
+    """
+    algoritmo_busca, problemas, com_estatisticas, opcoes, lote = args
+    if lote:
+        return resolve_lote(algoritmo_busca, problemas, opcoes)
+    return [resolve_problema(algoritmo_busca, problema, com_estatisticas, opcoes) for problema in problemas]
+
+
+def le_problemas(arqv) -> iter:
+    """
+    :param arqv: Arquivo (ou sys.stdin) com um problema por linha
+    :return: Gerador que produz os problemas um a um, sem carregar o arquivo inteiro na memória (ignora linhas vazias)
+    """
+    for linha in arqv:
+        linha = linha.strip()
+        if linha:
+            yield linha
+
+
+def _em_blocos(iteravel, tamanho: int) -> iter:
+    """
+    :param iteravel: Qualquer iterável (inclusive geradores)
+    :param tamanho: Quantidade máxima de elementos por bloco
+    :return: Gerador que produz listas com até "tamanho" elementos consecutivos do iterável. Se o iterável for um
+             arquivo binário (corpus.CorpusBinario), os blocos são fragmentos (corpus.Fragmento): só os índices são
+             enviados aos processos, que leem os próprios problemas do arquivo
+    """
+    if isinstance(iteravel, CorpusBinario):
+        yield from iteravel.fragmentos(tamanho)
+        return
+
+    bloco = []
+    for elemento in iteravel:
+        bloco.append(elemento)
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def resolve_fluxo(algoritmo_busca: str, problemas, workers: int = 1, chunk: int = 1, ordenado: bool = True,
+                  com_estatisticas: bool = False, opcoes: dict = None, lote: bool = False,
+                  cache: CacheSolucoes = None, paralela: BuscaParalela or Portfolio = None) -> iter:
+    """
+    :param algoritmo_busca: Nome do algoritmo (uma das chaves de ALGORITMOS)
+    :param problemas: Iterável (possivelmente um gerador) de strings, cada uma representando um problema
+    :param workers: Número de processos que resolvem os problemas (1 = tudo no processo atual)
+    :param chunk: Quantos problemas são enviados de uma vez para cada processo
+    :param ordenado: Se False, os resultados são produzidos conforme ficam prontos (e não na ordem da entrada)
+    :param com_estatisticas: Se True, coleta as estatísticas de cada resolução
+    :param opcoes: Argumentos extras repassados ao método do algoritmo
+    :param lote: Se True, cada bloco de "chunk" problemas é resolvido de uma vez pelo resolvedor vetorizado (ver
+                 resolve_lote) e o algoritmo só é usado no que a propagação não termina
+    :param cache: Cache de soluções consultado (no processo atual) antes de resolver cada problema e atualizado com as
+                  soluções encontradas (ignorado na UNICIDADE, já que uma solução guardada não diz se há outras)
+    :param paralela: Se dado, cada problema é resolvido por todos os processos deste pool, dividido entre eles ou em uma
+                     corrida entre algoritmos (ver resolve_paralelo), e "workers", "chunk" e "lote" são ignorados
+    :return: Gerador de tuplas no formato de resolve_problema. No máximo 4 blocos por processo ficam pendentes ao
+             mesmo tempo, então a memória usada não depende do tamanho da entrada
+    """
+    if cache is not None and algoritmo_busca.upper() != 'UNICIDADE':
+        yield from _resolve_com_cache(algoritmo_busca, problemas, workers, chunk, ordenado, com_estatisticas, opcoes,
+                                      lote, cache, paralela)
+        return
+
+    if paralela is not None:  # Um problema por vez, usando todos os processos do pool
+        for problema in problemas:
+            yield resolve_paralelo(paralela, algoritmo_busca, problema, com_estatisticas, opcoes)
+        return
+
+    if workers <= 1 and lote:
+        for bloco in _em_blocos(problemas, chunk):
+            yield from resolve_lote(algoritmo_busca, bloco, opcoes)
+        return
+
+    if workers <= 1:
+        for problema in problemas:
+            yield resolve_problema(algoritmo_busca, problema, com_estatisticas, opcoes)
+        return
+
+    janela = 4 * workers  # Número máximo de blocos enviados ao pool e ainda não consumidos
+    with Pool(workers) as pool:
+        if ordenado:
+            pendentes = deque()
+            for bloco in _em_blocos(problemas, chunk):
+                args = (algoritmo_busca, bloco, com_estatisticas, opcoes, lote)
+                pendentes.append(pool.apply_async(_resolve_bloco, (args,)))
+                if len(pendentes) >= janela:
+                    yield from pendentes.popleft().get()
+            while pendentes:
+                yield from pendentes.popleft().get()
+        else:
+            prontos = queue.Queue()  # Recebe os blocos (ou erros) conforme os processos terminam
+            em_andamento = 0
+            for bloco in _em_blocos(problemas, chunk):
+                pool.apply_async(_resolve_bloco, ((algoritmo_busca, bloco, com_estatisticas, opcoes, lote),),
+                                 callback=prontos.put, error_callback=prontos.put)
+                em_andamento += 1
+                while em_andamento >= janela or (em_andamento and not prontos.empty()):
+                    resultado = prontos.get()
+                    em_andamento -= 1
+                    if isinstance(resultado, BaseException):
+                        raise resultado
+                    yield from resultado
+            while em_andamento:
+                resultado = prontos.get()
+                em_andamento -= 1
+                if isinstance(resultado, BaseException):
+                    raise resultado
+                yield from resultado
+
+
+def _consulta_cache(cache: CacheSolucoes, problema: str, com_estatisticas: bool) -> tuple or None:
+    """
+    :param cache: Cache de soluções
+    :param problema: String contendo o problema
+    :param com_estatisticas: Se True, o resultado leva estatísticas zeradas (nada foi expandido)
+    :return: Tupla no formato de resolve_problema, se o problema está no cache, ou None
+    """
+    t0 = dt.datetime.now()
+    solucao = cache.busca(problema)
+    if solucao is None:
+        return None
+    return problema, solucao, dt.datetime.now() - t0, Estatisticas().como_dict() if com_estatisticas else None
+
+
+def _resolve_com_cache(algoritmo_busca: str, problemas, workers: int, chunk: int, ordenado: bool,
+                       com_estatisticas: bool, opcoes: dict, lote: bool, cache: CacheSolucoes,
+                       paralela: BuscaParalela or Portfolio = None) -> iter:
+    """
+    Mesmos parâmetros e retorno de resolve_fluxo. Os problemas são lidos em grupos (do tamanho da janela de
+    resolve_fluxo, ou um a um sem processos extras nem lote): os que estão no cache são respondidos direto e os demais
+    são resolvidos por resolve_fluxo, e suas soluções entram no cache. Um problema repetido dentro do mesmo grupo só é
+    resolvido uma vez (as repetições são respondidas pelo cache em seguida).
+    """
+    def repeticao(problema: str) -> tuple:
+        # Depois de resolvida a primeira ocorrência, a repetição é respondida pelo cache (se a primeira não foi
+        # resolvida, a repetição também fica sem solução)
+        return (_consulta_cache(cache, problema, com_estatisticas) or
+                (problema, None, dt.timedelta(0), Estatisticas().como_dict() if com_estatisticas else None))
+
+    tamanho_grupo = 1 if workers <= 1 and not lote else 4 * max(workers, 1) * chunk
+    for grupo in _em_blocos((problema.rstrip('\n') for problema in problemas), tamanho_grupo):
+        resultados = [None] * len(grupo)  # Resultado de cada problema do grupo (None enquanto não for resolvido)
+        faltando = []  # Problemas (sem repetições) que precisam ser resolvidos
+        enviados = set()  # Os mesmos problemas, para consulta rápida
+        repetidos = set()  # Índices dos problemas iguais a algum de "faltando"
+        for i, problema in enumerate(grupo):
+            if problema in enviados:
+                repetidos.add(i)
+                continue
+
+            resultados[i] = _consulta_cache(cache, problema, com_estatisticas)
+            if resultados[i] is None:
+                faltando.append(problema)
+                enviados.add(problema)
+            elif not ordenado:
+                yield resultados[i]
+
+        resolvidos = resolve_fluxo(algoritmo_busca, faltando, workers, chunk, ordenado, com_estatisticas, opcoes, lote,
+                                   paralela=paralela)
+        if ordenado:
+            resolvidos = iter(resolvidos)
+            for i, problema in enumerate(grupo):
+                if i in repetidos:
+                    resultados[i] = repeticao(problema)
+                elif resultados[i] is None:
+                    resultados[i] = next(resolvidos)
+                    cache.guarda(problema, resultados[i][1])
+                yield resultados[i]
+        else:
+            for resultado in resolvidos:
+                cache.guarda(resultado[0], resultado[1])
+                yield resultado
+            for i in sorted(repetidos):
+                yield repeticao(grupo[i])
+
+
+def formata_estatisticas(estatisticas: dict) -> str:
+    """
+    :param estatisticas: Estatísticas em dicionário (ver Estatisticas.como_dict)
+    :return: As estatísticas em formato de texto, uma por linha
+    """
+    registro = Estatisticas()
+    for campo in Estatisticas.CAMPOS:
+        setattr(registro, campo, estatisticas[campo])
+    return str(registro)
+
+
+def soma_estatisticas(total: dict or None, estatisticas: dict) -> dict:
+    """
+    :param total: Estatísticas acumuladas até agora (ou None)
+    :param estatisticas: Estatísticas de mais uma resolução
+    :return: Estatísticas acumuladas (somando os contadores e tempos e mantendo os máximos)
+    """
+    if total is None:
+        return dict(estatisticas)
+
+    for campo in Estatisticas.CAMPOS:
+        if campo in ('fronteira_max', 'profundidade_max'):
+            total[campo] = max(total[campo], estatisticas[campo])
+        else:
+            total[campo] += estatisticas[campo]
+    return total
+
+
+def imprime_resultado(problema: str, solucao: str, tempo: dt.timedelta, estatisticas: dict = None,
+                      saida=None) -> None:
+    """
+    :param problema: String contendo o problema
+    :param solucao: String contendo a solução (None, se não foi encontrada, ESGOTADO, MULTIPLAS ou INVALIDO)
+    :param tempo: Tempo gasto para resolver o problema
+    :param estatisticas: Estatísticas da resolução em dicionário (ou None)
+    :param saida: Onde o resultado é escrito (padrão: sys.stdout)
+    """
+    sudoku = Sudoku(problema)
+    print(f'========================================\n'
+          f'Estado inicial:\n\n{sudoku}\n', file=saida)
+    if solucao in (ESGOTADO, MULTIPLAS, INVALIDO):  # Resolução interrompida, solução não única ou entrada inválida
+        print(f'Estado final: {solucao}\n\n'
+              f'Tempo gasto: {tempo} (h:min:s:ms)', file=saida)
+    else:
+        sudoku.solucao = solucao
         print(f'Estado final: \n\n{sudoku}\n\n'
               f'String solução: {sudoku.solucao}\n\n'
-              f'Tempo gasto: {tf-t0} (h:min:s:ms)\n'
-              f'========================================\n\n')
+              f'Tempo gasto: {tempo} (h:min:s:ms)', file=saida)
+    if estatisticas is not None:
+        print(f'\n{formata_estatisticas(estatisticas)}', file=saida)
+    print(f'========================================\n\n', file=saida)
+
+
+def formata_compacto(problema: str, solucao: str, tempo: dt.timedelta, estatisticas: dict = None) -> str:
+    """
+    :param problema: String contendo o problema
+    :param solucao: String contendo a solução (None, se não foi encontrada, ESGOTADO, MULTIPLAS ou INVALIDO)
+    :param tempo: Tempo gasto para resolver o problema
+    :param estatisticas: Estatísticas da resolução em dicionário (ou None)
+    :return: Linha "problema,solucao,tempo" (tempo em segundos; solução vazia se não foi encontrada, "esgotado" se o
+             limite de tempo ou de nós acabou, "multiplas" se o problema tem mais de uma solução e "invalido" se a
+             entrada não é um problema válido). Com estatísticas, os campos de Estatisticas.CAMPOS
+             são adicionados ao final da linha, na mesma ordem
+    """
+    if solucao == ESGOTADO:
+        solucao = 'esgotado'
+    elif solucao == MULTIPLAS:
+        solucao = 'multiplas'
+    elif solucao == INVALIDO:
+        solucao = 'invalido'
+    linha = f'{problema},{solucao or ""},{tempo.total_seconds():.6f}'
+    if estatisticas is not None:
+        linha += ''.join(f',{estatisticas[campo]}' for campo in Estatisticas.CAMPOS)
+    return linha + '\n'
+
+
+def resolve_arquivo(algoritmo_busca: str, problemas, workers: int = 1, chunk: int = 1, ordenado: bool = True,
+                    compacto: bool = False, saida=None, com_estatisticas: bool = False, opcoes: dict = None,
+                    lote: bool = False, cache: CacheSolucoes = None,
+                    paralela: BuscaParalela or Portfolio = None) -> None:
+    """
+    :param algoritmo_busca: Nome do algoritmo (uma das chaves de ALGORITMOS)
+    :param problemas: Iterável (possivelmente um gerador) de strings, cada uma representando um problema
+    :param workers: Número de processos que resolvem os problemas (1 = tudo no processo atual)
+    :param chunk: Quantos problemas são enviados de uma vez para cada processo
+    :param ordenado: Se False, os resultados são impressos conforme ficam prontos (e não na ordem do arquivo)
+    :param compacto: Se True, escreve uma linha "problema,solucao,tempo" por problema e o resumo vai para sys.stderr
+    :param saida: Onde os resultados são escritos (padrão: sys.stdout)
+    :param com_estatisticas: Se True, escreve as estatísticas de cada resolução e o total ao final
+    :param opcoes: Argumentos extras repassados ao método do algoritmo
+    :param lote: Se True, usa o resolvedor vetorizado em blocos de "chunk" problemas (ver resolve_fluxo)
+    :param cache: Cache de soluções consultado antes de resolver cada problema (ver resolve_fluxo)
+    :param paralela: Pool que resolve cada problema com todos os seus processos (ver resolve_fluxo). No portfólio, o
+                     resumo mostra também quantos problemas cada algoritmo venceu
+    """
+    saida = sys.stdout if saida is None else saida
+    resumo = sys.stderr if compacto else saida  # No modo compacto, a saída padrão só tem os resultados
+
+    n_problemas = 0
+    n_esgotados = 0  # Problemas interrompidos pelo limite de tempo ou de nós
+    n_multiplas = 0  # Problemas com mais de uma solução (só na UNICIDADE)
+    n_sem_solucao = 0
+    n_invalidos = 0  # Entradas que não são problemas válidos
+    total = None  # Estatísticas acumuladas de todos os problemas
+    T0 = dt.datetime.now()
+    for problema, solucao, tempo, estatisticas in resolve_fluxo(algoritmo_busca, problemas, workers, chunk, ordenado,
+                                                               com_estatisticas, opcoes, lote, cache, paralela):
+        n_problemas += 1
+        n_esgotados += solucao == ESGOTADO
+        n_multiplas += solucao == MULTIPLAS
+        n_sem_solucao += solucao is None
+        n_invalidos += solucao == INVALIDO
+        if compacto:
+            saida.write(formata_compacto(problema, solucao, tempo, estatisticas))
+        else:
+            imprime_resultado(problema, solucao, tempo, estatisticas, saida)
+        if estatisticas is not None:
+            total = soma_estatisticas(total, estatisticas)
     Tf = dt.datetime.now()
+    saida.flush()
+
+    if n_problemas == 0:
+        print('Nenhum problema foi encontrado na entrada.', file=resumo)
+        return
+
     print(f'Tempo total de execução: {Tf-T0} (h:min:s:ms)\n'
-          f'Tempo médio de execução: {(Tf-T0)/len(problemas)} (h:min:s:ms)')
+          f'Tempo médio de execução: {(Tf-T0)/n_problemas} (h:min:s:ms)\n'
+          f'Vazão: {n_problemas / max((Tf - T0).total_seconds(), 1e-9):.2f} problemas/s', file=resumo)
+    if n_esgotados:
+        print(f'Problemas interrompidos por limite de tempo ou de nós: {n_esgotados}', file=resumo)
+    if n_invalidos:
+        print(f'Entradas que não são problemas válidos: {n_invalidos}', file=resumo)
+    if algoritmo_busca.upper() == 'UNICIDADE':
+        n_unicos = n_problemas - n_esgotados - n_multiplas - n_sem_solucao
+        print(f'Solução única: {n_unicos}, mais de uma solução: {n_multiplas}, sem solução: {n_sem_solucao}',
+              file=resumo)
+    if total is not None:
+        print(f'\nEstatísticas totais:\n{formata_estatisticas(total)}', file=resumo)
+    if cache is not None:
+        print(f'\n{cache}', file=resumo)
+    if isinstance(paralela, Portfolio):
+        vitorias = ', '.join(f'{algoritmo}: {n}' for algoritmo, n in paralela.vitorias.items())
+        print(f'\nVitórias no portfólio: {vitorias}', file=resumo)
 
 
-except (FileNotFoundError, IndexError):  # Se nao for fornecido nenhum arquivo de texto
-    print('Não foi possivel acessar os dados no arquivo ou este não foi fornecido.')
-    problema_sudoku = input('Insira manualmente o seu problema: ')  # Exemplo de problema: .......2143.......6........2.15..........637...........68...4.....23........7....
-    algoritmo_busca = input('Insira o algoritmo que deseja usar ("BFS", "DFS", "A*", "AC3", "Backtracking"): ').upper()
+def le_argumentos(argv: list) -> argparse.Namespace:
+    """
+    :param argv: Argumentos passados no terminal (sem o nome do programa)
+    :return: Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(prog='python -m main', description='Resolve problemas sudoku de um arquivo.')
+    parser.add_argument('algoritmo', nargs='?',
+                        help=f'Algoritmo de busca ({", ".join(ALGORITMOS)}) ou PORTFOLIO (ver --portfolio)')
+    parser.add_argument('arquivo', nargs='?', help='Arquivo de texto com um problema por linha ("-" lê da entrada padrão) '
+                                                   'ou arquivo no formato binário (ver corpus.py)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de processos usados para resolver os problemas do arquivo (padrão: 1)')
+    parser.add_argument('--chunk', type=int, default=None,
+                        help='Quantidade de problemas enviada de uma vez a cada processo (padrão: 1, ou '
+                             f'{TAMANHO_LOTE} com --lote)')
+    parser.add_argument('--desordenado', action='store_true',
+                        help='Imprime os resultados conforme ficam prontos, sem manter a ordem do arquivo')
+    parser.add_argument('--compacto', action='store_true',
+                        help='Escreve uma linha "problema,solucao,tempo" por problema (o resumo vai para stderr)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Coleta e mostra as estatísticas de cada resolução (nós, retrocessos, tempos etc.)')
+    parser.add_argument('--memoria-bfs', type=int, default=None, metavar='MIB',
+                        help='Limite de memória (em MiB) das fronteiras da BFS por problema '
+                             f'(padrão: {MEMORIA_MAX_BFS // 2 ** 20})')
+    parser.add_argument('--propagacao', type=str.upper, choices=NIVEIS_PROPAGACAO, default=None,
+                        help='Nível da propagação feita a cada nó do backtracking, do mais fraco ao mais forte '
+                             f'(padrão: {PROPAGACAO_PADRAO}; ver python -m benchmark_propagacao)')
+    parser.add_argument('--paralelo', type=int, default=None, metavar='N',
+                        help='Divide cada problema entre N processos, que resolvem partes da árvore de busca e param '
+                             f'assim que um deles acha a solução (só {" e ".join(ALGORITMOS_PARALELOS)}; útil para '
+                             'poucos problemas difíceis)')
+    parser.add_argument('--portfolio', nargs='+', type=str.upper, choices=list(ALGORITMOS),
+                        default=list(PORTFOLIO_PADRAO), metavar='ALGORITMO',
+                        help='Algoritmos que correm, cada um em seu processo, com o algoritmo PORTFOLIO: vale a primeira '
+                             f'solução encontrada (padrão: {" ".join(PORTFOLIO_PADRAO)})')
+    parser.add_argument('--lote', action='store_true',
+                        help='Resolve blocos de problemas de uma vez com o resolvedor vetorizado (requer NumPy); o '
+                             'algoritmo escolhido só resolve o que a propagação não termina')
+    parser.add_argument('--timeout', type=float, default=None, metavar='SEGUNDOS',
+                        help='Tempo máximo de cada resolução; ao passar dele, o problema é marcado como esgotado')
+    parser.add_argument('--max-nos', type=int, default=None,
+                        help='Quantidade máxima de nós expandidos em cada resolução')
+    parser.add_argument('--cache', metavar='ARQUIVO',
+                        help='Usa um cache de soluções (inclusive de problemas equivalentes por simetria), lido do '
+                             'arquivo no início (se existir) e gravado nele ao final')
+    parser.add_argument('--cache-tamanho', type=int, default=100_000,
+                        help='Quantidade máxima de soluções no cache (padrão: 100000)')
+    return parser.parse_args(argv)
 
-    if algoritmo_busca not in ['BFS', 'DFS', 'A*', 'AC3', 'BACKTRACKING']:
-        print("Opção inválida!")
-        sys.exit()
 
-    sudoku = Sudoku(problema_sudoku)
-    print(f'========================================\n'
-          f'Estado inicial:\n\n{sudoku}\n')
-    t0 = dt.datetime.now()  # Iniciando a medida de tempo gasto
+if __name__ == '__main__':
+    args = le_argumentos(sys.argv[1:])
 
-    if algoritmo_busca == 'BFS':
-        sudoku.busca_largura()  # Inicia busca em largura
-    elif algoritmo_busca == 'DFS':
-        sudoku.busca_profundidade()  # Inicia busca em profundidade
-    elif algoritmo_busca == 'A*':
-        sudoku.busca_A_estrela()  # Inicia busca A*
-    elif algoritmo_busca == 'AC3':
-        sudoku.ac3()  # Inicia processo de AC-3
-    else:  # i.e., Backtracking:
-        sudoku.backtracking()  # Inicia busca usando backtracking
+    try:
+        if args.algoritmo is None or args.arquivo is None:
+            raise IndexError
 
-    tf = dt.datetime.now()  # Calculando tempo final
-    print(f'Estado final: \n\n{sudoku}\n\n'
-          f'String solução: {sudoku.solucao}\n\n'
-          f'Tempo gasto: {tf - t0} (h:min:s:ms)\n'
-          f'========================================\n\n')
+        algoritmo_busca = args.algoritmo.upper()  # Recebendo o algoritmo que irá realizar a busca
+        input_problemas = args.arquivo  # Recebendo o nome do arquivo no terminal
+
+        if algoritmo_busca not in ALGORITMOS and algoritmo_busca != 'PORTFOLIO':
+            print("Opção inválida!")
+            sys.exit()
+
+        # Os problemas são lidos sob demanda (linha a linha), do arquivo ou da entrada padrão ("-"), ou direto do
+        # arquivo mapeado em memória, no formato binário (ver corpus.py)
+        if input_problemas != '-' and eh_binario(input_problemas):
+            arqv = problemas = CorpusBinario(input_problemas)
+        else:
+            arqv = sys.stdin if input_problemas == '-' else open(input_problemas)
+            problemas = le_problemas(arqv)
+        saida = None
+        if args.compacto:  # Escrita com um buffer grande, já que cada resultado ocupa uma única linha
+            saida = open(sys.stdout.fileno(), 'w', buffering=1 << 20, encoding=sys.stdout.encoding, closefd=False)
+
+        opcoes = {}
+        if algoritmo_busca == 'BFS' and args.memoria_bfs is not None:
+            opcoes['memoria_max'] = args.memoria_bfs * 2 ** 20
+        if algoritmo_busca == 'BACKTRACKING' and args.propagacao is not None:
+            opcoes['propagacao'] = args.propagacao
+        if args.timeout is not None:
+            opcoes['limite_tempo'] = args.timeout
+        if args.max_nos is not None:
+            opcoes['max_nos'] = args.max_nos
+
+        chunk = args.chunk or (TAMANHO_LOTE if args.lote else 1)
+
+        cache = None
+        if args.cache is not None:
+            cache = CacheSolucoes(args.cache_tamanho)
+            if os.path.exists(args.cache):
+                invalidas = cache.carrega(args.cache)
+                if invalidas:
+                    print(f'{invalidas} linhas inválidas do cache {args.cache} foram ignoradas.', file=sys.stderr)
+
+        paralela = None
+        if args.paralelo is not None:
+            if algoritmo_busca not in ALGORITMOS_PARALELOS or args.workers > 1 or args.lote:
+                print(f'A opção --paralelo só vale para {" e ".join(ALGORITMOS_PARALELOS)}, sem --workers e --lote.')
+                sys.exit()
+            paralela = BuscaParalela(args.paralelo)
+        elif algoritmo_busca == 'PORTFOLIO':
+            if args.workers > 1 or args.lote:
+                print('O portfólio já usa um processo por algoritmo e não pode ser usado com --workers e --lote.')
+                sys.exit()
+            paralela = Portfolio(args.portfolio)
+
+        try:
+            with arqv:
+                resolve_arquivo(algoritmo_busca, problemas, args.workers, chunk, not args.desordenado,
+                                args.compacto, saida, args.stats, opcoes, args.lote, cache, paralela)
+        finally:
+            if paralela is not None:
+                paralela.encerra()
+
+        if cache is not None:
+            cache.salva(args.cache)
+
+    except (FileNotFoundError, IndexError):  # Se nao for fornecido nenhum arquivo de texto
+        print('Não foi possivel acessar os dados no arquivo ou este não foi fornecido.')
+        problema_sudoku = input('Insira manualmente o seu problema: ')  # Exemplo de problema: .......2143.......6........2.15..........637...........68...4.....23........7....
+        algoritmo_busca = input('Insira o algoritmo que deseja usar ("BFS", "DFS", "A*", "AC3", "Backtracking", "DLX", "Unicidade"): ').upper()
+
+        if algoritmo_busca not in ALGORITMOS:
+            print("Opção inválida!")
+            sys.exit()
+
+        imprime_resultado(*resolve_problema(algoritmo_busca, problema_sudoku))
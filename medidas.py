@@ -0,0 +1,19 @@
+"""
+Medidas de resumo usadas nos relatórios de desempenho (benchmark.py) e nas métricas do serviço (servidor.py).
+"""
+
+
+def percentil(valores: list, p: float) -> float or None:
+    """
+    :param valores: Lista de números
+    :param p: Percentil desejado (de 0 a 100)
+    :return: O percentil dos valores, com interpolação linear entre os dois valores mais próximos (ou None se vazia)
+    """
+    if len(valores) == 0:
+        return None
+
+    ordenados = sorted(valores)
+    pos = (len(ordenados) - 1) * p / 100
+    inferior = int(pos)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (pos - inferior)
@@ -0,0 +1,255 @@
+"""
+Busca paralela dentro de um único problema: os primeiros níveis da árvore de busca são expandidos no processo atual e
+os subproblemas resultantes (o problema com algumas casas a mais preenchidas) são resolvidos por um pool de processos.
+Há bem mais subproblemas do que processos e cada processo pega o próximo subproblema da fila assim que termina o
+anterior, então os processos que caem em subárvores pequenas continuam trabalhando nas restantes em vez de ficarem
+parados. Assim que um subproblema é resolvido, um evento compartilhado cancela todos os outros (ver
+sudoku.Orcamento), e o pool fica pronto para o próximo problema.
+
+O mesmo mecanismo de cancelamento é usado pelo portfólio (ver Portfolio), em que vários algoritmos correm sobre o
+mesmo problema, cada um em seu processo, e vale a primeira solução encontrada.
+
+Uso no código:
+    with BuscaParalela(workers=4) as busca:
+        solucao = busca.resolve(problema, 'BACKTRACKING')
+    with Portfolio(('DFS', 'BACKTRACKING', 'DLX')) as portfolio:
+        solucao = portfolio.resolve(problema)
+        print(portfolio.vencedor)
+
+No terminal, as opções "--paralelo N" e "portfolio" (no lugar do algoritmo) do main fazem o mesmo para cada problema
+do arquivo.
+"""
+from sudoku import Sudoku, Tabuleiro, Estatisticas, ALGORITMOS, ESGOTADO
+from collections import deque
+from multiprocessing import Pool
+import multiprocessing
+import os
+import time
+
+# Algoritmos que podem ser divididos entre processos (a divisão gera subproblemas que qualquer um deles resolve)
+ALGORITMOS_PARALELOS = ('BACKTRACKING', 'DFS')
+
+# Quantidade padrão de subproblemas gerados para cada processo do pool
+PARTES_POR_PROCESSO = 8
+
+# Algoritmos que correm por padrão no portfólio (ver Portfolio)
+PORTFOLIO_PADRAO = ('DFS', 'BACKTRACKING', 'DLX')
+
+_cancelamento = None  # Evento de cancelamento compartilhado, em cada processo do pool (ver _inicia_processo)
+
+
+def _inicia_processo(cancelamento) -> None:
+    """
+    :param cancelamento: Evento compartilhado que, quando ligado, interrompe os subproblemas em andamento
+    """
+    global _cancelamento
+    _cancelamento = cancelamento
+
+
+def _resolve_subproblema(args: tuple) -> str or None:
+    """
+    :param args: Tupla (algoritmo, subproblema, prazo, opcoes), onde o prazo é o instante (time.time) em que o tempo
+                 do problema inteiro acaba (ou None)
+    :return: A solução do subproblema, None se ele não tem solução (ou se outro subproblema já foi resolvido) ou
+             ESGOTADO
+    """
+    algoritmo, subproblema, prazo, opcoes = args
+    if _cancelamento.is_set():  # Outro subproblema já foi resolvido: nem começa
+        return None
+
+    if prazo is not None:
+        restante = prazo - time.time()
+        if restante <= 0:
+            return ESGOTADO
+        opcoes = dict(opcoes, limite_tempo=restante)
+
+    sudoku = Sudoku(subproblema)
+    sudoku.cancelamento = _cancelamento
+    sudoku.resolve(algoritmo, **opcoes)
+    return sudoku.situacao()
+
+
+def _resolve_com_algoritmo(args: tuple) -> tuple:
+    """
+    :param args: Tupla (algoritmo, problema, prazo, opcoes), como em _resolve_subproblema
+    :return: Tupla (algoritmo, resultado, estatísticas em dicionário ou None), onde o resultado segue
+             _resolve_subproblema (a solução do AC3 pode ser parcial ou nem existir)
+    """
+    algoritmo, problema, prazo, opcoes = args
+    if _cancelamento.is_set():  # Outro algoritmo já respondeu
+        return algoritmo, None, None
+
+    estatisticas = Estatisticas()
+    resultado = _resolve_subproblema((algoritmo, problema, prazo, dict(opcoes, estatisticas=estatisticas)))
+    return algoritmo, resultado, estatisticas.como_dict()
+
+
+def divide(problema: str, quantidade: int) -> tuple:
+    """
+    :param problema: String contendo o problema
+    :param quantidade: Quantidade mínima de subproblemas desejada
+    :return: Tupla (subproblemas, solucao). Os subproblemas são obtidos expandindo os tabuleiros em largura, sempre pela
+             casa mais restrita (MRV), até haver pelo menos "quantidade" deles (ou até a árvore acabar); as soluções do
+             problema são exatamente as soluções dos subproblemas. Se a expansão já chegar a uma solução, ela é
+             devolvida em "solucao" (e os subproblemas ficam vazios)
+    """
+    raiz = Tabuleiro(problema)
+    if raiz.conflitos != 0:  # Com dígitos repetidos já no problema, não há solução
+        return [], None
+
+    fronteira = deque([raiz])
+    while len(fronteira) != 0 and len(fronteira) < quantidade:
+        tabuleiro = fronteira.popleft()
+        pos, livres = tabuleiro.mais_restrita()
+        if pos == -1:  # Tabuleiro completo (só colocamos dígitos livres, então é uma solução)
+            return [], tabuleiro.estado
+        fronteira.extend(tabuleiro.coloca(pos, digito) for digito in livres)  # Becos sem saída não geram filhos
+
+    return [tabuleiro.estado for tabuleiro in fronteira], None
+
+
+class _PoolCancelavel:
+    """
+    Pool de processos já aquecidos que compartilham um evento de cancelamento (ver sudoku.Orcamento). Depois que uma
+    resolução encontra sua resposta, as tarefas que sobraram são canceladas e só são recolhidas no início da próxima
+    resolução (ou nunca, se o pool for encerrado antes), para que a resposta não espere por elas.
+    """
+    def __init__(self, workers: int) -> None:
+        """
+        :param workers: Número de processos
+        """
+        self.workers = workers
+        self.cancelamento = multiprocessing.Event()
+        self.pool = Pool(workers, initializer=_inicia_processo, initargs=(self.cancelamento,))
+        self._pendentes = None  # Resultados ainda não recolhidos da última resolução
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.encerra()
+
+    def encerra(self) -> None:
+        """
+        Encerra os processos do pool.
+        """
+        self.pool.terminate()
+        self.pool.join()
+
+    def _dispara(self, funcao, tarefas: list) -> iter:
+        """
+        :param funcao: Função executada nos processos (no nível do módulo, para poder ser enviada a eles)
+        :param tarefas: Argumento de cada chamada da função
+        :return: Iterador dos resultados, conforme ficam prontos. Com chunksize=1, cada processo só pega uma nova
+                 tarefa quando termina a anterior
+        """
+        if self._pendentes is not None:  # Recolhe as tarefas canceladas da resolução anterior (já estão terminando)
+            for _ in self._pendentes:
+                pass
+        self.cancelamento.clear()
+        self._pendentes = self.pool.imap_unordered(funcao, tarefas, chunksize=1)
+        return self._pendentes
+
+    def _cancela(self) -> None:
+        """
+        Avisa os processos de que a resposta já foi encontrada: as tarefas em andamento param no próximo teste do
+        orçamento e as que ainda estão na fila nem começam.
+        """
+        self.cancelamento.set()
+
+
+class BuscaParalela(_PoolCancelavel):
+    """
+    Pool de processos que resolve um problema por vez, dividido em subproblemas (ver a descrição do módulo).
+    """
+    def __init__(self, workers: int = None, partes_por_processo: int = PARTES_POR_PROCESSO) -> None:
+        """
+        :param workers: Número de processos (padrão: os.cpu_count())
+        :param partes_por_processo: Quantidade de subproblemas gerados para cada processo
+        """
+        super().__init__(workers or os.cpu_count() or 1)
+        self.partes_por_processo = partes_por_processo
+        self.n_subproblemas = 0  # Quantidade de subproblemas da última resolução
+        self.estatisticas = None  # A busca dividida não coleta estatísticas (ver Portfolio)
+
+    def resolve(self, problema: str, algoritmo: str = 'BACKTRACKING', limite_tempo: float = None,
+                **opcoes) -> str or None:
+        """
+        :param problema: String contendo o problema
+        :param algoritmo: Algoritmo usado nos subproblemas (um dos ALGORITMOS_PARALELOS)
+        :param limite_tempo: Tempo máximo (em segundos) do problema inteiro (opcional)
+        :param opcoes: Argumentos repassados ao algoritmo em cada subproblema (e.g., max_nos, que vale para cada
+                       subproblema, ou propagacao no backtracking)
+        :return: A solução, None se o problema não tem solução ou ESGOTADO se algum subproblema esgotou seus limites
+                 antes de qualquer solução ser encontrada
+        """
+        algoritmo = algoritmo.upper()
+        if algoritmo not in ALGORITMOS_PARALELOS:
+            raise ValueError(f'A busca paralela só está disponível para {", ".join(ALGORITMOS_PARALELOS)}.')
+
+        prazo = None if limite_tempo is None else time.time() + limite_tempo
+        subproblemas, solucao = divide(problema.rstrip('\n').upper(), self.workers * self.partes_por_processo)
+        self.n_subproblemas = len(subproblemas)
+        if solucao is not None:
+            return solucao
+
+        esgotado = False
+        tarefas = [(algoritmo, subproblema, prazo, opcoes) for subproblema in subproblemas]
+        for resultado in self._dispara(_resolve_subproblema, tarefas):
+            if resultado == ESGOTADO:
+                esgotado = True
+            elif resultado is not None:
+                self._cancela()
+                return resultado
+
+        return ESGOTADO if esgotado else None
+
+
+class Portfolio(_PoolCancelavel):
+    """
+    Corrida entre algoritmos: cada algoritmo do portfólio resolve o mesmo problema em um processo próprio, a primeira
+    solução válida é a resposta e os demais algoritmos são cancelados. O vencedor de cada problema é registrado, para
+    que o portfólio possa ser ajustado a partir das vitórias de cada algoritmo.
+    """
+    def __init__(self, algoritmos: tuple = PORTFOLIO_PADRAO) -> None:
+        """
+        :param algoritmos: Nomes dos algoritmos (chaves de ALGORITMOS), um processo para cada
+        """
+        algoritmos = tuple(dict.fromkeys(algoritmo.upper() for algoritmo in algoritmos))  # Sem repetições
+        invalidos = [algoritmo for algoritmo in algoritmos if algoritmo not in ALGORITMOS]
+        if invalidos or not algoritmos:
+            raise ValueError(f'Algoritmos inválidos para o portfólio: {", ".join(invalidos) or "nenhum algoritmo"}.')
+
+        super().__init__(len(algoritmos))
+        self.algoritmos = algoritmos
+        self.vencedor = None  # Algoritmo que respondeu a última resolução (ou None, se nenhum a resolveu)
+        self.estatisticas = None  # Estatísticas (em dicionário) do vencedor da última resolução
+        self.vitorias = dict.fromkeys(algoritmos, 0)  # Quantas resoluções cada algoritmo venceu
+
+    def resolve(self, problema: str, algoritmo: str = 'PORTFOLIO', limite_tempo: float = None,
+                **opcoes) -> str or None:
+        """
+        :param problema: String contendo o problema
+        :param algoritmo: Ignorado (existe para manter a mesma chamada de BuscaParalela.resolve)
+        :param limite_tempo: Tempo máximo (em segundos) da corrida (opcional)
+        :param opcoes: Argumentos repassados a todos os algoritmos (e.g., max_nos)
+        :return: A primeira solução válida encontrada, None se o problema não tem solução ou ESGOTADO se algum
+                 algoritmo esgotou seus limites e nenhum encontrou a solução. O vencedor fica em self.vencedor
+        """
+        problema = problema.rstrip('\n').upper()
+        prazo = None if limite_tempo is None else time.time() + limite_tempo
+        self.vencedor = self.estatisticas = None
+
+        esgotado = False
+        tarefas = [(algoritmo, problema, prazo, opcoes) for algoritmo in self.algoritmos]
+        for algoritmo, resultado, estatisticas in self._dispara(_resolve_com_algoritmo, tarefas):
+            if resultado == ESGOTADO:
+                esgotado = True
+            elif resultado is not None and Sudoku.atingiu_objetivo(resultado) and \
+                    all(a == '.' or a == b for a, b in zip(problema, resultado)):  # Solução do próprio problema
+                self._cancela()
+                self.vencedor, self.estatisticas = algoritmo, estatisticas
+                self.vitorias[algoritmo] += 1
+                return resultado
+
+        return ESGOTADO if esgotado else None
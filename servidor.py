@@ -0,0 +1,327 @@
+"""
+Serviço local de resolução de problemas sudoku, para não pagar a inicialização do interpretador a cada problema.
+
+Uso:
+    python -m servidor [--host 127.0.0.1] [--porta 8765 | --unix CAMINHO] [--workers N] [--max-pendentes N]
+
+O protocolo é de uma linha JSON por mensagem, nos dois sentidos. Cada pedido tem a forma
+    {"id": 1, "problema": "....", "algoritmo": "DLX", "timeout": 2.0, "max_nos": 100000, "stats": false}
+(apenas "problema" é obrigatório, em qualquer tamanho aceito por sudoku.Sudoku; o algoritmo padrão é o DLX) e recebe
+uma resposta
+    {"id": 1, "estado": "resolvido", "solucao": "...", "tempo": 0.003, "latencia": 0.004}
+onde o estado é "resolvido", "sem_solucao", "esgotado" (limite de tempo ou de nós atingido) ou "multiplas" (com o
+algoritmo UNICIDADE, quando o problema tem mais de uma solução). Pedidos inválidos recebem {"id": ..., "erro":
+"mensagem"} e o pedido {"comando": "metricas"} devolve as métricas do serviço.
+
+Um mesmo cliente pode enviar vários pedidos sem esperar as respostas (pipelining): as respostas saem conforme ficam
+prontas, não necessariamente na ordem dos pedidos, e trazem o "id" do pedido. Os problemas são resolvidos por um pool
+de processos já aquecidos; quando há "max_pendentes" problemas em andamento, o serviço para de ler novos pedidos (e o
+próprio TCP segura os clientes) até que algum termine. Só os problemas ocupam vagas, e só depois de lidos: conexões
+ociosas não impedem que os outros clientes sejam atendidos.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from main import resolve_problema
+from medidas import percentil
+from sudoku import Sudoku, Geometria, ALGORITMOS, ESGOTADO, MULTIPLAS
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# Quantidade de medidas recentes usadas nos percentis de latência e de espera
+JANELA_METRICAS = 1000
+
+
+def _aquece() -> bool:
+    """
+    :return: True se o problema de aquecimento foi resolvido (o que carrega os módulos e as tabelas de sudoku.py no
+             processo do pool)
+    """
+    return Sudoku.atingiu_objetivo(
+        Sudoku('.......2143.......6........2.15..........637...........68...4.....23........7....').dlx())
+
+
+def _le_pedido(linha: bytes) -> dict:
+    """
+    :param linha: Linha recebida do cliente
+    :return: O pedido validado, com os campos opcionais preenchidos
+    """
+    try:
+        pedido = json.loads(linha)
+    except ValueError:
+        raise ValueError('Pedido não é um JSON válido.')
+    if not isinstance(pedido, dict):
+        raise ValueError('Pedido deve ser um objeto JSON.')
+
+    if pedido.get('comando') is not None:
+        if pedido['comando'] != 'metricas':
+            raise ValueError(f'Comando desconhecido: {pedido["comando"]}.')
+        return pedido
+
+    problema = pedido.get('problema')
+    if not isinstance(problema, str):
+        raise ValueError('O problema deve ser uma string.')
+    problema = pedido['problema'] = problema.upper()
+    geometria = Geometria.do_problema(problema)  # ValueError se o tamanho não for de nenhum tabuleiro
+    if any(c != '.' and c not in geometria.indice for c in problema):
+        raise ValueError(f'O problema deve ter apenas "." ou os símbolos de {geometria.simbolos[0]} a '
+                         f'{geometria.simbolos[-1]}.')
+
+    algoritmo = str(pedido.get('algoritmo', 'DLX')).upper()
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f'Algoritmo desconhecido: {pedido.get("algoritmo")}.')
+    pedido['algoritmo'] = algoritmo
+
+    opcoes = {}
+    for campo, opcao, tipo in (('timeout', 'limite_tempo', float), ('max_nos', 'max_nos', int)):
+        if pedido.get(campo) is not None:
+            try:  # TypeError para listas, objetos etc.; ValueError para strings que não são números
+                opcoes[opcao] = tipo(pedido[campo])
+            except (TypeError, ValueError):
+                raise ValueError(f'O campo "{campo}" deve ser um número.')
+    pedido['opcoes'] = opcoes
+    return pedido
+
+
+def _id_do_pedido(linha: bytes):
+    """
+    :param linha: Linha recebida do cliente
+    :return: O "id" do pedido, se a linha for um objeto JSON que o tenha, ou None
+    """
+    try:
+        pedido = json.loads(linha)
+    except ValueError:
+        return None
+    return pedido.get('id') if isinstance(pedido, dict) else None
+
+
+class Servidor:
+    """
+    Serviço asyncio (TCP ou socket Unix) que repassa os problemas recebidos para um pool de processos.
+    """
+    def __init__(self, workers: int = None, max_pendentes: int = None) -> None:
+        """
+        :param workers: Número de processos do pool (padrão: número de CPUs)
+        :param max_pendentes: Quantidade máxima de problemas em andamento ao mesmo tempo, somando todos os clientes
+                              (padrão: 4 por processo)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pendentes = max_pendentes or 4 * self.workers
+        self.pool = None
+        self.servidor = None
+        self.endereco = None  # (host, porta) ou caminho do socket Unix, depois de "inicia"
+
+        self._vagas = None  # Semáforo com as vagas para problemas em andamento (criado já dentro do loop)
+        self.pendentes = 0  # Problemas enviados ao pool e ainda não respondidos
+        self.clientes = 0  # Conexões abertas
+        self.atendidos = 0  # Problemas respondidos
+        self.erros = 0  # Pedidos inválidos
+        self.latencias = deque(maxlen=JANELA_METRICAS)  # Do recebimento do pedido até a resposta (em segundos)
+        self.esperas = deque(maxlen=JANELA_METRICAS)  # Parte da latência fora da resolução (fila, envio etc.)
+
+    async def inicia(self, host: str = '127.0.0.1', porta: int = 8765, caminho_unix: str = None) -> None:
+        """
+        :param host: Endereço TCP (ignorado se "caminho_unix" for dado)
+        :param porta: Porta TCP (0 escolhe uma porta livre)
+        :param caminho_unix: Caminho de um socket Unix (opcional)
+        """
+        self._vagas = asyncio.Semaphore(self.max_pendentes)
+        self.pool = ProcessPoolExecutor(self.workers)
+
+        # Aquece todos os processos antes de aceitar conexões (o primeiro problema não paga a criação do processo)
+        loop = asyncio.get_running_loop()
+        resolvidos = await asyncio.gather(*(loop.run_in_executor(self.pool, _aquece) for _ in range(self.workers)))
+        if not all(resolvidos):
+            self.pool.shutdown()
+            raise RuntimeError('Os processos do pool não resolveram o problema de aquecimento.')
+
+        if caminho_unix is not None:
+            self.servidor = await asyncio.start_unix_server(self._atende, path=caminho_unix)
+            self.endereco = caminho_unix
+        else:
+            self.servidor = await asyncio.start_server(self._atende, host, porta)
+            self.endereco = self.servidor.sockets[0].getsockname()[:2]
+
+    async def encerra(self) -> None:
+        """
+        Para de aceitar conexões e encerra o pool de processos.
+        """
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def metricas(self) -> dict:
+        """
+        :return: Métricas do serviço: profundidade da fila (problemas esperando um processo livre), problemas em
+                 andamento, clientes, atendidos, erros e percentis (em segundos) das últimas latências e esperas
+        """
+        latencias, esperas = list(self.latencias), list(self.esperas)
+        return {
+            'fila': max(self.pendentes - self.workers, 0),
+            'pendentes': self.pendentes,
+            'max_pendentes': self.max_pendentes,
+            'workers': self.workers,
+            'clientes': self.clientes,
+            'atendidos': self.atendidos,
+            'erros': self.erros,
+            'latencia_p50': percentil(latencias, 50),
+            'latencia_p95': percentil(latencias, 95),
+            'latencia_max': max(latencias, default=None),
+            'espera_p50': percentil(esperas, 50),
+            'espera_p95': percentil(esperas, 95),
+        }
+
+    async def _atende(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        :param reader: Leitura da conexão com o cliente
+        :param writer: Escrita da conexão com o cliente
+        """
+        self.clientes += 1
+        escrita = asyncio.Lock()  # Uma resposta por vez na conexão
+        tarefas = set()
+        try:
+            while True:
+                try:
+                    linha = await reader.readline()
+                except (ConnectionError, ValueError):  # Conexão perdida ou linha longa demais
+                    linha = b''
+                if not linha:
+                    break
+                if not linha.strip():
+                    continue
+
+                t0 = time.perf_counter()
+                # Erros e métricas são respondidos aqui mesmo, antes de ler a próxima linha: não criam tarefas, então
+                # uma enxurrada desses pedidos também fica sujeita ao backpressure (da escrita na conexão)
+                try:
+                    pedido = _le_pedido(linha)
+                except ValueError as excecao:
+                    self.erros += 1
+                    await self._responde({'id': _id_do_pedido(linha), 'erro': str(excecao)}, writer, escrita)
+                    continue
+                if pedido.get('comando') is not None:
+                    await self._responde({'id': pedido.get('id'), 'metricas': self.metricas()}, writer, escrita)
+                    continue
+
+                # Só os problemas ocupam uma vaga, e só depois de lidos: um cliente que conecta e não envia nada não
+                # segura vaga nenhuma. Sem vagas, não lemos mais nada deste cliente até alguma vaga abrir (backpressure)
+                await self._vagas.acquire()
+                tarefa = asyncio.create_task(self._processa(pedido, t0, writer, escrita))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(tarefas.discard)
+
+            if tarefas:  # O cliente terminou de enviar: esperamos as respostas que faltam
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        finally:
+            self.clientes -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _responde(resposta: dict, writer: asyncio.StreamWriter, escrita: asyncio.Lock) -> None:
+        """
+        :param resposta: Resposta a ser enviada ao cliente (uma linha JSON)
+        :param writer: Escrita da conexão com o cliente
+        :param escrita: Trava da escrita na conexão
+        """
+        try:
+            async with escrita:
+                writer.write(json.dumps(resposta).encode() + b'\n')
+                await writer.drain()  # Cliente lento: esperamos o buffer esvaziar
+        except ConnectionError:
+            pass
+
+    async def _processa(self, pedido: dict, t0: float, writer: asyncio.StreamWriter, escrita: asyncio.Lock) -> None:
+        """
+        :param pedido: Pedido de resolução validado (ver _le_pedido), que ocupa uma vaga (liberada ao final)
+        :param t0: Instante (time.perf_counter) em que o pedido foi lido
+        :param writer: Escrita da conexão com o cliente
+        :param escrita: Trava da escrita na conexão
+        """
+        try:
+            resposta = {'id': pedido.get('id')}
+            try:
+                resposta.update(await self._resolve(pedido, t0))
+            except Exception as excecao:  # E.g., pool quebrado: o cliente recebe o erro, não fica sem resposta
+                self.erros += 1
+                resposta['erro'] = f'Falha ao resolver o problema: {excecao!r}'
+            await self._responde(resposta, writer, escrita)
+        finally:
+            self._vagas.release()
+
+    async def _resolve(self, pedido: dict, t0: float) -> dict:
+        """
+        :param pedido: Pedido validado (ver _le_pedido)
+        :param t0: Instante em que o pedido foi lido
+        :return: Campos da resposta (estado, solução, tempo de resolução, latência e, se pedidas, estatísticas)
+        """
+        loop = asyncio.get_running_loop()
+        self.pendentes += 1
+        try:
+            _, solucao, tempo, estatisticas = await loop.run_in_executor(
+                self.pool, resolve_problema, pedido['algoritmo'], pedido['problema'], bool(pedido.get('stats')),
+                pedido['opcoes'])
+        finally:
+            self.pendentes -= 1
+
+        latencia = time.perf_counter() - t0
+        self.atendidos += 1
+        self.latencias.append(latencia)
+        self.esperas.append(max(latencia - tempo.total_seconds(), 0.0))
+
+        if solucao == ESGOTADO:
+            estado, solucao = 'esgotado', None
+        elif solucao == MULTIPLAS:
+            estado, solucao = 'multiplas', None
+        elif solucao is None:
+            estado = 'sem_solucao'
+        else:
+            estado = 'resolvido'
+
+        resposta = {'estado': estado, 'solucao': solucao, 'tempo': tempo.total_seconds(), 'latencia': latencia}
+        if estatisticas is not None:
+            resposta['estatisticas'] = estatisticas
+        return resposta
+
+
+def le_argumentos(argv: list = None) -> argparse.Namespace:
+    """
+    :param argv: Argumentos passados no terminal (sem o nome do programa)
+    :return: Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(prog='python -m servidor', description='Serviço local de resolução de sudokus.')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço TCP (padrão: 127.0.0.1)')
+    parser.add_argument('--porta', type=int, default=8765, help='Porta TCP (padrão: 8765)')
+    parser.add_argument('--unix', metavar='CAMINHO', help='Usa um socket Unix no lugar de TCP')
+    parser.add_argument('--workers', type=int, default=None, help='Processos do pool (padrão: número de CPUs)')
+    parser.add_argument('--max-pendentes', type=int, default=None,
+                        help='Problemas em andamento ao mesmo tempo antes de parar de ler pedidos (padrão: 4 por '
+                             'processo)')
+    return parser.parse_args(argv)
+
+
+async def executa(args: argparse.Namespace) -> None:
+    """
+    :param args: Argumentos do terminal (ver le_argumentos)
+    """
+    servidor = Servidor(args.workers, args.max_pendentes)
+    await servidor.inicia(args.host, args.porta, args.unix)
+    print(f'Servidor pronto em {servidor.endereco} com {servidor.workers} processos.', flush=True)
+    try:
+        await servidor.servidor.serve_forever()
+    finally:
+        await servidor.encerra()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(executa(le_argumentos()))
+    except KeyboardInterrupt:
+        pass
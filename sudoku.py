@@ -1,13 +1,1041 @@
+from collections import deque
+import heapq
+import itertools
+import sys
+import time
+
+
+# Símbolos das casas, em ordem: os dígitos de 1 a 9 e, em tabuleiros maiores que 9x9, as letras (o 16x16 usa de '1' a
+# 'G' e o 25x25, de '1' a 'P'). Em qualquer tamanho, '.' indica uma casa vazia
+SIMBOLOS = '123456789ABCDEFGHIJKLMNOP'
+
+
+class _LivresPorMascara:
+    """
+    Tabela de dígitos livres para tabuleiros com mais de 9 símbolos, onde uma tupla com todas as 2^n máscaras seria
+    grande demais: cada consulta percorre apenas os bits livres da máscara.
+    """
+    __slots__ = ('valores', 'todos')
+
+    def __init__(self, valores: tuple) -> None:
+        """
+        :param valores: Valor devolvido para cada bit livre (o bit i corresponde a valores[i])
+        """
+        self.valores = valores
+        self.todos = (1 << len(valores)) - 1
+
+    def __getitem__(self, mascara: int) -> tuple:
+        livres = ~mascara & self.todos
+        resultado = []
+        while livres:
+            bit = livres & -livres  # Bit livre menos significativo
+            resultado.append(self.valores[bit.bit_length() - 1])
+            livres ^= bit
+        return tuple(resultado)
+
+
+class _QuantidadeLivres:
+    """
+    Tabela com a quantidade de dígitos livres de cada máscara, para tabuleiros com mais de 9 símbolos (ver
+    _LivresPorMascara). Conta os bits sem montar a tupla de dígitos.
+    """
+    __slots__ = ('lado',)
+
+    def __init__(self, lado: int) -> None:
+        self.lado = lado
+
+    def __getitem__(self, mascara: int) -> int:
+        return self.lado - bin(mascara).count('1')
+
+
+class Geometria:
+    """
+    Índices de um tabuleiro com quadrantes k x k (i.e., lado n = k² e n² casas), calculados uma única vez por tamanho
+    (ver Geometria.para):
+    - unidades: as 3n unidades (de 0 a n-1 as linhas, de n a 2n-1 as colunas e de 2n a 3n-1 os quadrantes)
+    - unidades_da_casa: para cada casa, os índices (linha, coluna, quadrante) de suas unidades
+    - vizinhos: para cada casa, a tupla ordenada das casas que dividem alguma unidade com ela (também como frozenset, em
+      conjunto_vizinhos, e como máscara de bits, em mascara_vizinhos)
+    - digitos_livres e valores_livres: para cada máscara de dígitos usados (bit i = i-ésimo símbolo), os símbolos (em
+      string) e os valores (de 1 a n) ainda disponíveis, em ordem; quantidade_livres: quantos são
+    - bits, tamanho_empacotado, meios_bytes_vizinhos e bit_digito: o empacotamento de estados (ver empacota)
+    - caracteres: os símbolos e o '.', i.e., os caracteres aceitos em um problema (ver problema_valido)
+    """
+    __slots__ = ('k', 'lado', 'casas', 'simbolos', 'indice', 'unidades', 'unidades_da_casa', 'vizinhos',
+                 'conjunto_vizinhos', 'mascara_vizinhos', 'digitos_livres', 'valores_livres', 'quantidade_livres', 'bits',
+                 'tamanho_empacotado', 'meios_bytes_vizinhos', 'bit_digito', 'caracteres')
+
+    _por_casas = {}  # Quantidade de casas -> Geometria (preenchido sob demanda por Geometria.para)
+
+    def __init__(self, k: int) -> None:
+        """
+        :param k: Lado dos quadrantes (3 para o Sudoku tradicional 9x9)
+        """
+        n = k * k
+        self.k, self.lado, self.casas = k, n, n * n
+        self.simbolos = SIMBOLOS[:n]
+        self.indice = {simbolo: i for i, simbolo in enumerate(self.simbolos)}  # Símbolo -> bit (de 0 a n - 1)
+        self.caracteres = frozenset(self.simbolos + '.')  # Caracteres aceitos em um problema (ver problema_valido)
+
+        linhas = [tuple(range(n * i, n * (i + 1))) for i in range(n)]
+        colunas = [tuple(range(i, i + n * n, n)) for i in range(n)]
+        quadrantes = [tuple(n * (k * a + i) + k * b + j for i in range(k) for j in range(k))
+                      for a in range(k) for b in range(k)]
+        self.unidades = tuple(linhas + colunas + quadrantes)
+
+        self.unidades_da_casa = tuple((pos // n, n + pos % n, 2 * n + k * (pos // (n * k)) + (pos % n) // k)
+                                      for pos in range(n * n))
+        self.vizinhos = tuple(tuple(sorted({v for u in self.unidades_da_casa[pos] for v in self.unidades[u] if v != pos}))
+                              for pos in range(n * n))
+        self.conjunto_vizinhos = tuple(frozenset(viz) for viz in self.vizinhos)
+        self.mascara_vizinhos = tuple(sum(1 << v for v in viz) for viz in self.vizinhos)
+
+        valores = tuple(range(1, n + 1))
+        if n <= 9:  # Tabelas completas (no 9x9, 512 máscaras)
+            self.digitos_livres = tuple(tuple(s for i, s in enumerate(self.simbolos) if not mascara & (1 << i))
+                                        for mascara in range(1 << n))
+            self.valores_livres = tuple(tuple(v for v in valores if not mascara & (1 << (v - 1)))
+                                        for mascara in range(1 << n))
+            self.quantidade_livres = tuple(len(livres) for livres in self.valores_livres)
+        else:
+            self.digitos_livres = _LivresPorMascara(tuple(self.simbolos))
+            self.valores_livres = _LivresPorMascara(valores)
+            self.quantidade_livres = _QuantidadeLivres(n)
+
+        # Cada casa ocupa 4 bits (até 15 símbolos) ou um byte inteiro, com 0 para a casa vazia e i + 1 para o i-ésimo
+        # símbolo. Os vizinhos de uma casa são lidos direto do estado empacotado pelos pares (byte, deslocamento)
+        self.bits = 4 if n < 16 else 8
+        por_byte = 8 // self.bits
+        self.tamanho_empacotado = (n * n + por_byte - 1) // por_byte
+        self.meios_bytes_vizinhos = tuple(tuple((v // por_byte, (8 - self.bits) * (1 - v % por_byte)) for v in viz)
+                                          for viz in self.vizinhos)
+        self.bit_digito = (0,) + tuple(1 << i for i in range(n)) + (0,) * ((1 << self.bits) - n - 1)
+
+    def __repr__(self) -> str:
+        return f'Geometria({self.k})'
+
+    @staticmethod
+    def para(k: int) -> 'Geometria':
+        """
+        :param k: Lado dos quadrantes (de 2 a 5, i.e., tabuleiros de 4x4 a 25x25)
+        :return: A geometria do tabuleiro (a mesma instância a cada chamada)
+        """
+        if not 2 <= k <= 5:
+            raise ValueError(f'Tamanho de quadrante não suportado: {k} (use de 2 a 5).')
+        geometria = Geometria._por_casas.get(k ** 4)
+        if geometria is None:
+            geometria = Geometria._por_casas[k ** 4] = Geometria(k)
+        return geometria
+
+    @staticmethod
+    def do_problema(problema: str) -> 'Geometria':
+        """
+        :param problema: String com uma casa por caractere (ou qualquer sequência com um elemento por casa, e.g., as
+                         variáveis de um CSP): 81 casas no 9x9, 256 no 16x16 etc.
+        :return: A geometria correspondente ao tamanho do problema
+        """
+        geometria = Geometria._por_casas.get(len(problema))
+        if geometria is not None:
+            return geometria
+        for k in range(2, 6):
+            if k ** 4 == len(problema):
+                return Geometria.para(k)
+        raise ValueError(f'Problema com {len(problema)} casas não corresponde a nenhum tabuleiro suportado '
+                         f'(16, 81, 256 ou 625 casas).')
+
+
+# Índices do tabuleiro 9x9, calculados uma única vez na importação do módulo (ver Geometria):
+# - UNIDADES: as 27 unidades (de 0 a 8 as linhas, de 9 a 17 as colunas e de 18 a 26 os quadrantes) como tuplas de casas
+# - UNIDADES_DA_CASA: para cada casa, os índices (linha, coluna, quadrante) de suas unidades em UNIDADES
+# - VIZINHOS: para cada casa, a tupla ordenada das 20 casas que dividem alguma unidade com ela
+# - CONJUNTO_VIZINHOS e MASCARA_VIZINHOS: os mesmos vizinhos como frozenset e como máscara de bits (bit n = casa n)
+GEOMETRIA_PADRAO = Geometria.para(3)
+UNIDADES = GEOMETRIA_PADRAO.unidades
+UNIDADES_DA_CASA = GEOMETRIA_PADRAO.unidades_da_casa
+VIZINHOS = GEOMETRIA_PADRAO.vizinhos
+CONJUNTO_VIZINHOS = GEOMETRIA_PADRAO.conjunto_vizinhos
+MASCARA_VIZINHOS = GEOMETRIA_PADRAO.mascara_vizinhos
+
+# Empacotamento de estados em 4 bits por casa ('.' = 0 e os dígitos de 1 a 9): cada byte guarda duas casas, então um
+# estado de 81 casas ocupa 41 bytes (o último meio byte é sempre 0). Tabuleiros de 16x16 em diante usam um byte por casa
+TAMANHO_EMPACOTADO = GEOMETRIA_PADRAO.tamanho_empacotado
+_CARACTERES = '.123456789'
+_PACOTE_PAR = {a + b: (i << 4) | j for i, a in enumerate(_CARACTERES) for j, b in enumerate(_CARACTERES)}
+_DESPACOTE = tuple(_CARACTERES[b >> 4] + _CARACTERES[b & 15] if (b >> 4) < 10 and (b & 15) < 10 else '??'
+                   for b in range(256))
+
+
+def empacota(estado: str, geometria: Geometria = GEOMETRIA_PADRAO) -> bytes:
+    """
+    :param estado: String com uma casa por caractere ('.' ou um dos símbolos da geometria)
+    :param geometria: Geometria do tabuleiro (por padrão, 9x9)
+    :return: O estado em geometria.tamanho_empacotado bytes (41 no 9x9, com 4 bits por casa)
+    """
+    if geometria.bits == 8:  # Um byte por casa
+        indice = geometria.indice
+        return bytes([indice[caracter] + 1 if caracter != '.' else 0 for caracter in estado])
+
+    estado += '.'  # Completa o último par
+    return bytes([_PACOTE_PAR[estado[i:i + 2]] for i in range(0, geometria.casas, 2)])
+
+
+def desempacota(registro: bytes, geometria: Geometria = GEOMETRIA_PADRAO) -> str:
+    """
+    :param registro: Estado empacotado (ver empacota)
+    :param geometria: Geometria do tabuleiro (por padrão, 9x9)
+    :return: A string do estado (81 caracteres no 9x9)
+    """
+    if geometria.bits == 8:
+        caracteres = '.' + geometria.simbolos
+        return ''.join([caracteres[b] for b in registro])
+
+    return ''.join([_DESPACOTE[b] for b in registro])[:geometria.casas]
+
+
+class Tabuleiro:
+    """
+    Representação compacta de um estado do Sudoku. Além da string do estado, guarda uma máscara de bits por unidade
+    (linhas, colunas e quadrantes) com os dígitos já usados, o número de casas vazias e o número de conflitos (dígitos
+    repetidos em uma mesma unidade), atualizados a cada nova jogada. Assim, as ações e o teste de objetivo não precisam
+    percorrer o tabuleiro inteiro.
+    """
+    __slots__ = ('estado', 'mascaras', 'vazias', 'conflitos', 'geometria')
+
+    def __init__(self, estado: str, mascaras: list = None, vazias: int = None, conflitos: int = 0,
+                 geometria: Geometria = None) -> None:
+        """
+        :param estado: String que representa o estado ('.' indica uma casa vazia)
+        :param mascaras: Máscaras das unidades. Se não forem dadas, são calculadas a partir do estado
+        :param vazias: Número de casas vazias (usado apenas junto de "mascaras")
+        :param conflitos: Número de conflitos (usado apenas junto de "mascaras")
+        :param geometria: Geometria do tabuleiro. Se não for dada, é deduzida do tamanho do estado
+        """
+        self.estado = estado
+        self.geometria = geometria if geometria is not None else Geometria.do_problema(estado)
+
+        if mascaras is not None:  # Tabuleiro derivado de outro (i.e., as informações já foram calculadas)
+            self.mascaras = mascaras
+            self.vazias = vazias
+            self.conflitos = conflitos
+            return
+
+        self.mascaras = [0] * len(self.geometria.unidades)
+        self.vazias = 0
+        self.conflitos = 0
+        for pos, caracter in enumerate(estado):
+            if caracter == '.':
+                self.vazias += 1
+            else:
+                self._marca(pos, caracter)
+
+    def __str__(self) -> str:
+        return self.estado
+
+    def __repr__(self) -> str:
+        return f'Tabuleiro({self.estado!r})'
+
+    def _marca(self, pos: int, digito: str) -> None:
+        """
+        :param pos: Posição da casa que recebeu o dígito
+        :param digito: Dígito (símbolo em string) colocado na casa
+        """
+        bit = 1 << self.geometria.indice[digito]
+        mascaras = self.mascaras
+        for unidade in self.geometria.unidades_da_casa[pos]:
+            if mascaras[unidade] & bit:  # O dígito já existia na unidade
+                self.conflitos += 1
+            mascaras[unidade] |= bit
+
+    def livres(self, pos: int) -> tuple:
+        """
+        :param pos: Posição de uma casa do tabuleiro
+        :return: Tupla com os dígitos que ainda podem ser colocados naquela casa
+        """
+        linha, coluna, quadrante = self.geometria.unidades_da_casa[pos]
+        mascaras = self.mascaras
+        return self.geometria.digitos_livres[mascaras[linha] | mascaras[coluna] | mascaras[quadrante]]
+
+    def coloca(self, pos: int, digito: str) -> 'Tabuleiro':
+        """
+        :param pos: Posição de uma casa vazia
+        :param digito: Dígito (em string) a ser colocado
+        :return: Um novo tabuleiro com o dígito colocado na casa (o tabuleiro atual não é alterado)
+        """
+        novo = Tabuleiro(self.estado[:pos] + digito + self.estado[pos + 1:], self.mascaras.copy(), self.vazias - 1,
+                         self.conflitos, self.geometria)
+        novo._marca(pos, digito)
+        return novo
+
+    def mais_restrita(self) -> tuple:
+        """
+        :return: Tupla (posição, dígitos livres) da casa vazia com menos dígitos possíveis (MRV). Se alguma casa vazia não
+                 tiver nenhum dígito possível, ela é devolvida imediatamente (beco sem saída). Se não houver casas vazias,
+                 retorna (-1, ())
+        """
+        mascaras = self.mascaras
+        unidades_da_casa = self.geometria.unidades_da_casa
+        quantidade_livres = self.geometria.quantidade_livres
+        melhor_pos, melhor_usados = -1, 0
+        menor = self.geometria.lado + 1
+        pos = self.estado.find('.')
+        while pos != -1:
+            linha, coluna, quadrante = unidades_da_casa[pos]
+            usados = mascaras[linha] | mascaras[coluna] | mascaras[quadrante]
+            quantidade = quantidade_livres[usados]  # Só a casa escolhida tem a tupla de dígitos montada
+            if quantidade < menor:
+                melhor_pos, melhor_usados, menor = pos, usados, quantidade
+                if menor <= 1:  # Não há como ser mais restrita do que isso
+                    break
+            pos = self.estado.find('.', pos + 1)
+
+        if melhor_pos == -1:
+            return -1, ()
+        return melhor_pos, self.geometria.digitos_livres[melhor_usados]
+
+    def resolvido(self) -> bool:
+        """
+        :return: True se todas as casas estão preenchidas e não há nenhum dígito repetido em uma mesma unidade
+        """
+        return self.vazias == 0 and self.conflitos == 0
+
+
+class Estatisticas:
+    """
+    Registro opcional do que aconteceu em uma resolução. Os algoritmos só atualizam os contadores quando recebem um
+    objeto desta classe (ou um gancho), então o custo é praticamente nulo quando as estatísticas não são pedidas.
+    O gancho, se dado, é chamado como gancho(estatisticas, estado) a cada nó expandido, onde "estado" depende do
+    algoritmo: a string do estado (BFS e DFS), o Tabuleiro (A*), a casa escolhida (backtracking) ou a coluna escolhida
+    (DLX).
+    """
+    CAMPOS = ('nos_expandidos', 'fronteira_max', 'revisoes', 'esvaziamentos', 'retrocessos', 'profundidade_max',
+              'tempo_propagacao', 'tempo_busca')
+
+    def __init__(self, gancho=None) -> None:
+        """
+        :param gancho: Função chamada a cada nó expandido (ou None)
+        """
+        self.algoritmo = None  # Nome do algoritmo que preencheu o registro
+        self.nos_expandidos = 0  # Quantidade de nós (estados ou variáveis escolhidas) expandidos
+        self.fronteira_max = 0  # Maior tamanho da fronteira (fila, pilha ou lista de abertos)
+        self.revisoes = 0  # Quantidade de arcos revisados na propagação
+        self.esvaziamentos = 0  # Quantas vezes algum domínio ficou vazio
+        self.retrocessos = 0  # Quantas vezes a busca voltou atrás por falta de opções
+        self.profundidade_max = 0  # Maior profundidade alcançada na árvore de busca
+        self.tempo_propagacao = 0.0  # Tempo (em segundos) gasto propagando restrições
+        self.tempo_busca = 0.0  # Tempo (em segundos) gasto no restante da busca
+        self.gancho = gancho
+        self._t0 = None
+
+    def __str__(self) -> str:
+        return (f'Nós expandidos: {self.nos_expandidos}\n'
+                f'Maior fronteira: {self.fronteira_max}\n'
+                f'Revisões de arcos: {self.revisoes}\n'
+                f'Domínios esvaziados: {self.esvaziamentos}\n'
+                f'Retrocessos: {self.retrocessos}\n'
+                f'Profundidade máxima: {self.profundidade_max}\n'
+                f'Tempo em propagação: {self.tempo_propagacao:.6f} s\n'
+                f'Tempo em busca: {self.tempo_busca:.6f} s')
+
+    def como_dict(self) -> dict:
+        """
+        :return: Dicionário com o algoritmo e os contadores (pode ser enviado entre processos ou gravado em JSON)
+        """
+        return {'algoritmo': self.algoritmo, **{campo: getattr(self, campo) for campo in self.CAMPOS}}
+
+    def inicia(self, algoritmo: str) -> None:
+        """
+        :param algoritmo: Nome do algoritmo que vai preencher o registro
+        """
+        self.algoritmo = algoritmo
+        self._t0 = time.perf_counter()
+
+    def finaliza(self) -> None:
+        """
+        Calcula o tempo de busca como o tempo total desde "inicia" menos o tempo gasto em propagação.
+        """
+        if self._t0 is not None:
+            self.tempo_busca = time.perf_counter() - self._t0 - self.tempo_propagacao
+            self._t0 = None
+
+    def expandiu(self, estado, profundidade: int, fronteira: int = 0) -> None:
+        """
+        :param estado: Nó expandido (ver a descrição da classe)
+        :param profundidade: Profundidade do nó na árvore de busca
+        :param fronteira: Tamanho atual da fronteira
+        """
+        self.nos_expandidos += 1
+        if profundidade > self.profundidade_max:
+            self.profundidade_max = profundidade
+        if fronteira > self.fronteira_max:
+            self.fronteira_max = fronteira
+        if self.gancho is not None:
+            self.gancho(self, estado)
+
+    @staticmethod
+    def prepara(estatisticas: 'Estatisticas' or None, gancho, algoritmo: str) -> 'Estatisticas' or None:
+        """
+        :param estatisticas: Registro passado ao algoritmo (ou None)
+        :param gancho: Gancho passado ao algoritmo (ou None)
+        :param algoritmo: Nome do algoritmo
+        :return: O registro que o algoritmo deve preencher ou None se nada foi pedido (caso sem custo adicional)
+        """
+        if estatisticas is None and gancho is None:
+            return None
+
+        if estatisticas is None:
+            estatisticas = Estatisticas()
+        if gancho is not None:
+            estatisticas.gancho = gancho
+
+        estatisticas.inicia(algoritmo)
+        return estatisticas
+
+
+class LimiteEsgotado(Exception):
+    """
+    Levantada (e tratada pelos próprios métodos de resolução) quando o tempo ou o número de nós de uma resolução acaba.
+    """
+
+
+class Orcamento:
+    """
+    Limites de tempo e de nós de uma resolução. Os algoritmos chamam "consome" a cada nó expandido (a mesma unidade de
+    Estatisticas.nos_expandidos; no AC3, a cada arco revisado), que levanta LimiteEsgotado quando algum limite acaba.
+    O relógio (e o evento de cancelamento, se houver) só é consultado no primeiro nó e depois a cada 1024 nós, para que a
+    verificação custe quase nada.
+    """
+    __slots__ = ('prazo', 'max_nos', 'nos', 'cancelamento')
+
+    def __init__(self, limite_tempo: float = None, max_nos: int = None, cancelamento=None) -> None:
+        """
+        :param limite_tempo: Tempo máximo (em segundos) a partir de agora (ou None para não limitar)
+        :param max_nos: Quantidade máxima de nós expandidos (ou None para não limitar)
+        :param cancelamento: Evento (e.g., multiprocessing.Event) que, quando ligado, interrompe a resolução como se o
+                             tempo tivesse acabado (ou None)
+        """
+        self.prazo = None if limite_tempo is None else time.perf_counter() + limite_tempo
+        self.max_nos = max_nos
+        self.nos = 0
+        self.cancelamento = cancelamento
+
+    def consome(self) -> None:
+        """
+        Registra mais um nó e levanta LimiteEsgotado se o limite de nós foi passado, se o prazo já venceu ou se a
+        resolução foi cancelada.
+        """
+        self.nos += 1
+        if self.max_nos is not None and self.nos > self.max_nos:
+            raise LimiteEsgotado
+        if self.nos & 1023 == 1:  # No primeiro nó e depois a cada 1024
+            if self.prazo is not None and time.perf_counter() > self.prazo:
+                raise LimiteEsgotado
+            if self.cancelamento is not None and self.cancelamento.is_set():
+                raise LimiteEsgotado
+
+    @staticmethod
+    def prepara(limite_tempo: float or None, max_nos: int or None, cancelamento=None) -> 'Orcamento' or None:
+        """
+        :param limite_tempo: Limite de tempo passado ao algoritmo (ou None)
+        :param max_nos: Limite de nós passado ao algoritmo (ou None)
+        :param cancelamento: Evento de cancelamento da resolução (ou None)
+        :return: O orçamento a ser consumido ou None se nada foi pedido (caso sem custo adicional)
+        """
+        if limite_tempo is None and max_nos is None and cancelamento is None:
+            return None
+        return Orcamento(limite_tempo, max_nos, cancelamento)
+
+
+# Níveis de propagação do MotorCSP, do mais fraco ao mais forte (cada nível também aplica as regras dos anteriores):
+# - AC3: o valor de uma casa atribuída é removido de todos os seus vizinhos
+# - SINGLES: singles ocultos, i.e., um valor que só cabe em uma casa da unidade é atribuído a ela
+# - PARES: pares nus (duas casas da unidade com o mesmo domínio de 2 valores) e ocultos (dois valores que só cabem nas
+#   mesmas duas casas da unidade)
+# - APONTAMENTO: "pointing" e "claiming", i.e., se as casas de uma unidade que aceitam um valor estão todas em uma outra
+#   unidade (e.g., na mesma linha de um quadrante), o valor é removido do restante dessa outra unidade
+NIVEIS_PROPAGACAO = ('AC3', 'SINGLES', 'PARES', 'APONTAMENTO')
+PROPAGACAO_PADRAO = 'AC3'
+
+
+class MotorCSP:
+    """
+    Motor de busca com retrocesso (backtracking) sobre o CSP do Sudoku. Os domínios são alterados no lugar e cada valor
+    removido é registrado em uma trilha, que é desfeita ao retrocedermos (i.e., não há cópias dos domínios a cada nó).
+    A busca é iterativa (pilha explícita) e, para as heurísticas, o motor mantém incrementalmente:
+    - por_tamanho: para cada tamanho de domínio (de 0 ao lado do tabuleiro), o conjunto das casas com aquele tamanho (usado no MRV)
+    - ocorrencias: para cada unidade, quantas casas ainda aceitam cada valor (usado no LCV e nos singles ocultos)
+    Uma casa com domínio de tamanho 1 é considerada atribuída. A cada atribuição, as restrições são propagadas até um
+    ponto fixo com as regras do nível escolhido (ver NIVEIS_PROPAGACAO).
+    """
+    def __init__(self, csp: tuple, estatisticas: Estatisticas = None, orcamento: Orcamento = None,
+                 propagacao: str = PROPAGACAO_PADRAO) -> None:
+        """
+        :param csp: Problema na modelagem CSP (os domínios de D serão alterados no lugar)
+        :param estatisticas: Registro a ser preenchido durante a busca (ou None)
+        :param orcamento: Limites de tempo e de nós da busca (ou None)
+        :param propagacao: Nível de propagação (um dos NIVEIS_PROPAGACAO, sem diferenciar maiúsculas e minúsculas)
+        """
+        if propagacao.upper() not in NIVEIS_PROPAGACAO:
+            raise ValueError(f'Nível de propagação inválido: {propagacao} (use {", ".join(NIVEIS_PROPAGACAO)}).')
+
+        self.X, self.D, self.C = csp
+        self.geometria = Geometria.do_problema(self.X)
+        self.estatisticas = estatisticas
+        self.orcamento = orcamento
+        self.nivel = NIVEIS_PROPAGACAO.index(propagacao.upper())
+        self.trilha = []  # Lista de (nó, valor) removidos dos domínios, na ordem em que foram removidos
+        self.unicos = []  # Pares (unidade, valor) em que o valor ficou com 1 ou 0 casas (só a partir do nível SINGLES)
+
+        unidades_da_casa = self.geometria.unidades_da_casa
+        self.por_tamanho = [set() for _ in range(self.geometria.lado + 1)]
+        self.ocorrencias = [dict.fromkeys(self.geometria.simbolos, 0) for _ in range(len(self.geometria.unidades))]
+        for no in self.X:
+            self.por_tamanho[len(self.D[no])].add(no)
+            for u in unidades_da_casa[no]:
+                for valor in self.D[no]:
+                    self.ocorrencias[u][valor] += 1
+
+    def remove(self, no: int, valor: str) -> int:
+        """
+        :param no: Nó que terá o valor removido de seu domínio
+        :param valor: Valor (presente no domínio) a ser removido
+        :return: O novo tamanho do domínio do nó
+        """
+        dominio = self.D[no]
+        dominio.discard(valor)
+        self.trilha.append((no, valor))
+
+        tamanho = len(dominio)
+        self.por_tamanho[tamanho + 1].discard(no)
+        self.por_tamanho[tamanho].add(no)
+        for u in self.geometria.unidades_da_casa[no]:
+            ocorrencias = self.ocorrencias[u]
+            ocorrencias[valor] -= 1
+            if ocorrencias[valor] < 2 and self.nivel != 0:  # Possível single oculto (ou valor sem lugar na unidade)
+                self.unicos.append((u, valor))
+
+        return tamanho
+
+    def corta(self, no: int, valor: str, fila: list) -> bool:
+        """
+        :param no: Nó que terá o valor removido de seu domínio
+        :param valor: Valor (presente no domínio) a ser removido
+        :param fila: Fila da propagação, que recebe o nó se o domínio dele ficar com um único valor
+        :return: False se o domínio do nó ficou vazio ou True caso contrário
+        """
+        tamanho = self.remove(no, valor)
+        if tamanho == 1:
+            fila.append(no)
+        elif tamanho == 0:
+            if self.estatisticas is not None:
+                self.estatisticas.esvaziamentos += 1
+            return False
+        return True
+
+    def desfaz(self, marca: int) -> None:
+        """
+        :param marca: Tamanho que a trilha tinha no momento para o qual queremos voltar
+        """
+        trilha, D, por_tamanho, ocorrencias = self.trilha, self.D, self.por_tamanho, self.ocorrencias
+        unidades_da_casa = self.geometria.unidades_da_casa
+
+        while len(trilha) > marca:
+            no, valor = trilha.pop()
+            dominio = D[no]
+            dominio.add(valor)
+
+            tamanho = len(dominio)
+            por_tamanho[tamanho - 1].discard(no)
+            por_tamanho[tamanho].add(no)
+            for u in unidades_da_casa[no]:
+                ocorrencias[u][valor] += 1
+
+    def propaga(self, fila: list) -> bool:
+        """
+        :param fila: Nós cujo domínio acabou de ficar com um único valor
+        :return: False se algum domínio ficou vazio ou algum valor ficou sem lugar em uma unidade (i.e., o problema
+                 ficou inconsistente) ou True caso contrário
+        """
+        D, C, estatisticas = self.D, self.C, self.estatisticas
+        unidades, ocorrencias, unicos = self.geometria.unidades, self.ocorrencias, self.unicos
+
+        while True:
+            # Equivale ao AC-3 com restrições "diferente de": o valor de um nó atribuído é removido de todos os vizinhos
+            while len(fila) != 0:
+                no = fila.pop()
+                if estatisticas is not None:
+                    estatisticas.revisoes += len(C[no])
+                for valor in D[no]:  # Domínio com um único valor
+                    for k in C[no]:
+                        if valor in D[k]:
+                            tamanho = self.remove(k, valor)
+                            if tamanho == 0:
+                                if estatisticas is not None:
+                                    estatisticas.esvaziamentos += 1
+                                unicos.clear()
+                                return False
+                            if tamanho == 1:
+                                fila.append(k)
+
+            # As regras mais fortes só entram quando o AC-3 não tem mais o que fazer
+            if len(unicos) != 0:  # Single oculto: o único lugar do valor na unidade recebe o valor
+                u, valor = unicos.pop()
+                quantidade = ocorrencias[u][valor]  # O par pode ter sido anotado antes de outras remoções
+                if quantidade == 0:
+                    if estatisticas is not None:
+                        estatisticas.esvaziamentos += 1
+                    unicos.clear()
+                    return False
+                if quantidade == 1:
+                    no = next(casa for casa in unidades[u] if valor in D[casa])
+                    if len(D[no]) > 1:
+                        for outro in [v for v in D[no] if v != valor]:
+                            self.remove(no, outro)
+                        fila.append(no)
+            elif self.nivel >= 2:
+                removidos = self.deducoes(fila)
+                if removidos is None:
+                    unicos.clear()
+                    return False
+                if removidos == 0:
+                    return True
+            else:
+                return True
+
+    def deducoes(self, fila: list) -> int or None:
+        """
+        Aplica, uma vez em cada unidade, as regras dos níveis PARES (pares nus e ocultos) e APONTAMENTO.
+        :param fila: Fila da propagação, que recebe os nós cujo domínio ficar com um único valor
+        :return: Quantidade de valores removidos dos domínios ou None se algum domínio ficou vazio
+        """
+        D, geometria = self.D, self.geometria
+        unidades, unidades_da_casa = geometria.unidades, geometria.unidades_da_casa
+        removidos = 0
+
+        for u, unidade in enumerate(unidades):
+            ocorrencias = self.ocorrencias[u]
+
+            # Pares nus: os dois valores do par ficam com as duas casas, então saem das outras casas da unidade
+            pares = {}  # Domínio de 2 valores -> primeira casa da unidade com esse domínio
+            for no in unidade:
+                if len(D[no]) != 2:
+                    continue
+                par = frozenset(D[no])
+                outro = pares.setdefault(par, no)
+                if outro == no or D[outro] != par:  # O domínio da primeira casa pode ter diminuído desde então
+                    continue
+                for k in unidade:
+                    if k != no and k != outro:
+                        for valor in par & D[k]:
+                            if not self.corta(k, valor, fila):
+                                return None
+                            removidos += 1
+
+            # Pares ocultos: dois valores que só cabem nas mesmas duas casas tiram os outros valores dessas casas
+            lugares = {}  # Par de casas -> primeiro valor que só cabe nelas
+            for valor in geometria.simbolos:
+                if ocorrencias[valor] != 2:
+                    continue
+                casas = tuple(no for no in unidade if valor in D[no])
+                outro = lugares.setdefault(casas, valor)
+                if outro == valor or ocorrencias[outro] != 2:
+                    continue
+                for no in casas:
+                    for v in [v for v in D[no] if v != valor and v != outro]:
+                        if not self.corta(no, v, fila):
+                            return None
+                        removidos += 1
+
+            # Apontamento: as casas que aceitam o valor estão todas em outra unidade, que perde o valor no restante
+            if self.nivel >= 3:
+                for valor in geometria.simbolos:
+                    if not 2 <= ocorrencias[valor] <= geometria.k:
+                        continue
+                    casas = [no for no in unidade if valor in D[no]]
+                    comuns = set(unidades_da_casa[casas[0]]).intersection(*(unidades_da_casa[no] for no in casas[1:]))
+                    comuns.discard(u)
+                    for outra in comuns:
+                        for k in unidades[outra]:
+                            if valor in D[k] and k not in casas:
+                                if not self.corta(k, valor, fila):
+                                    return None
+                                removidos += 1
+
+        return removidos
+
+    def atribui(self, no: int, valor: str) -> bool:
+        """
+        :param no: Nó que receberá o valor
+        :param valor: Valor (presente no domínio do nó) a ser atribuído
+        :return: False se a atribuição deixou o problema inconsistente ou True caso contrário
+        """
+        for outro in [v for v in self.D[no] if v != valor]:
+            self.remove(no, outro)
+
+        if self.estatisticas is None:
+            return self.propaga([no])
+
+        t0 = time.perf_counter()
+        consistente = self.propaga([no])
+        self.estatisticas.tempo_propagacao += time.perf_counter() - t0
+        return consistente
+
+    def seleciona_var(self) -> int or None:
+        """
+        :return: A casa ainda não atribuída com o menor domínio ("falha primeiro") ou None se todas foram atribuídas
+        """
+        for tamanho in range(2, self.geometria.lado + 1):
+            if self.por_tamanho[tamanho]:
+                return min(self.por_tamanho[tamanho])  # Em caso de empate, a casa de menor índice
+
+        return None
+
+    def ordena_valores(self, no: int) -> list:
+        """
+        :param no: Nó que será expandido
+        :return: Os valores do domínio do nó, do que menos restringe as unidades do nó ao que mais restringe
+        """
+        unidades = [self.ocorrencias[u] for u in self.geometria.unidades_da_casa[no]]
+        return sorted(self.D[no], key=lambda valor: (sum(ocor[valor] for ocor in unidades), valor))
+
+    def solucoes(self, propagado: bool = False):
+        """
+        :param propagado: Se True, os domínios já estão no ponto fixo da propagação (e.g., mantidos por atribui entre
+                          buscas; ver incremental.SudokuIncremental) e a propagação inicial é pulada
+        :return: Gerador que produz, uma a uma, as atribuições completas (dicionários nó -> valor) que resolvem o CSP
+        """
+        estatisticas = self.estatisticas
+        orcamento = self.orcamento
+
+        if not propagado:
+            t0 = time.perf_counter()
+            if self.nivel != 0:  # Valores que já começam com um único lugar (ou nenhum) em alguma unidade
+                self.unicos = [(u, valor) for u, ocorrencias in enumerate(self.ocorrencias)
+                               for valor, quantidade in ocorrencias.items() if quantidade < 2]
+            # Um domínio que já começa vazio (e.g., atribuição fora do domínio) torna o CSP inconsistente; o AC-3
+            # só propaga a partir dos domínios unitários e não o veria
+            consistente = len(self.por_tamanho[0]) == 0 and self.propaga([no for no in self.X if len(self.D[no]) == 1])
+            if estatisticas is not None:
+                estatisticas.tempo_propagacao += time.perf_counter() - t0
+            if not consistente:
+                return
+
+        pilha = []  # Cada elemento é (nó, valores ainda não testados, tamanho da trilha antes de testá-los)
+        no = self.seleciona_var()
+
+        while True:
+            if no is None:  # Todas as casas têm um único valor, i.e., encontramos uma solução
+                yield {x: next(iter(self.D[x])) for x in self.X}
+            else:
+                valores = self.ordena_valores(no)
+                valores.reverse()  # Para tirarmos do final da lista o valor que menos restringe
+                pilha.append((no, valores, len(self.trilha)))
+                if orcamento is not None:
+                    orcamento.consome()
+                if estatisticas is not None:
+                    estatisticas.expandiu(no, len(pilha), len(pilha))
+
+            # Procura a próxima atribuição consistente, retrocedendo enquanto os valores do topo da pilha se esgotam
+            while len(pilha) != 0:
+                no_topo, valores, marca = pilha[-1]
+                self.desfaz(marca)
+
+                if len(valores) == 0:
+                    pilha.pop()
+                    if estatisticas is not None:
+                        estatisticas.retrocessos += 1
+                elif self.atribui(no_topo, valores.pop()):
+                    break
+            else:
+                return
+
+            no = self.seleciona_var()
+
+
+class DancingLinks:
+    """
+    Resolve o Sudoku como um problema de cobertura exata usando o Algoritmo X de Knuth com "dancing links". Cada linha
+    da matriz é um candidato (casa, dígito) e cada uma das 4n² colunas (324 no 9x9) é uma restrição que deve ser coberta
+    exatamente uma vez: casa preenchida (n²), dígito na linha (n²), dígito na coluna (n²) e dígito no quadrante (n²).
+    Os nós da matriz são guardados em listas paralelas (esquerda, direita, cima, baixo, coluna), onde o nó 0 é a raiz e
+    os nós de 1 a 4n² são os cabeçalhos das colunas.
+    """
+    def __init__(self, problema: str, estatisticas: Estatisticas = None, orcamento: Orcamento = None) -> None:
+        """
+        :param problema: String contendo os valores iniciais do jogo sudoku
+        :param estatisticas: Registro a ser preenchido durante a busca (ou None)
+        :param orcamento: Limites de tempo e de nós da busca (ou None)
+        """
+        self.estatisticas = estatisticas
+        self.orcamento = orcamento
+        tabuleiro = Tabuleiro(problema)
+        self.geometria = geometria = tabuleiro.geometria
+        self.n_colunas = n = 4 * geometria.casas
+        self.L = [n] + list(range(0, n))  # Vizinho da esquerda de cada nó
+        self.R = list(range(1, n + 1)) + [0]  # Vizinho da direita de cada nó
+        self.U = list(range(n + 1))  # Vizinho de cima de cada nó
+        self.D = list(range(n + 1))  # Vizinho de baixo de cada nó
+        self.C = list(range(n + 1))  # Cabeçalho da coluna de cada nó
+        self.S = [0] * (n + 1)  # Quantidade de nós em cada coluna
+        self.candidato = [-1] * (n + 1)  # Candidato (lado * casa + índice do dígito) representado pela linha de cada nó
+
+        self.dados = []  # Candidatos das casas já preenchidas no problema
+        self.consistente = tabuleiro.conflitos == 0  # Se os valores iniciais não violarem nenhuma restrição
+        if not self.consistente:
+            return
+
+        # As casas vazias só recebem linhas para os dígitos que não aparecem em suas unidades: no 25x25, isso evita
+        # montar (e depois cobrir) a maior parte das 15625 linhas possíveis
+        lado, indice = geometria.lado, geometria.indice
+        primeiro_no = {}
+        for pos, caracter in enumerate(problema):
+            if caracter == '.':
+                for digito in tabuleiro.livres(pos):
+                    self._adiciona_linha(lado * pos + indice[digito])
+            else:
+                candidato = lado * pos + indice[caracter]
+                primeiro_no[candidato] = self._adiciona_linha(candidato)
+                self.dados.append(candidato)
+
+        # As casas já preenchidas são selecionadas de antemão, cobrindo as colunas de suas linhas
+        for candidato in self.dados:
+            no = primeiro_no[candidato]
+            for j in [no] + self._linha(no):
+                self.cobre(self.C[j])
+
+    def _adiciona_linha(self, candidato: int) -> int:
+        """
+        :param candidato: Candidato lado * casa + índice do dígito (de 0 a lado - 1)
+        :return: O primeiro nó da linha adicionada à matriz
+        """
+        lado, casas = self.geometria.lado, self.geometria.casas
+        pos, d = divmod(candidato, lado)
+        linha, coluna, quadrante = self.geometria.unidades_da_casa[pos]
+        colunas = (pos, casas + lado * linha + d, 2 * casas + lado * (coluna - lado) + d,
+                   3 * casas + lado * (quadrante - 2 * lado) + d)
+
+        primeiro = len(self.C)
+        for i, col in enumerate(colunas):
+            h = col + 1  # Cabeçalho da coluna
+            x = primeiro + i
+            self.U.append(self.U[h])
+            self.D.append(h)
+            self.D[self.U[h]] = x
+            self.U[h] = x
+            self.C.append(h)
+            self.S[h] += 1
+            self.candidato.append(candidato)
+            self.L.append(primeiro + (i - 1) % 4)  # Linha circular de 4 nós
+            self.R.append(primeiro + (i + 1) % 4)
+
+        return primeiro
+
+    def _linha(self, no: int) -> list:
+        """
+        :param no: Um nó da matriz
+        :return: Os outros nós da mesma linha, da esquerda para a direita
+        """
+        nos = []
+        j = self.R[no]
+        while j != no:
+            nos.append(j)
+            j = self.R[j]
+        return nos
+
+    def cobre(self, c: int) -> None:
+        """
+        :param c: Cabeçalho da coluna que será removida da matriz (junto das linhas que a cobrem)
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def descobre(self, c: int) -> None:
+        """
+        :param c: Cabeçalho da coluna que será devolvida à matriz (na ordem inversa de "cobre")
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def solucoes(self, escolhidos: list = None):
+        """
+        :param escolhidos: Candidatos já escolhidos (usado internamente na recursão)
+        :return: Gerador que produz, uma a uma, as listas de candidatos que cobrem exatamente todas as colunas
+        """
+        if escolhidos is None:
+            if not self.consistente:
+                return
+            escolhidos = list(self.dados)
+
+        R, D, S = self.R, self.D, self.S
+        if R[0] == 0:  # Todas as colunas foram cobertas
+            yield list(escolhidos)
+            return
+
+        # Heurística de Knuth: escolhemos a coluna com menos nós (i.e., com menos candidatos)
+        c = R[0]
+        j = R[c]
+        while j != 0:
+            if S[j] < S[c]:
+                c = j
+            j = R[j]
+
+        if S[c] == 0:  # Restrição que não pode mais ser coberta
+            if self.estatisticas is not None:
+                self.estatisticas.esvaziamentos += 1
+            return
+
+        if self.orcamento is not None:
+            self.orcamento.consome()
+        if self.estatisticas is not None:
+            self.estatisticas.expandiu(c, len(escolhidos) - len(self.dados))
+
+        self.cobre(c)
+        r = D[c]
+        while r != c:
+            escolhidos.append(self.candidato[r])
+            outros = self._linha(r)
+            for j in outros:
+                self.cobre(self.C[j])
+
+            yield from self.solucoes(escolhidos)
+
+            for j in reversed(outros):
+                self.descobre(self.C[j])
+            escolhidos.pop()
+            r = D[r]
+        self.descobre(c)
+        if self.estatisticas is not None:
+            self.estatisticas.retrocessos += 1
+
+
+# Retorno dos métodos de resolução quando o limite de tempo ou de nós acaba antes de uma resposta
+ESGOTADO = 'Limite de tempo ou de nós esgotado.'
+
+# Retorno da verificação de unicidade quando o problema tem mais de uma solução
+MULTIPLAS = 'O problema tem mais de uma solução.'
+
+# Retorno da resolução de entradas que não são problemas válidos (tamanho ou símbolos inválidos; ver problema_valido)
+INVALIDO = 'O problema não corresponde a nenhum tabuleiro suportado.'
+
+
+def problema_valido(problema: str) -> bool:
+    """
+    :param problema: String contendo o problema (já sem '\n' e em maiúsculas, como em Sudoku)
+    :return: True se o tamanho corresponde a algum tabuleiro e todos os caracteres são '.' ou símbolos do tabuleiro
+    """
+    try:
+        geometria = Geometria.do_problema(problema)
+    except ValueError:
+        return False
+    return set(problema) <= geometria.caracteres
+
+# Limite padrão (em bytes) para a memória das fronteiras da busca em largura
+MEMORIA_MAX_BFS = 256 * 2 ** 20
+
+# Quantidade padrão de problemas propagados de uma vez pelo resolvedor em lote (cada problema ocupa cerca de 3 KB
+# durante a propagação)
+TAMANHO_LOTE = 4096
+
+
+def _propaga_lote(candidatos, geometria: Geometria = GEOMETRIA_PADRAO):
+    """
+    :param candidatos: Array booleano (N, casas, lado) do NumPy, (N, 81, 9) no 9x9, onde candidatos[n, casa, d] indica
+                       se o d-ésimo símbolo ainda é possível na casa do problema n. É alterado no lugar
+    :param geometria: Geometria dos problemas (todos do mesmo tamanho)
+    :return: Tupla (resolvidos, impossiveis) de arrays booleanos (N,). Os problemas que não estão em nenhum dos dois
+             precisam de busca
+    """
+    import numpy as np  # Importação tardia: o NumPy só é necessário para o resolvedor em lote
+
+    lado, casas = geometria.lado, geometria.casas
+    unidades = np.array(geometria.unidades)  # (27, 9) no 9x9
+    unidades_da_casa = np.array(geometria.unidades_da_casa)  # (81, 3) no 9x9
+    resolvidos = np.zeros(len(candidatos), dtype=bool)
+    impossiveis = np.zeros(len(candidatos), dtype=bool)
+    ativos = np.arange(len(candidatos))  # Problemas ainda em propagação (os demais já convergiram)
+
+    while len(ativos) != 0:
+        cand = candidatos[ativos]
+
+        # Singles "nus": o dígito de uma casa com um único candidato é removido de todos os seus vizinhos. Para cada
+        # casa, somamos os dígitos fixos de suas 3 unidades e descontamos o da própria casa
+        fixos = cand & (cand.sum(2) == 1)[:, :, None]
+        por_unidade = fixos[:, unidades, :].sum(2, dtype=np.int8)  # (n, 27, 9)
+        nos_vizinhos = por_unidade[:, unidades_da_casa, :].sum(2, dtype=np.int8) - 3 * fixos  # (n, 81, 9)
+        cand &= nos_vizinhos == 0
+
+        # Singles "ocultos": um dígito que só cabe em uma casa de alguma unidade é o valor daquela casa. Cada tipo de
+        # unidade (linhas, colunas e quadrantes) cobre cada casa exatamente uma vez, então basta espalhar os 3 tipos
+        cand_unidades = cand[:, unidades, :]  # (n, 27, 9 casas, 9 dígitos)
+        contagem = cand_unidades.sum(2)  # (n, 27, 9)
+        lugar = cand_unidades & (contagem == 1)[:, :, None, :]
+        ocultos = np.zeros_like(cand)
+        for tipo in range(3):
+            tipo_unidades = slice(lado * tipo, lado * (tipo + 1))
+            ocultos[:, unidades[tipo_unidades].ravel(), :] |= lugar[:, tipo_unidades].reshape(-1, casas, lado)
+        cand = np.where(ocultos.any(2)[:, :, None], ocultos, cand)
+
+        # Contradições: casa sem candidatos, dígito que não cabe em nenhuma casa de uma unidade ou casa obrigada a
+        # receber dois dígitos diferentes
+        n_cand = cand.sum(2)
+        impossivel = (n_cand == 0).any(1) | (contagem == 0).any((1, 2)) | (ocultos.sum(2) > 1).any(1)
+        resolvido = ~impossivel & (n_cand == 1).all(1)
+        mudou = (cand != candidatos[ativos]).any((1, 2))
+
+        candidatos[ativos] = cand
+        impossiveis[ativos[impossivel]] = True
+        resolvidos[ativos[resolvido]] = True
+        ativos = ativos[mudou & ~impossivel & ~resolvido]
+
+    return resolvidos, impossiveis
+
+
+# Algoritmos disponíveis: nome usado no terminal -> método da classe Sudoku que o executa
+ALGORITMOS = {
+    'BFS': 'busca_largura',
+    'DFS': 'busca_profundidade',
+    'A*': 'busca_A_estrela',
+    'AC3': 'ac3',
+    'BACKTRACKING': 'backtracking',
+    'DLX': 'dlx',
+    'UNICIDADE': 'unicidade',
+}
+
+
 class Sudoku:
     # Métodos 'mágicos':
     def __init__(self, problema: str) -> None:
         """
-        :param problema: String contendo os valores iniciais do jogo sudoku.
+        :param problema: String contendo os valores iniciais do jogo sudoku, uma casa por caractere ('.' para as vazias).
+                         O tamanho do tabuleiro vem do tamanho da string: 81 casas (9x9), 256 (16x16, com os símbolos
+                         de '1' a '9' e de 'A' a 'G') ou 625 (25x25, até 'P'); ver SIMBOLOS.
         """
-        problema = problema.rstrip('\n')  # Removendo possíveis '\n' implicitos na string
+        problema = problema.rstrip('\n').upper()  # Removendo possíveis '\n' implicitos na string (e aceitando 'a' a 'p')
 
         self.problema = problema  # String contendo o problema (i.e., sem solução)
         self.solucao = None  # Incialmente, a solução não é preenchida (será preenchida após execução de algum algoritmo)
+        self.esgotado = False  # Se a última resolução parou por falta de tempo ou de nós (ver Orcamento)
+        self.n_solucoes = None  # Quantidade de soluções achada pela última contagem (ver contar_solucoes)
+        self.cancelamento = None  # Evento que, quando ligado, interrompe as resoluções como ESGOTADO (ver Orcamento)
 
     def __repr__(self) -> str:
         """
@@ -18,147 +1046,376 @@ class Sudoku:
         else:
             string_sudoku = self.problema  # Se não há solução, a string vai ser o problema inicial
 
-        if len(string_sudoku) != 81:
-            return 'Problema não foi inserido corretamente! Deve-se inserir um problema sudoku 9x9 (81 elementos).'
-
-        tabuleiro = ''  # Representacao do jogo em tabuleiro --> inicialmente vazio
-        n_barras = 0  # Numero de barras adicionadas na linha atual
-        n_linhas = 0  # Numero de linhas completas (i.e., linha com 9 elementos)
-        posicoes_barras = [x for x in range(0, 81, 3)]  # Posicoes que deve-se adicionar barras
-
-        for pos in range(0, len(string_sudoku)):
-            if pos in posicoes_barras:  # Se o valor estiver na lista de posicoes que deve-se adicionar barras
-                tabuleiro += '|'  # Adiciona-se uma barra ao tabuleiro
-                n_barras += 1  # Aumenta-se em 1 o numero de barras na linha
-                if n_barras == 4:  # Se houver 4 barras
-                    tabuleiro += '\n|'  # Vamos a proxima linha e adicionamos uma barra ao inicio desta
-                    n_barras = 1  # Seta-se o numero de barras na linha para 1
-                    n_linhas += 1  # Aumenta-se em 1 o numero de linhas completas
-                    if n_linhas == 3:  # Se o numero de linhas completas for 3
-                        tabuleiro += '-----+-----+-----|\n|'  # Adiciona-se uma linha separadora, pula-se uma linha e adiciona-se uma barra a proxima
-                        n_linhas = 0  # Reseta-se o numero de linhas completas para 0
-            else:
-                tabuleiro += ' '  # Adicionamos um espaço como separador
-            tabuleiro += string_sudoku[pos]  # Adicionamos o elemento a sua respectiva posicao no tabuleiro
-        tabuleiro += '|'  # Por fim, adiciona-se uma ultima barra ao tabuleiro
+        try:
+            geometria = Geometria.do_problema(string_sudoku)
+        except ValueError:
+            return ('Problema não foi inserido corretamente! Deve-se inserir um problema sudoku com 81 elementos (9x9), '
+                    '256 (16x16) ou 625 (25x25).')
+
+        k, lado = geometria.k, geometria.lado
+        separador = '|' + '+'.join(['-' * (2 * k - 1)] * k) + '|'  # Linha entre faixas, e.g., '|-----+-----+-----|'
+
+        linhas = []  # Linhas do tabuleiro, já com as barras entre os quadrantes
+        for i in range(lado):
+            if i != 0 and i % k == 0:  # Início de uma nova faixa de quadrantes
+                linhas.append(separador)
+            linha = string_sudoku[lado * i:lado * (i + 1)]
+            linhas.append('|' + '|'.join(' '.join(linha[j:j + k]) for j in range(0, lado, k)) + '|')
+        tabuleiro = '\n'.join(linhas)
 
         return tabuleiro  # Retorna o tabuleiro sudoku montado no formato correto
 
     # Métodos da classe:
-    def busca_largura(self) -> str:  # a.k.a. "BFS"
+    def _prepara_orcamento(self, limite_tempo: float or None, max_nos: int or None) -> Orcamento or None:
         """
-        :return: Solução do problema Sudoku usando busca em largura (BFS) ou uma mensagem de falha
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (ou None)
+        :param max_nos: Quantidade máxima de nós expandidos (ou None)
+        :return: O orçamento da resolução (ou None, se não há limites nem cancelamento). Também marca a resolução como
+                 não esgotada
         """
-        try:
-            estados = [self.problema]  # Listas de estados será, inicialmente, uma lista única contendo o estado inicial
+        self.esgotado = False
+        self.n_solucoes = None
+        return Orcamento.prepara(limite_tempo, max_nos, self.cancelamento)
 
-            # "novos_estados" será a lista contendo cada novo estado, obtido pelo resultado de aplicar a acao "a" ao estado "s"
-            novos_estados = [self.resultado(s, a) for s in estados for a in self.acoes(s)]
+    def resolve(self, algoritmo: str, cache=None, **kwargs):
+        """
+        :param algoritmo: Nome do algoritmo (uma das chaves de ALGORITMOS, sem diferenciar maiúsculas e minúsculas)
+        :param cache: Cache de soluções (e.g., cache.CacheSolucoes) consultado antes de resolver e atualizado depois. O
+                      AC3, que nem sempre chega a uma solução, e a UNICIDADE, que precisa procurar uma segunda
+                      solução, não usam o cache
+        :param kwargs: Argumentos repassados ao método (e.g., estatisticas e gancho)
+        :return: O retorno do método que implementa o algoritmo (a solução fica em self.solucao)
+        """
+        algoritmo = algoritmo.upper()
+        if cache is None or algoritmo in ('AC3', 'UNICIDADE'):
+            return getattr(self, ALGORITMOS[algoritmo])(**kwargs)
+
+        solucao = cache.busca(self.problema)
+        if solucao is not None:  # O problema (ou um equivalente) já foi resolvido
+            self.solucao = solucao
+            if algoritmo == 'BACKTRACKING':  # Mesmo formato de retorno do método
+                return dict(enumerate(solucao)), solucao
+            return solucao
+
+        retorno = getattr(self, ALGORITMOS[algoritmo])(**kwargs)
+        if self.solucao is not None:
+            cache.guarda(self.problema, self.solucao)
+        return retorno
+
+    def busca_largura(self, memoria_max: int = None, estatisticas: Estatisticas = None, gancho=None,
+                      limite_tempo: float = None, max_nos: int = None) -> str:  # a.k.a. "BFS"
+        """
+        :param memoria_max: Limite (em bytes) para a memória das fronteiras. Se for atingido, a busca é interrompida e o
+                            tamanho da fronteira é informado. Se não for dado, usa MEMORIA_MAX_BFS
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
+        :return: Solução do problema Sudoku usando busca em largura (BFS) ou uma mensagem de falha
+        """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'BFS')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
+        if memoria_max is None:
+            memoria_max = MEMORIA_MAX_BFS
 
-            while len(novos_estados) != 0:  # i.e., enquanto a lista novos_estados não estiver vazia
-                for novo_estado in novos_estados:
-                    if self.atingiu_objetivo(novo_estado):  # Se o estado atual for a solução
-                        self.solucao = novo_estado  # Junta cada caracter da lista "novo_estado" para formar uma string e atualiza o estado atual
-                        return self.solucao  # Retorna o estado atual que, por sua vez, é a solução
-                novos_estados = [self.resultado(ns, a) for ns in novos_estados for a in self.acoes(ns)]
+        try:
+            inicial = Tabuleiro(self.problema)
+            if inicial.conflitos != 0:  # Com dígitos repetidos já no problema, não há solução
+                return 'Não foi possível resolver o problema.'
+            if self.atingiu_objetivo(inicial):
+                self.solucao = inicial.estado
+                return self.solucao
+
+            # Como as ações sempre preenchem a primeira casa vazia, todos os estados de um mesmo nível têm as mesmas
+            # casas preenchidas: o nível d preenche a d-ésima casa vazia do problema. Por isso a árvore de busca não
+            # tem estados repetidos: dois filhos de um mesmo pai diferem no dígito da casa preenchida, e filhos de pais
+            # diferentes herdam a diferença que já havia entre os pais (em casas que ninguém mais altera). Não é
+            # preciso, então, guardar os estados já vistos
+            casas = [pos for pos, caracter in enumerate(self.problema) if caracter == '.']
+
+            # Cada nível fica em um único buffer contíguo de estados empacotados (41 bytes no 9x9, 4 bits por casa). Os
+            # filhos são gerados sob demanda, um estado do nível atual por vez, alterando só o meio byte (ou o byte,
+            # em tabuleiros com mais de 15 símbolos) da casa preenchida
+            geometria = inicial.geometria
+            tamanho = geometria.tamanho_empacotado
+            bit_digito, valores_livres = geometria.bit_digito, geometria.valores_livres
+            por_byte = 8 // geometria.bits
+            mascara_casa = (1 << geometria.bits) - 1
+            nivel = bytearray(empacota(self.problema, geometria))
+
+            for profundidade, pos in enumerate(casas):
+                proximo = bytearray()
+                tamanho_nivel = len(nivel) // tamanho
+                byte, deslocamento = divmod(pos, por_byte)
+                deslocamento = (8 - geometria.bits) * (1 - deslocamento)  # Casas pares ficam nos bits mais significativos
+                vizinhos = geometria.meios_bytes_vizinhos[pos]
+
+                for inicio in range(0, len(nivel), tamanho):
+                    registro = nivel[inicio:inicio + tamanho]
+                    if orcamento is not None:
+                        orcamento.consome()
+                    if estatisticas is not None:
+                        estatisticas.expandiu(desempacota(registro, geometria), profundidade, tamanho_nivel)
+
+                    usados = 0  # Dígitos dos vizinhos (bit d-1 = dígito d), lidos direto do estado empacotado
+                    for b, d in vizinhos:
+                        usados |= bit_digito[(registro[b] >> d) & mascara_casa]
+
+                    for digito in valores_livres[usados]:
+                        registro[byte] = (registro[byte] & ~(mascara_casa << deslocamento)) | (digito << deslocamento)
+                        if profundidade == len(casas) - 1:  # Última casa preenchida sem conflitos: é a solução
+                            self.solucao = desempacota(registro, geometria)
+                            return self.solucao
+
+                        proximo += registro
+
+                        if len(nivel) + len(proximo) > memoria_max:  # Memória das fronteiras: os dois buffers
+                            print(f'Limite de memória da BFS ({memoria_max} bytes) atingido na profundidade '
+                                  f'{profundidade + 1}: {tamanho_nivel} estados no nível atual e '
+                                  f'{len(proximo) // tamanho} no próximo.', file=sys.stderr)
+                            self.solucao = None
+                            return 'Não foi possível resolver o problema.'
+
+                if len(proximo) == 0:  # Nenhum estado do nível pôde ser expandido
+                    break
+
+                nivel = proximo
 
             return 'Não foi possível resolver o problema.'
 
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
         except MemoryError:
             print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
             self.solucao = None
             return 'Não foi possível resolver o problema.'
 
-    def busca_profundidade(self) -> str:  # a.k.a. "DFS"
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def busca_profundidade(self, estatisticas: Estatisticas = None, gancho=None, limite_tempo: float = None,
+                           max_nos: int = None) -> str:  # a.k.a. "DFS"
         """
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
         :return: Solução do problema Sudoku usando busca em profundidade (DFS) ou uma mensagem de falha
         """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'DFS')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
         try:
-            estado = self.problema  # O estado atual é considerado o inicial
-
-            if self.atingiu_objetivo(estado):  # Se o estado atual é a solução
-                return estado
-
-            fila = [estado]  # Fila inicialmente só contem o estado inicial
-            while len(fila) != 0:
-                acoes = self.acoes(estado)  # Ações possíveis naquele estado
-
-                if len(acoes) != 0:
-                    for a in reversed(acoes):  # Para que a expansão aconteça da esquerda para direita, usamos reversed ações
-                        fila.append(self.resultado(estado, a))  # Adicionamos a fila os estados filhos de estado
-
-                fila.remove(estado)  # Removemos o estado pai da fila
-                estado = fila[-1]  # Pegamos o ultimo estado filho (primeiro estado filho da esquerda para direita)
-
-                if self.atingiu_objetivo(estado):
-                    self.solucao = estado
+            inicial = Tabuleiro(self.problema)
+            if inicial.conflitos != 0:  # Com dígitos repetidos já no problema, não há solução
+                return 'Não foi possível resolver o problema.'
+
+            # Um único tabuleiro mutável (lista de caracteres + máscaras das unidades) é alterado no lugar: colocar um
+            # dígito e desfazê-lo custa apenas 3 operações de bits, e a memória usada é proporcional à profundidade
+            estado = list(self.problema)
+            mascaras = inicial.mascaras
+            casas = [pos for pos, caracter in enumerate(self.problema) if caracter == '.']
+            geometria = inicial.geometria
+            unidades_da_casa, quantidade_livres = geometria.unidades_da_casa, geometria.quantidade_livres
+            caracteres = '.' + geometria.simbolos
+
+            def mais_restrita() -> tuple:
+                # Mesma escolha de Tabuleiro.mais_restrita, mas sobre o tabuleiro mutável
+                melhor_pos, melhor_usados, menor = -1, 0, geometria.lado + 1
+                for pos in casas:
+                    if estado[pos] == '.':
+                        linha, coluna, quadrante = unidades_da_casa[pos]
+                        usados = mascaras[linha] | mascaras[coluna] | mascaras[quadrante]
+                        quantidade = quantidade_livres[usados]
+                        if quantidade < menor:
+                            melhor_pos, melhor_usados, menor = pos, usados, quantidade
+                            if menor <= 1:
+                                break
+                if melhor_pos == -1:
+                    return -1, ()
+                return melhor_pos, geometria.valores_livres[melhor_usados]
+
+            pos, livres = mais_restrita()
+            if pos == -1:  # O problema já está completo (e sem conflitos)
+                self.solucao = self.problema
+                return self.solucao
+
+            # Cada quadro da pilha é [casa, dígitos possíveis, índice do próximo dígito a tentar]
+            pilha = [[pos, livres, 0]]
+            if orcamento is not None:
+                orcamento.consome()
+            if estatisticas is not None:
+                estatisticas.expandiu(''.join(estado), 0, 1)
+
+            while len(pilha) != 0:
+                quadro = pilha[-1]
+                pos, livres, i = quadro
+                linha, coluna, quadrante = unidades_da_casa[pos]
+
+                if i > 0:  # Desfaz o dígito tentado anteriormente nesta casa
+                    bit = ~(1 << (livres[i - 1] - 1))
+                    mascaras[linha] &= bit
+                    mascaras[coluna] &= bit
+                    mascaras[quadrante] &= bit
+                    estado[pos] = '.'
+
+                if i == len(livres):  # Todos os dígitos da casa falharam: volta para a casa anterior
+                    pilha.pop()
+                    if estatisticas is not None:
+                        estatisticas.retrocessos += 1
+                    continue
+
+                # Coloca o próximo dígito da casa
+                quadro[2] = i + 1
+                digito = livres[i]
+                bit = 1 << (digito - 1)
+                mascaras[linha] |= bit
+                mascaras[coluna] |= bit
+                mascaras[quadrante] |= bit
+                estado[pos] = caracteres[digito]
+
+                pos, livres = mais_restrita()
+                if pos == -1:  # Não há mais casas vazias: como só colocamos dígitos livres, é a solução
+                    self.solucao = ''.join(estado)
                     return self.solucao
 
+                if len(livres) != 0:  # Se alguma casa ficou sem dígitos possíveis, tentamos o próximo dígito
+                    pilha.append([pos, livres, 0])
+                    if orcamento is not None:
+                        orcamento.consome()
+                    if estatisticas is not None:
+                        estatisticas.expandiu(''.join(estado), len(pilha) - 1, len(pilha))
+
             return 'Não foi possível resolver o problema.'
 
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
         except MemoryError:
             print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
             self.solucao = None
             return 'Não foi possível resolver o problema.'
 
-    # Como em nosso caso de modelagem do problema do Sudoku dois nós não podem apresentar o mesmo estado, usaremos estados como parâmetro
-    def busca_A_estrela(self) -> str:  # a.k.a. A*
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def busca_A_estrela(self, estatisticas: Estatisticas = None, gancho=None, limite_tempo: float = None,
+                        max_nos: int = None) -> str:  # a.k.a. A*
         """
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
         :return: Solução do problema Sudoku usando A* ou uma mensagem de falha
         """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'A*')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
         try:
-            # Consideraremos que é uma lista única contendo o estado inicial
-            estados = [self.problema]  # Gera uma lista a partir do estado inicial
+            inicial = Tabuleiro(self.problema)
+            vazias_iniciais = inicial.vazias  # Para calcularmos a profundidade de cada estado
+            if inicial.conflitos != 0:  # Com dígitos repetidos já no problema, não há solução
+                return 'Não foi possível resolver o problema.'
+            if self.atingiu_objetivo(inicial):
+                self.solucao = inicial.estado
+                return self.solucao
+
+            # Cada estado é expandido na sua casa mais restrita (MRV) e f = g + h é calculado uma única vez, quando o
+            # estado entra na fronteira. A fronteira é uma heap de tuplas (f, vazias, ordem, estado, casa, livres): em
+            # caso de empate preferimos o estado mais profundo e, depois, o mais antigo ("ordem" evita comparar Tabuleiros)
+            pos, livres = inicial.mais_restrita()
+            # Não há conjunto de estados visitados: como cada casa preenchida nunca muda, dois estados quaisquer
+            # diferem na casa em que seus caminhos se separaram, e a busca é uma árvore sem estados repetidos
+            fronteira = [(self.custo(inicial) + self.heuristica(inicial), inicial.vazias, 0, inicial, pos, livres)]
+            ordem = 1
+
+            while len(fronteira) != 0:
+                _, _, _, estado, pos, livres = heapq.heappop(fronteira)  # Estado menos custoso em O(log n)
+                if orcamento is not None:
+                    orcamento.consome()
+                if estatisticas is not None:
+                    estatisticas.expandiu(estado, vazias_iniciais - estado.vazias, len(fronteira) + 1)
+
+                for a in livres:
+                    filho = estado.coloca(pos, a)
+                    if self.atingiu_objetivo(filho):
+                        self.solucao = filho.estado
+                        return self.solucao
 
-            while len(estados) != 0:
-                estado = self.melhor_estado(estados)  # Usa a heuristica e a função de custos para definir qual estado é menos custoso para expandir
-                novos_estados = [self.resultado(estado, a) for a in self.acoes(estado)]  # Gera os novos estados a partir do melhor estado
+                    pos_filho, livres_filho = filho.mais_restrita()
+                    if len(livres_filho) == 0:  # Alguma casa ficou sem dígitos possíveis: o filho é descartado
+                        continue
 
-                for s in novos_estados:  # Para cada estado em novos_estados, vamos verificar se algum é a solução
-                    if self.atingiu_objetivo(s):
-                        self.solucao = s
-                        return self.solucao
+                    f = filho.vazias + len(livres_filho)  # O mesmo que custo + heuristica, sem recalcular a MRV
+                    heapq.heappush(fronteira, (f, filho.vazias, ordem, filho, pos_filho, livres_filho))
+                    ordem += 1
 
-                estados.remove(estado)  # Se o melhor estado ainda assim não é uma solução, removemos
-                estados += novos_estados  # Adicionamos ao final da fila de estados os novos_estados
+            return 'Não foi possível resolver o problema.'
 
-                if len(estados) == 0:  # Se a lista de estados ficar vazia, não encontramos a solução
-                    return 'Não foi possível resolver o problema.'
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
 
         except MemoryError:
             print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
             self.solucao = None
             return 'Não foi possível resolver o problema.'
 
-    def ac3(self, csp: tuple = None) -> bool or str:
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def ac3(self, csp: tuple = None, estatisticas: Estatisticas = None, gancho=None, limite_tempo: float = None,
+            max_nos: int = None) -> bool or str:
         """
         :param csp: Problema na modelagem CSP
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
         :return: Uma tupla onde o primeiro elemento é um bool indicando se o problema é arco consistente e o segundo o problema em modelo csp
         """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'AC3')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
+        t0 = time.perf_counter()
         try:
             if csp is None:  # Se o csp não for dado, vamos gera-lo usando uma função "gera_csp"
                 csp = self.gera_csp(self.problema)  # Modela o problema como um problema csp
 
-            fila = list(csp[2].keys())  # Fila vai ser a lista de arcos de restrição
+            X, D, C = csp
 
-            if len(fila) == 0:  # Se a fila está vazia, o problema já é arco consistente
-                return True
+            # Como as restrições são do tipo "diferente de", o arco (k, j) só pode remover valores de k quando o domínio
+            # de j tem um único valor. Por isso a fila começa apenas com os arcos que apontam para esses nós
+            fila = deque((k, j) for j in X if len(D[j]) == 1 for k in C[j])
+            na_fila = set(fila)  # Arcos que já estão na fila (para não enfileirarmos o mesmo arco duas vezes)
 
             while len(fila) != 0:
-                no1, no2 = fila.pop(0)  # Pegando o primeiro elemento e seu primeiro vizinho na fila
+                arco = fila.popleft()  # Pegando o primeiro arco da fila
+                na_fila.discard(arco)
+                no1, no2 = arco
                 revisado, csp = self.revisa(csp, no1, no2)  # Revisamos se os valores são validos
+                if estatisticas is not None:
+                    estatisticas.revisoes += 1
+                if orcamento is not None:
+                    orcamento.consome()
 
                 if revisado:
-                    D = csp[1]  # Pegamos o dominio
-
                     if len(D[no1]) == 0:  # Se há algum elemento com domínio 0, o problema é impossível de ser resolvido
+                        if estatisticas is not None:
+                            estatisticas.esvaziamentos += 1
                         return False
 
-                    for k in self.vizinhos(no1):
-                        if k != no2:
-                            fila.append((k, no1))  # Para cada vizinho do no1 diferente do já verificado, o adicionamos a lista
-
-            X, D, C = csp
+                    if len(D[no1]) == 1:  # Só acordamos os vizinhos se o novo domínio de no1 puder podar os deles
+                        for k in C[no1]:
+                            if k != no2 and (k, no1) not in na_fila:
+                                fila.append((k, no1))  # Para cada vizinho do no1 diferente do já verificado, o adicionamos a fila
+                                na_fila.add((k, no1))
 
             # Se o domínio de todos os nós tiverem apenas um elemento alcançamos a solução
             if all([len(D[k]) == 1 for k in D.keys()]):
@@ -168,167 +1425,349 @@ class Sudoku:
 
             return True
 
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
         except MemoryError:
             print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
             self.solucao = None
             return 'Não foi possível resolver o problema.'
 
-    def backtracking(self, csp: tuple = None, atribuicao: dict = None) -> (dict, str):
+        finally:
+            if estatisticas is not None:  # Todo o AC-3 é propagação
+                estatisticas.tempo_propagacao += time.perf_counter() - t0
+                estatisticas.finaliza()
+
+    def backtracking(self, csp: tuple = None, atribuicao: dict = None, estatisticas: Estatisticas = None,
+                     gancho=None, limite_tempo: float = None, max_nos: int = None,
+                     propagacao: str = PROPAGACAO_PADRAO) -> (dict, str):
         """
         :param csp: Problema na modelagem CSP
         :param atribuicao: Dicionário em que a chave é o nó e o valor é o número atribuido a ele (de 0 a 9)
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
+        :param propagacao: Nível da propagação feita a cada nó (um dos NIVEIS_PROPAGACAO; ver MotorCSP)
         :return: Dicionário de atribuições e string do problema resolvido
         """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'BACKTRACKING')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
         try:
-            if csp is None:  # Se o csp não foi dado, vamos obte-lo por tornar o problema arco consistente
+            if csp is None:  # Se o csp não foi dado, vamos gera-lo a partir do problema
                 csp = self.gera_csp(self.problema)
 
-            if atribuicao is None:  # Se atribuicao não foi dada será, inicialmente, um dict vazio
-                atribuicao = {}
-
             X, D, C = csp
-            D_0 = D.copy()  # Faremos uma cópia do domínio para voltarmos a ele caso o problema se torne inconcistente
+            for no, valor in (atribuicao or {}).items():  # Atribuições já feitas restringem o domínio dos nós
+                D[no] = D[no] & {valor}
+                if len(D[no]) == 0:  # Atribuição que contradiz o domínio do nó: não há solução
+                    return {}, None
 
-            if len(atribuicao) == len(X):  # Se o número de valores atribuidos for igual ao de vars, alcançamos a solução
-                self.solucao = "".join([atribuicao.get(x, ".") for x in sorted(X)])
-                return atribuicao, self.solucao
+            motor = MotorCSP(csp, estatisticas, orcamento, propagacao)  # Busca iterativa com trilha de desfazer
+            atribuicao = next(motor.solucoes(), None)
 
-            no = self.seleciona_var(csp, atribuicao)  # Selecionamos o melhor nó para expandirmos
+            if atribuicao is None:
+                return {}, None
 
-            for v in self.ordena_valores(no, csp, atribuicao):
-                if self.consistente(no, v, atribuicao):  # Se for possível atribuir aquele valor ao nó
-                    atribuicao[no] = v
-                    D[no] = {v}  # Como o atribuimos o valor à variável, mudaremos o csp
-                    csp = X, D, C
+            self.solucao = "".join([atribuicao[x] for x in sorted(X)])
+            return atribuicao, self.solucao
 
-                    arco_consistente = self.ac3(csp)  # Faremos uma verificação para ver se o problema é AC
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
 
-                    if arco_consistente is True:  # Se o problema for arco consistente, prosseguiremos
-                        atribuicao_n, solucao = self.backtracking(csp, atribuicao)
-                        if len(atribuicao_n) != 0:
-                            return atribuicao_n, self.solucao
+        except MemoryError:
+            print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
+            self.solucao = None
+            return 'Não foi possível resolver o problema.'
 
-                    del atribuicao[no]
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
 
-                    D = D_0  # Se não chegamos na conclusão, devemos retornar ao domínio inicial
+    def dlx(self, estatisticas: Estatisticas = None, gancho=None, limite_tempo: float = None,
+            max_nos: int = None) -> str:  # a.k.a. "Dancing Links"
+        """
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da resolução (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
+        :return: Solução do problema Sudoku como cobertura exata (Algoritmo X com dancing links) ou uma mensagem de falha
+        """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'DLX')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
+        try:
+            matriz = DancingLinks(self.problema, estatisticas, orcamento)
+            candidatos = next(matriz.solucoes(), None)
+
+            if candidatos is None:
+                return 'Não foi possível resolver o problema.'
+
+            geometria = matriz.geometria
+            solucao = ['.'] * geometria.casas
+            for candidato in candidatos:
+                pos, d = divmod(candidato, geometria.lado)
+                solucao[pos] = geometria.simbolos[d]
 
-            return {}, None
+            self.solucao = ''.join(solucao)
+            return self.solucao
 
-        except (MemoryError, RecursionError):
-            print('Obtivemos um erro de memória ou Recursão! Não foi possível encontrar a solução do problema.')
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
+        except MemoryError:
+            print('Obtivemos um erro de memória! Não foi possível encontrar a solução do problema.')
             self.solucao = None
             return 'Não foi possível resolver o problema.'
 
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def _enumera(self, limite: int or None, busca: str, estatisticas: Estatisticas or None,
+                 orcamento: Orcamento or None) -> int:
+        """
+        :param limite: Quantidade de soluções a partir da qual a enumeração para (None enumera todas)
+        :param busca: Motor que enumera as soluções: 'DLX' (DancingLinks) ou 'BACKTRACKING' (MotorCSP)
+        :param estatisticas: Registro a ser preenchido durante a busca (ou None)
+        :param orcamento: Limites de tempo e de nós da busca (ou None)
+        :return: Quantidade de soluções encontradas (no máximo "limite"). A primeira delas fica em self.solucao
+        """
+        self.solucao = None
+        if busca == 'DLX':
+            matriz = DancingLinks(self.problema, estatisticas, orcamento)
+            geometria = matriz.geometria
+            solucoes = matriz.solucoes()
+        elif busca == 'BACKTRACKING':
+            motor = MotorCSP(self.gera_csp(self.problema), estatisticas, orcamento)
+            solucoes = motor.solucoes()
+        else:
+            raise ValueError(f'Motor de contagem inválido: {busca} (use DLX ou BACKTRACKING).')
+
+        n = 0
+        for solucao in itertools.islice(solucoes, limite):  # Para assim que a "limite"-ésima solução aparece
+            if n == 0:  # Só a primeira solução é convertida em string
+                if busca == 'DLX':
+                    casas = ['.'] * geometria.casas
+                    for candidato in solucao:
+                        pos, d = divmod(candidato, geometria.lado)
+                        casas[pos] = geometria.simbolos[d]
+                    self.solucao = ''.join(casas)
+                else:
+                    self.solucao = ''.join(solucao[x] for x in sorted(motor.X))
+            n += 1
+        return n
+
+    def contar_solucoes(self, limite: int or None = 2, busca: str = 'DLX', estatisticas: Estatisticas = None,
+                        gancho=None, limite_tempo: float = None, max_nos: int = None) -> int or str:
+        """
+        :param limite: Quantidade de soluções a partir da qual a contagem para (padrão: 2, o suficiente para saber se
+                       a solução é única; None conta todas)
+        :param busca: Motor que enumera as soluções: 'DLX' (padrão, o mais rápido) ou 'BACKTRACKING'
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da contagem (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
+        :return: Quantidade de soluções (no máximo "limite") ou ESGOTADO. A primeira solução encontrada fica em
+                 self.solucao e a contagem em self.n_solucoes
+        """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'CONTAGEM')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
+        try:
+            self.n_solucoes = self._enumera(limite, busca.upper(), estatisticas, orcamento)
+            return self.n_solucoes
+
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def unicidade(self, busca: str = 'DLX', estatisticas: Estatisticas = None, gancho=None,
+                  limite_tempo: float = None, max_nos: int = None) -> str:
+        """
+        :param busca: Motor que enumera as soluções (ver contar_solucoes)
+        :param estatisticas: Registro (Estatisticas) a ser preenchido durante a busca (opcional)
+        :param gancho: Função chamada como gancho(estatisticas, estado) a cada nó expandido (opcional)
+        :param limite_tempo: Tempo máximo (em segundos) da verificação (opcional)
+        :param max_nos: Quantidade máxima de nós expandidos (opcional)
+        :return: A solução, se ela é única, MULTIPLAS (sem preencher self.solucao), se há mais de uma, uma mensagem de
+                 falha, se não há nenhuma, ou ESGOTADO. A busca para assim que encontra a segunda solução
+        """
+        estatisticas = Estatisticas.prepara(estatisticas, gancho, 'UNICIDADE')
+        orcamento = self._prepara_orcamento(limite_tempo, max_nos)
+        try:
+            self.n_solucoes = self._enumera(2, busca.upper(), estatisticas, orcamento)
+            if self.n_solucoes == 0:
+                return 'Não foi possível resolver o problema.'
+            if self.n_solucoes > 1:
+                self.solucao = None
+                return MULTIPLAS
+            return self.solucao
+
+        except LimiteEsgotado:  # O tempo ou os nós acabaram (as estatísticas ficam com o que foi feito até aqui)
+            self.solucao = None
+            self.esgotado = True
+            return ESGOTADO
+
+        finally:
+            if estatisticas is not None:
+                estatisticas.finaliza()
+
+    def situacao(self) -> str or None:
+        """
+        :return: Resultado da última resolução no formato usado por main e pelo resolvedor em lote: ESGOTADO, se os
+                 limites acabaram, MULTIPLAS, se a verificação de unicidade achou mais de uma solução, ou a solução
+                 (None, se não foi encontrada)
+        """
+        if self.esgotado:
+            return ESGOTADO
+        if self.solucao is None and self.n_solucoes is not None and self.n_solucoes > 1:
+            return MULTIPLAS
+        return self.solucao
+
     # Métodos estáticos:
     @staticmethod
-    def acoes(estado: str) -> list:
+    def resolver_lote(problemas, busca: str = 'DLX', tamanho_bloco: int = TAMANHO_LOTE, **kwargs) -> list:
+        """
+        :param problemas: Lista (ou qualquer iterável) de strings, cada uma representando um problema
+        :param busca: Algoritmo (uma das chaves de ALGORITMOS) usado nos problemas que a propagação não termina
+        :param tamanho_bloco: Quantidade máxima de problemas propagados de uma vez (limita a memória usada)
+        :param kwargs: Argumentos repassados ao algoritmo de busca (e.g., limite_tempo e max_nos)
+        :return: Lista com a solução de cada problema (None, se não há solução, ESGOTADO, se a busca esgotou seus
+                 limites, ou INVALIDO, se a entrada tem um tamanho ou símbolos inválidos), na mesma ordem da entrada.
+                 Os problemas de mesmo tamanho são representados juntos em um array (N, casas, lado) de candidatos,
+                 (N, 81, 9) no 9x9, e propagados com operações vetorizadas do NumPy (singles nus e ocultos); só o que
+                 sobra é resolvido um a um
+        """
+        try:
+            import numpy as np  # Importação tardia: o NumPy é opcional e só é necessário aqui
+        except ImportError as erro:
+            raise ImportError('O resolvedor em lote precisa do NumPy (pip install numpy).') from erro
+
+        problemas = [problema.rstrip('\n').upper() for problema in problemas]  # Como em __init__ ('a' a 'p')
+        solucoes = []
+
+        for inicio in range(0, len(problemas), tamanho_bloco):
+            bloco = problemas[inicio:inicio + tamanho_bloco]
+            solucoes_bloco = [None] * len(bloco)
+
+            # Problemas de tamanhos diferentes (e.g., 9x9 e 16x16) são propagados em arrays separados; entradas
+            # inválidas são marcadas uma a uma, sem interromper o restante do lote
+            por_tamanho = {}
+            for n, problema in enumerate(bloco):
+                if problema_valido(problema):
+                    por_tamanho.setdefault(Geometria.do_problema(problema), []).append(n)
+                else:
+                    solucoes_bloco[n] = INVALIDO
+
+            for geometria, indices in por_tamanho.items():
+                simbolos = np.frombuffer(geometria.simbolos.encode(), dtype=np.uint8)
+
+                # Casas vazias começam com todos os candidatos e casas preenchidas com apenas o seu dígito
+                valores = np.frombuffer(''.join(bloco[n] for n in indices).encode(), dtype=np.uint8)
+                valores = valores.reshape(len(indices), geometria.casas)
+                candidatos = valores[:, :, None] == simbolos
+                candidatos[valores == ord('.')] = True
+
+                resolvidos, impossiveis = _propaga_lote(candidatos, geometria)
+                fixos = candidatos.sum(2) == 1
+                grades = np.where(fixos, simbolos[candidatos.argmax(2)], ord('.')).astype(np.uint8)  # Casas deduzidas
+
+                for i, n in enumerate(indices):
+                    if impossiveis[i]:
+                        continue
+                    if resolvidos[i]:
+                        solucoes_bloco[n] = grades[i].tobytes().decode()
+                    else:  # O que a propagação não resolveu é entregue, já reduzido, ao algoritmo de busca
+                        sudoku = Sudoku(grades[i].tobytes().decode())
+                        sudoku.resolve(busca, **kwargs)
+                        solucoes_bloco[n] = sudoku.situacao()
+
+            solucoes.extend(solucoes_bloco)
+
+        return solucoes
+
+    @staticmethod
+    def acoes(estado: str or Tabuleiro) -> list:
         """
-        :param estado: É uma string que representa o estado do agente
+        :param estado: É uma string (ou um Tabuleiro) que representa o estado do agente
         :return: Uma lista contendo as ações possíveis para o estado fornecido
         """
-        estado = list(estado)  # Transformando o estado fornecido em uma lista onde cada elemento é um numero/ponto
-        pos = estado.index('.')  # pos é a primeira posição não preenchida (i.e., que contem um ".")
-        linha = []  # Inicialmente a linha em que aquele caracter está uma lista vazia que será preenchida no loop for
-        coluna = []  # Inicialmente a coluna em que aquele caracter está uma lista vazia que será preenchida no loop for
-        quadrante = []  # Inicialmente o quadrange em que aquele caracter está uma lista vazia que será preenchida no loop for
-
-        for i in range(0, 9):
-            # Pegando a linha em que aquele elemento está:
-            if pos in range(i * 9, (i + 1) * 9):
-                linha = set(estado[i * 9: (i + 1) * 9])
-            # Pegando a coluna em que aquele elemento está:
-            if pos in range(i, (i + 81), 9):
-                coluna = set(estado[i: (i + 81): 9])
-            # Para evitar trabalhos desnecessários (se ja encontramos a linha e a coluna):
-            if linha != [] and coluna != []:
-                break
-
-        # Pegando quadrante em que aquele elemento está:
-        for i in range(0, 81, 27):
-            for j in range(i, i + 9, 3):
-                if pos in range(j, j + 3) or pos in range(j + 9, j + 12) or pos in range(j + 18, j + 21):
-                    quadrante = set(estado[j: j + 3] + estado[j + 9: j + 12] + estado[j + 18: j + 21])
-
-        valores_proibidos = linha.union(coluna,
-                                        quadrante)  # Juntando o conjunto dos numeros não permitidos (i.e., que já exitem na linha, coluna e/ou quadrante)
-        valores_proibidos.remove(
-            '.')  # Removendo '.' dos valores proibidos pois só serve para sinalizar que há um espaço livre
-        num_possiveis = list({f'{i}' for i in range(1, 10)}.difference(valores_proibidos))  # Lista de números possíveis
-        num_possiveis.sort()  # Apenas para manter padrão e termos certeza que vamos retornar os numeros possíveis em ordem
-        return num_possiveis
+        if isinstance(estado, str):  # Na fronteira da API aceitamos strings, que são convertidas para um Tabuleiro
+            estado = Tabuleiro(estado)
+
+        pos = estado.estado.find('.')  # pos é a primeira posição não preenchida (i.e., que contem um ".")
+        if pos == -1:  # Não há casas vazias e, portanto, nenhuma ação possível
+            return []
+
+        # Os dígitos possíveis são os que não aparecem nas máscaras da linha, coluna e quadrante (já em ordem)
+        return list(estado.livres(pos))
 
     @staticmethod
-    def resultado(estado: str, acao: str) -> str:
+    def resultado(estado: str or Tabuleiro, acao: str) -> str or Tabuleiro:
         """
-        :param estado: É uma string que representa o estado do agente
+        :param estado: É uma string (ou um Tabuleiro) que representa o estado do agente
         :param acao: É a ação que este agente ira fazer
-        :return: O novo estado obtido após aplicação da ação no estado dado
+        :return: O novo estado (do mesmo tipo do estado dado) obtido após aplicação da ação no estado dado
         """
-        novo_estado = estado.replace('.', acao, 1)  # Trocaremos o primeiro '.' pelo valor fornecido na ação
-        return novo_estado
+        if isinstance(estado, str):
+            novo_estado = estado.replace('.', acao, 1)  # Trocaremos o primeiro '.' pelo valor fornecido na ação
+            return novo_estado
+
+        return estado.coloca(estado.estado.find('.'), acao)  # Mesma ideia, mas atualizando as máscaras do tabuleiro
 
     @staticmethod
-    def atingiu_objetivo(estado: str) -> bool:
+    def atingiu_objetivo(estado: str or Tabuleiro) -> bool:
         """
-        :param estado: É uma string que representa o estado do agente
+        :param estado: É uma string (ou um Tabuleiro) que representa o estado do agente
         :return: Retorna True se chegamos na solução correta ou False se a solução é invalida ou não está completa
         """
-        if '.' in estado:
-            return False
-
-        estado = list(estado).copy()
-
-        lista_linhas = [estado[i * 9:(i + 1) * 9] for i in range(0, 9)]  # Pega todas as linhas
-        lista_colunas = [estado[i:i + 81:9] for i in range(0, 9)]  # Pega todas as colunas
-        lista_quadrantes = [
-            estado[i + j:(i + j) + 3] + estado[(i + j) + 9:(i + j) + 12] + estado[(i + j) + 18:(i + j) + 21]
-            for i in range(0, 81, 27) for j in range(0, 9, 3)]  # Pega todos os quadrantes
-
-        set_elementos = {f'{i}' for i in range(1, 10)}  # Set que contem os elementos que cada lista deve conter (usado para verificação)
-
-        for linha, coluna, quadrante in zip(lista_linhas, lista_colunas, lista_quadrantes):
-            # Se o conjunto de elementos da lista, coluna ou quadrante não for igual a {1,2,3,4,5,6,7,8,9} houve repetição e poranto a solução é inválida
-            if set(linha) != set_elementos or set(coluna) != set_elementos or set(quadrante) != set_elementos:
+        if isinstance(estado, str):
+            if '.' in estado:
+                return False
+            try:
+                estado = Tabuleiro(estado)
+            except (ValueError, KeyError):  # Tamanho que não é de nenhum tabuleiro ou símbolo inválido
                 return False
 
-        return True
+        # Sem casas vazias e sem repetições em nenhuma linha, coluna ou quadrante (contadores mantidos pelo Tabuleiro)
+        return estado.resolvido()
 
     @staticmethod
-    def custo(estado: str) -> int:  # g(n)
+    def custo(estado: str or Tabuleiro) -> int:  # g(n)
         """
-        :param estado: É uma string que representa o estado do agente
-        :return: Custo para irmos do nó inicial até o atual
+        :param estado: É uma string (ou um Tabuleiro) que representa o estado do agente
+        :return: Custo de expandir o estado, i.e., o número de dígitos possíveis na sua casa mais restrita (MRV)
         """
-        # É a quantidade de movimentos possíveis (i.e., o tamanho da lista de ações) para o primeiro '.' do estado
-        g = len(Sudoku.acoes(estado))
+        if isinstance(estado, str):
+            estado = Tabuleiro(estado)
+
+        # Estados cuja casa mais restrita tem menos opções geram menos filhos e, portanto, são preferidos
+        g = len(estado.mais_restrita()[1])
         return g
 
     @staticmethod
-    def heuristica(estado: str) -> int:  # h(n)
+    def heuristica(estado: str or Tabuleiro) -> int:  # h(n)
         """
-        :param estado: É uma string que representa o estado do agente
+        :param estado: É uma string (ou um Tabuleiro) que representa o estado do agente
         :return:  Uma estimativa otimista de quantos valores devem ser inseridos para chegarmos na solução
         """
         # Conta a quantidade de '.' que existem no problema e, portanto, a quantidade de casas vazias (que é a quantidade minima de movimentos para resolver o problema)
+        if isinstance(estado, Tabuleiro):
+            return estado.vazias  # O Tabuleiro já mantém a contagem de casas vazias
+
         h = estado.count('.')
         return h
 
-    @staticmethod
-    def melhor_estado(estados: list) -> str:
-        """
-        :param estados: É uma string que representa o estado do agente
-        :return: Retorna o estado menos custoso
-        """
-        menor_peso = Sudoku.heuristica(estados[0]) + Sudoku.custo(estados[0])  # Menor peso é, inicialmente, o do primeiro estado
-        estado_menor_peso = estados[0]
-
-        for estado in estados:
-            if Sudoku.heuristica(estado) + Sudoku.custo(estado) < menor_peso:  # Se o peso do estado é o menor
-                menor_peso = Sudoku.heuristica(estado) + Sudoku.custo(estado)
-                estado_menor_peso = estado  # Estado é o estado menos custoso da lista
-
-        return estado_menor_peso
-
     @staticmethod
     def gera_csp(problema: str) -> tuple:
         """
@@ -336,48 +1775,35 @@ class Sudoku:
         :return: Problema modelado como um CSP
         """
         X = list()  # Posição de cada casa do tabuleiro
-        D = dict()  # Conjunto de numeros de 1 a 9 que podem ser colocados naquela casa = {1, 2, ..., 9} para todos os nós
-        C = dict()  # Dicionário onde chave é tupla de nós vizinhos e valor conjuntos de valores adimissíveis
+        D = dict()  # Conjunto de símbolos que podem ser colocados naquela casa = {1, 2, ..., 9} no 9x9 para todos os nós
+        geometria = Geometria.do_problema(problema)
 
-        # Nest loop vamos preencher X e C
+        # As restrições são implícitas: cada nó deve ser diferente de todos os seus vizinhos, então C[i] é apenas a tupla
+        # de vizinhos do nó i (vinda do índice pré-calculado), sem materializarmos os pares de valores admissíveis
+        C = geometria.vizinhos
+
+        # Neste loop vamos preencher X e D
         for i in range(0, len(problema)):
             # Quem sabe mudar para algo do tipo "ij" onde "i" é linha e "j" coluna?
             X.append(i)  # Cada elemento do sudoku vai ser visto como sua posição na string input
 
             if problema[i] == '.':
-                D[X[i]] = {str(n) for n in range(1, 10)}
+                D[X[i]] = set(geometria.simbolos)
 
             else:
                 # Como a casa já é preenchida, consideraremos que X[i] é uma variável que só pode assumir um valor (i.e., constante)
                 D[X[i]] = {str(problema[i])}
 
-        # Restrições é o conjunto de (no, no_vizinho)
-        for i in X:
-            for j in Sudoku.vizinhos(i):
-                C[(i, j)] = {(a, b) for a in D[i] for b in D[j] if a != b}
-
         return X, D, C
 
     @staticmethod
-    def vizinhos(no: int) -> set:
+    def vizinhos(no: int, geometria: Geometria = GEOMETRIA_PADRAO) -> frozenset:
         """
-        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80)
-        :return: Set contendo todos os vizinhos daquele nó
+        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80 no 9x9)
+        :param geometria: Geometria do tabuleiro (por padrão, 9x9)
+        :return: Conjunto contendo todos os vizinhos daquele nó (vindo do índice pré-calculado da geometria)
         """
-        n_linha = no // 9
-        n_coluna = no % 9
-
-        # Elementos vizinhos do no:
-        viz_linha = [n for n in range(9 * n_linha, 9 * (n_linha + 1)) if n != no]
-        viz_coluna = [n for n in range(n_coluna, n_coluna + 81, 9) if n != no]
-        viz_quadrante = [n for k in range(0, 81, 27) for m in range(k, k + 9, 3)
-                         for n in list(range(m, m + 3)) + list(range(m + 9, m + 12)) + list(range(m + 18, m + 21))
-                         if no in range(m, m + 3) or no in range(m + 9, m + 12) or no in range(m + 18, m + 21)
-                         if n != no]
-
-        vizinhos = set(viz_linha + viz_quadrante + viz_coluna)  # Será o conjunto dos vizinhos na linha, coluna e quadrante
-
-        return vizinhos
+        return geometria.conjunto_vizinhos[no]
 
     @staticmethod
     def revisa(csp: tuple, no1: int, no2: int):
@@ -389,27 +1815,25 @@ class Sudoku:
         """
         X, D, C = csp
 
-        # Violam é o conjunto de valores de x que não permitidos em seu domínio
-        violam = {x for x in D[no1] if len([(x, y) in C[no1, no2] for y in D[no2] if y != x]) == 0}
-
-        if len(violam) != 0:  # Se existir pelo menos um valor de x que não é permitido em seu domínio
-            D[no1] = D[no1].difference(violam)
+        # Pela restrição no1 != no2, um valor x de no1 só fica sem suporte se o domínio de no2 for exatamente {x}
+        if len(D[no2]) == 1 and not D[no2].isdisjoint(D[no1]):
+            D[no1] = D[no1].difference(D[no2])
 
             return True, (X, D, C)
 
         return False, csp
 
     @staticmethod
-    def consistente(no: int, valor: int, atribuicao: dict) -> bool:
+    def consistente(no: int, valor: int, atribuicao: dict, geometria: Geometria = GEOMETRIA_PADRAO) -> bool:
         """
-        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80)
+        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80 no 9x9)
         :param valor: Valor que deseja verificar se é ou não consistente para aquele nó
         :param atribuicao: Dicionário que contem os valores atribuidos a cada nó
+        :param geometria: Geometria do tabuleiro (por padrão, 9x9)
         :return: Um booleano falando se é possível ou não atribuir aquele valor àquele nó
         """
-        viz = Sudoku.vizinhos(no)
-        for v in viz:
-            if v in atribuicao.keys() and atribuicao[v] == valor:  # Verificamos se é possível adicionar aquele valor ao no
+        for v in geometria.vizinhos[no]:
+            if atribuicao.get(v) == valor:  # Verificamos se é possível adicionar aquele valor ao no
                 return False
 
         return True
@@ -424,24 +1848,22 @@ class Sudoku:
         # Deve "Falhar primeiro"
         X, D, C = csp
 
-        aux_D = D.copy()
-        [aux_D.pop(k) for k in atribuicao.keys()]
-
-        var = min(aux_D, key=lambda key: len(aux_D[key]))  # Valor com o menor domínio possível
+        # Valor com o menor domínio possível entre os ainda não atribuídos (sem copiarmos o domínio)
+        var = min((x for x in X if x not in atribuicao), key=lambda key: len(D[key]))
 
         return var
 
     @staticmethod
     def ordena_valores(no: int, csp: tuple, atribuicao: dict) -> list:
         """
-        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80)
+        :param no: Valor inteiro que representa uma posição no problema sudoku (vai de 0 a 80 no 9x9)
         :param csp: Problema modelado como um csp
         :param atribuicao: Dicionário que contem os valores atribuidos a cada nó
         :return: Uma lista ordenando o domínio daquele nó em ordem de "Falha por ultimo"
         """
         X, D, C = csp
 
-        viz = Sudoku.vizinhos(no)
+        viz = C[no]  # As restrições de um nó são os seus vizinhos
 
         # É uma lista de tuplas onde o primeiro elemento é o valor e o segundo a ocorrencia dele no dominio de seus vizinhos
         valor_ocor = [(valor, sum([valor in D[v] for v in viz])) for valor in D[no] if no not in atribuicao.keys()]
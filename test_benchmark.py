@@ -0,0 +1,40 @@
+import copy
+import unittest
+from benchmark import compara, executa_corpus
+
+
+class BenchmarkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with open('arquivos_de_texto/exemplo_problemas.txt') as arqv:
+            self.problemas = [linha.strip() for linha in arqv]
+
+    def test_executa_corpus(self):
+        resumo = executa_corpus('DLX', self.problemas, timeout=30, aquecimento=0, repeticoes=2, medir_memoria=True,
+                                max_timeouts=1)
+        self.assertEqual((resumo['problemas'], resumo['medidos'], resumo['resolvidos']), (3, 3, 3))
+        self.assertEqual((resumo['timeouts'], resumo['pulados']), (0, 0))
+        self.assertLessEqual(resumo['p50'], resumo['p95'])
+        self.assertLessEqual(resumo['p95'], resumo['max'])
+        self.assertGreater(resumo['memoria_pico'], 0)
+
+    # Depois de estourar o tempo no problema difícil, os problemas seguintes do arquivo são pulados
+    def test_timeout(self):
+        resumo = executa_corpus('BFS', self.problemas[::-1], timeout=0.2, aquecimento=0, repeticoes=1,
+                                medir_memoria=False, max_timeouts=1)
+        self.assertEqual((resumo['timeouts'], resumo['pulados'], resumo['medidos']), (1, 2, 0))
+
+    def test_compara(self):
+        antigo = {'resultados': {'DLX': {'top8.txt': {'p50': 0.010, 'p95': 0.020, 'max': 0.030, 'timeouts': 0,
+                                                      'resolvidos': 8, 'memoria_pico': 1000}}}}
+        self.assertEqual(compara(antigo, antigo), [])
+
+        novo = copy.deepcopy(antigo)
+        novo['resultados']['DLX']['top8.txt']['p95'] = 0.030  # 50% mais lento
+        novo['resultados']['DLX']['top8.txt']['max'] = 0.0305  # Dentro da tolerância
+        regressoes = compara(antigo, novo)
+        self.assertEqual(len(regressoes), 1)
+        self.assertIn('p95', regressoes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
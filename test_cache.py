@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from cache import CacheSolucoes, forma_canonica
+from sudoku import Sudoku
+
+
+def transforma(estado: str) -> str:
+    """
+    :param estado: String de 81 caracteres
+    :return: Um estado equivalente: troca as faixas 0 e 2, as linhas 3 e 4, as pilhas 0 e 1 e as colunas 6 e 8, transpõe
+             o tabuleiro e troca os rótulos dos dígitos (d -> 10 - d)
+    """
+    linhas = [6, 7, 8, 4, 3, 5, 0, 1, 2]
+    colunas = [3, 4, 5, 0, 1, 2, 8, 7, 6]
+    grade = [[estado[9 * l + c] for c in colunas] for l in linhas]
+    grade = [list(linha) for linha in zip(*grade)]
+    rotulos = {str(d): str(10 - d) for d in range(1, 10)}
+    rotulos['.'] = '.'
+    return ''.join(rotulos[caracter] for linha in grade for caracter in linha)
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.problema = '.......2143.......6.9......2.15..........6378.....7.1..689..43....23..5.....7...9'
+        self.solucao = '857349621432861597619752843271583964945126378386497215768915432194238756523674189'
+
+    # Problemas equivalentes por simetria têm a mesma forma canônica
+    def test_forma_canonica(self):
+        with open('arquivos_de_texto/top50.txt') as arqv:
+            problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+        for problema in problemas:
+            canonica, _ = forma_canonica(problema)
+            self.assertEqual(forma_canonica(transforma(problema))[0], canonica)
+            self.assertEqual(canonica.count('.'), problema.count('.'))
+
+    # Um problema equivalente recebe a solução guardada, levada de volta para o seu referencial
+    def test_busca(self):
+        cache = CacheSolucoes()
+        self.assertIsNone(cache.busca(self.problema))
+        self.assertTrue(cache.guarda(self.problema, self.solucao))
+        self.assertFalse(cache.guarda(self.problema, self.solucao[::-1]))  # Solução inválida é ignorada
+
+        self.assertEqual(cache.busca(self.problema), self.solucao)
+        self.assertEqual(cache.busca(transforma(self.problema)), transforma(self.solucao))
+        self.assertEqual((cache.acertos, cache.falhas, len(cache)), (2, 1, 1))
+
+        # Pelo método resolve, o acerto não chama o algoritmo e mantém o formato de retorno
+        sudoku = Sudoku(transforma(self.problema))
+        atribuicao, solucao = sudoku.resolve('backtracking', cache=cache)
+        self.assertEqual(solucao, transforma(self.solucao))
+        self.assertEqual(atribuicao[0], solucao[0])
+        self.assertEqual(cache.acertos, 3)
+
+    # Passando do tamanho máximo, sai a solução usada há mais tempo; o arquivo guarda a mesma ordem
+    def test_lru_e_arquivo(self):
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            problemas = [linha.strip() for linha in arqv if linha.strip()][:3]
+
+        cache = CacheSolucoes(tamanho_max=2)
+        for problema in problemas[:2]:
+            Sudoku(problema).resolve('dlx', cache=cache)
+        self.assertIsNotNone(cache.busca(problemas[0]))  # O primeiro passa a ser o mais recente
+        Sudoku(problemas[2]).resolve('dlx', cache=cache)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.busca(problemas[1]))
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'cache.txt')
+            cache.salva(caminho)
+            lido = CacheSolucoes(tamanho_max=2)
+            lido.carrega(caminho)
+
+        self.assertEqual(list(lido.dados.items()), list(cache.dados.items()))
+        self.assertEqual(lido.busca(problemas[0]), Sudoku(problemas[0]).dlx())
+
+    # Linhas truncadas ou corrompidas no arquivo são ignoradas, sem impedir a leitura das demais
+    def test_arquivo_corrompido(self):
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            problemas = [linha.strip() for linha in arqv if linha.strip()][:2]
+        cache = CacheSolucoes()
+        for problema in problemas:
+            Sudoku(problema).resolve('dlx', cache=cache)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'cache.txt')
+            cache.salva(caminho)
+            self.assertEqual(os.listdir(pasta), ['cache.txt'])
+            with open(caminho) as arqv:
+                [primeira, segunda] = arqv.read().splitlines()
+            canonica, solucao = segunda.split(',')
+            with open(caminho, 'w') as arqv:
+                arqv.write('\n'.join([
+                    'lixo',
+                    primeira,
+                    f'{canonica},{solucao[:40]}',  # Gravação interrompida no meio da linha
+                    f'{canonica},{solucao[::-1]}',  # Solução que não respeita os dígitos dados
+                    f'{canonica},{solucao},extra',
+                    canonica,
+                ]))
+            lido = CacheSolucoes()
+            self.assertEqual(lido.carrega(caminho), 5)
+
+        self.assertEqual(len(lido), 1)
+        self.assertEqual(lido.busca(problemas[0]), Sudoku(problemas[0]).dlx())
+        self.assertIsNone(lido.busca(problemas[1]))
+
+        # O main continua resolvendo os problemas com o cache corrompido
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'cache.txt')
+            with open(caminho, 'w') as arqv:
+                arqv.write('lixo,123\n')
+            resultado = subprocess.run([sys.executable, 'main.py', 'dlx', 'arquivos_de_texto/top8.txt', '--compacto',
+                                        '--cache', caminho], capture_output=True, text=True)
+        self.assertEqual(resultado.returncode, 0)
+        self.assertEqual(len(resultado.stdout.splitlines()), 8)
+        self.assertIn('1 linhas inválidas', resultado.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from corpus import CorpusBinario, Fragmento, CABECALHO, eh_binario, texto_para_binario, binario_para_texto
+import corpus as modulo_corpus
+from main import resolve_arquivo
+
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, 'faceis.sdkb')
+        with open('arquivos_de_texto/problemas_faceis.txt') as arqv:
+            self.problemas = [linha.strip() for linha in arqv if linha.strip()]
+        texto_para_binario('arquivos_de_texto/problemas_faceis.txt', self.caminho)
+
+    def tearDown(self) -> None:
+        aberto = modulo_corpus._abertos.pop(self.caminho, None)
+        if aberto is not None:
+            aberto[1].close()
+        self.diretorio.cleanup()
+
+    # Cada problema ocupa 41 bytes, e a conversão de volta para texto devolve os mesmos problemas
+    def test_conversao(self):
+        self.assertTrue(eh_binario(self.caminho))
+        self.assertFalse(eh_binario('arquivos_de_texto/problemas_faceis.txt'))
+        self.assertEqual(os.path.getsize(self.caminho), CABECALHO.size + 41 * len(self.problemas))
+
+        texto = io.StringIO()
+        self.assertEqual(binario_para_texto(self.caminho, texto), len(self.problemas))
+        self.assertEqual(texto.getvalue().splitlines(), self.problemas)
+
+        # Tabuleiros maiores usam a mesma conversão (um byte por casa a partir do 16x16)
+        for arquivo in ('problemas_16x16.txt', 'problemas_25x25.txt'):
+            with open(f'arquivos_de_texto/{arquivo}') as arqv:
+                grandes = [linha.strip() for linha in arqv if linha.strip()]
+            caminho = os.path.join(self.diretorio.name, arquivo)
+            self.assertEqual(texto_para_binario(io.StringIO('\n'.join(grandes)), caminho), len(grandes))
+            with CorpusBinario(caminho) as corpus:
+                self.assertEqual(list(corpus), grandes)
+                self.assertEqual(corpus.tamanho_registro, len(grandes[0]))
+
+        # Problemas de tamanhos diferentes no mesmo arquivo não são aceitos, nem arquivos truncados ou de texto
+        with self.assertRaises(ValueError):
+            texto_para_binario(io.StringIO(self.problemas[0] + '\n' + grandes[0]), caminho)
+        with open(self.caminho, 'rb') as arqv:
+            truncado = arqv.read()[:-1]
+        with open(caminho, 'wb') as arqv:
+            arqv.write(truncado)
+        for invalido in (caminho, 'arquivos_de_texto/problemas_faceis.txt'):
+            with self.assertRaises(ValueError):
+                CorpusBinario(invalido)
+
+    # Os problemas são lidos por índice ou fatia, e os fragmentos cobrem o arquivo inteiro, em ordem
+    def test_leitura(self):
+        with CorpusBinario(self.caminho) as corpus:
+            self.assertEqual(len(corpus), len(self.problemas))
+            self.assertEqual(corpus[0], self.problemas[0])
+            self.assertEqual(corpus[-1], self.problemas[-1])
+            self.assertEqual(corpus[10:20], self.problemas[10:20])
+            self.assertEqual(corpus[::50], self.problemas[::50])
+            with self.assertRaises(IndexError):
+                corpus[len(self.problemas)]
+
+            fragmentos = [corpus.fragmento(parte, 3) for parte in range(3)]
+            self.assertEqual([p for fragmento in fragmentos for p in fragmento], self.problemas)
+            self.assertEqual(sum(len(fragmento) for fragmento in corpus.fragmentos(64)), len(self.problemas))
+
+            # Um fragmento só carrega o caminho e os índices entre processos
+            fragmento = pickle.loads(pickle.dumps(fragmentos[1]))
+            self.assertIsInstance(fragmento, Fragmento)
+            self.assertEqual(list(fragmento), self.problemas[len(self.problemas) // 3:2 * len(self.problemas) // 3])
+
+    # Cada processo mantém um único mapa por arquivo: se o arquivo é reescrito, o mapa antigo é fechado e substituído
+    def test_arquivo_reescrito(self):
+        with CorpusBinario(self.caminho) as corpus:
+            fragmento = corpus.fragmento(0, 1)
+        self.assertEqual(list(fragmento), self.problemas)
+        antigo = modulo_corpus._abertos[self.caminho][1]
+
+        texto_para_binario(io.StringIO('\n'.join(self.problemas[:10])), self.caminho)  # Outro tamanho
+        self.assertEqual(list(Fragmento(self.caminho, 0, 10)), self.problemas[:10])
+        self.assertTrue(antigo._mapa.closed)
+        self.assertEqual([caminho for caminho in modulo_corpus._abertos if caminho == self.caminho], [self.caminho])
+
+    # O main resolve os problemas do arquivo binário, inclusive com processos que leem seus próprios fragmentos
+    def test_main(self):
+        esperado = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()):
+            resolve_arquivo('DLX', self.problemas, compacto=True, saida=esperado)
+
+        for workers in (1, 2):
+            saida = io.StringIO()
+            with CorpusBinario(self.caminho) as corpus, contextlib.redirect_stderr(io.StringIO()):
+                resolve_arquivo('DLX', corpus, workers=workers, chunk=32, compacto=True, saida=saida)
+            self.assertEqual([linha.split(',')[:2] for linha in saida.getvalue().splitlines()],
+                             [linha.split(',')[:2] for linha in esperado.getvalue().splitlines()])
+
+
+if __name__ == '__main__':
+    unittest.main()
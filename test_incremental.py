@@ -0,0 +1,104 @@
+import random
+import unittest
+from incremental import SudokuIncremental
+from sudoku import Sudoku, ESGOTADO
+
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            self.problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+    def assertMesmoEstado(self, editor: SudokuIncremental) -> None:
+        """
+        Compara o editor com um editor novo, criado direto a partir das pistas atuais
+        """
+        novo = SudokuIncremental(editor.problema, editor.propagacao)
+        self.assertEqual([editor.candidatos(casa) for casa in range(81)],
+                         [novo.candidatos(casa) for casa in range(81)])
+
+    # Colocar e apagar pistas em qualquer ordem deixa os candidatos iguais aos da propagação feita do zero
+    def test_edicoes(self):
+        aleatorio = random.Random(0)
+        for propagacao in ('AC3', 'SINGLES'):
+            for problema in self.problemas[:4]:
+                editor = SudokuIncremental(propagacao=propagacao)
+                pistas = [(casa, valor) for casa, valor in enumerate(problema) if valor != '.']
+                aleatorio.shuffle(pistas)
+                for casa, valor in pistas:
+                    editor.colocar(casa, valor)
+                self.assertEqual(editor.problema, problema)
+                self.assertEqual(editor.solucao(), Sudoku(problema).dlx())
+
+                for casa, valor in aleatorio.sample(pistas, 5):
+                    editor.remover(casa)
+                    self.assertEqual(editor.problema[casa], '.')
+                    self.assertMesmoEstado(editor)
+                    self.assertTrue(editor.solucionavel())
+                    editor.colocar(casa, valor)
+                self.assertMesmoEstado(editor)
+                self.assertEqual(editor.solucao(), Sudoku(problema).dlx())
+
+    # Uma pista que contradiz as anteriores fica pendente até que a contradição seja desfeita
+    def test_conflito(self):
+        editor = SudokuIncremental()
+        editor.colocar(0, '5')
+        self.assertEqual(editor.candidatos(0), ('5',))
+        self.assertNotIn('5', editor.candidatos(1))
+        self.assertNotIn('5', editor.candidatos(72))
+
+        editor.colocar(8, '5')  # Mesma linha
+        editor.colocar(40, '1')
+        self.assertFalse(editor.consistente)
+        self.assertEqual(editor.conflito, 8)
+        self.assertIsNone(editor.solucao())
+        self.assertFalse(editor.solucionavel())
+        self.assertEqual(editor.candidatos(40), tuple('123456789'))  # Colocada depois da contradição
+
+        editor.colocar(8, '6')  # Trocar a pista desfaz a contradição e aplica as pendentes
+        self.assertTrue(editor.consistente)
+        self.assertEqual(editor.candidatos(40), ('1',))
+        self.assertEqual((editor.candidatos(0), editor.candidatos(8)), (('5',), ('6',)))
+        self.assertTrue(editor.solucionavel())
+
+        editor.colocar(1, '6')
+        self.assertEqual(editor.conflito, 1)
+        editor.remover(1)
+        self.assertTrue(editor.consistente)
+        editor.remover(3)  # Casa sem pista
+        self.assertEqual(editor.problema, '5.......6' + '.' * 31 + '1' + '.' * 40)
+
+        with self.assertRaises(ValueError):
+            editor.colocar(2, '0')
+        with self.assertRaises(IndexError):
+            editor.remover(81)
+
+    # Pistas consistentes na propagação, mas sem solução, só são detectadas pela busca (que é desfeita ao final)
+    def test_sem_solucao(self):
+        problema = '.......21...5...3.4..6.........21...8.......75.....6.....4..5...1..7.....3.......'
+        editor = SudokuIncremental(problema)
+        self.assertTrue(editor.consistente)
+        candidatos = [editor.candidatos(casa) for casa in range(81)]
+        self.assertFalse(editor.solucionavel())
+        self.assertEqual([editor.candidatos(casa) for casa in range(81)], candidatos)
+
+        editor.remover(60)
+        self.assertTrue(editor.solucionavel())
+        self.assertTrue(Sudoku.atingiu_objetivo(editor.solucao()))
+
+        editor = SudokuIncremental(propagacao='AC3')
+        self.assertEqual(editor.solucao(max_nos=1), ESGOTADO)
+        self.assertIsNone(editor.solucionavel(max_nos=1))
+        self.assertEqual(editor.candidatos(0), tuple('123456789'))
+        self.assertTrue(editor.solucionavel())
+
+    # Outros tamanhos de tabuleiro usam os símbolos da geometria
+    def test_tamanhos(self):
+        editor = SudokuIncremental('.' * 256)
+        editor.colocar(0, 'g')
+        self.assertEqual(editor.candidatos(0), ('G',))
+        self.assertTrue(Sudoku.atingiu_objetivo(editor.solucao()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import contextlib
+import importlib.util
+import io
+import unittest
+from cache import CacheSolucoes
+from main import resolve_arquivo, le_problemas
+from paralelo import Portfolio
+from sudoku import Estatisticas
+
+
+class MainTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with open('arquivos_de_texto/exemplo_problemas.txt') as arqv:
+            self.problemas = arqv.readlines()
+        self.solucao = '857349621432861597619752843271583964945126378386497215768915432194238756523674189'
+
+    def executa(self, *args, **kwargs) -> str:
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            resolve_arquivo(*args, **kwargs)
+        return saida.getvalue()
+
+    # Com mais de um processo, a saída deve continuar na ordem do arquivo
+    def test_workers(self):
+        sequencial = self.executa('DLX', self.problemas)
+        paralelo = self.executa('DLX', self.problemas, workers=2, chunk=2)
+
+        def estados_iniciais(saida: str) -> list:
+            return [bloco.split('Estado final')[0] for bloco in saida.split('=' * 40) if 'Estado inicial' in bloco]
+
+        self.assertEqual(len(estados_iniciais(paralelo)), 3)
+        self.assertEqual(estados_iniciais(sequencial), estados_iniciais(paralelo))
+        self.assertEqual(paralelo.count(f'String solução: {self.solucao}'), 3)
+        self.assertIn('problemas/s', paralelo)
+
+    def test_desordenado(self):
+        saida = self.executa('BACKTRACKING', self.problemas, workers=2, ordenado=False)
+        self.assertEqual(saida.count(f'String solução: {self.solucao}'), 3)
+
+    # No modo compacto, cada problema vira uma linha "problema,solucao,tempo" e a entrada é lida sob demanda
+    def test_compacto(self):
+        entrada = io.StringIO(''.join(self.problemas) + '\n\n')  # Linhas vazias são ignoradas
+        saida = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()) as resumo:
+            resolve_arquivo('DLX', le_problemas(entrada), workers=2, compacto=True, saida=saida)
+
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(len(linhas), 3)
+        for linha, problema in zip(linhas, self.problemas):
+            lido, solucao, tempo = linha.split(',')
+            self.assertEqual(lido, problema.strip())
+            self.assertEqual(solucao, self.solucao)
+            self.assertGreaterEqual(float(tempo), 0)
+        self.assertIn('problemas/s', resumo.getvalue())
+
+    # Com estatísticas, cada linha compacta ganha os campos de Estatisticas.CAMPOS ao final
+    def test_estatisticas(self):
+        saida = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()) as resumo:
+            resolve_arquivo('BACKTRACKING', self.problemas, compacto=True, saida=saida, com_estatisticas=True)
+
+        for linha in saida.getvalue().splitlines():
+            self.assertEqual(len(linha.split(',')), 3 + len(Estatisticas.CAMPOS))
+        self.assertIn('Estatísticas totais', resumo.getvalue())
+
+    # Linhas malformadas aparecem como "invalido" (como no modo em lote) sem interromper os demais problemas
+    def test_invalidos(self):
+        problemas = ['abc\n', self.problemas[0], 'X' * 81 + '\n']
+        for kwargs in ({}, {'workers': 2}, {'cache': CacheSolucoes()}, {'com_estatisticas': True}):
+            saida = io.StringIO()
+            with contextlib.redirect_stderr(io.StringIO()) as resumo:
+                resolve_arquivo('DLX', problemas, compacto=True, saida=saida, **kwargs)
+
+            self.assertEqual([linha.split(',')[1] for linha in saida.getvalue().splitlines()],
+                             ['invalido', self.solucao, 'invalido'])
+            self.assertIn('Entradas que não são problemas válidos: 2', resumo.getvalue())
+
+    # Com limite de nós, os problemas interrompidos aparecem como "esgotado" e são contados no resumo
+    def test_limites(self):
+        saida = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()) as resumo:
+            resolve_arquivo('A*', self.problemas, workers=2, compacto=True, saida=saida, opcoes={'max_nos': 10})
+
+        self.assertEqual([linha.split(',')[1] for linha in saida.getvalue().splitlines()], ['esgotado'] * 3)
+        self.assertIn('limite de tempo ou de nós: 3', resumo.getvalue())
+
+    # Na UNICIDADE, problemas com mais de uma solução aparecem como "multiplas" e o resumo separa os três casos
+    def test_unicidade(self):
+        multiplas = '.' * 81
+        saida = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()) as resumo:
+            resolve_arquivo('UNICIDADE', self.problemas + [multiplas], workers=2, compacto=True, saida=saida,
+                            cache=CacheSolucoes())
+
+        solucoes = [linha.split(',')[1] for linha in saida.getvalue().splitlines()]
+        self.assertEqual(solucoes, [self.solucao] * 3 + ['multiplas'])
+        self.assertIn('Solução única: 3, mais de uma solução: 1, sem solução: 0', resumo.getvalue())
+
+    # No portfólio, cada linha traz as estatísticas do algoritmo vencedor e o resumo conta as vitórias
+    def test_portfolio(self):
+        saida = io.StringIO()
+        with Portfolio(('DFS', 'DLX')) as portfolio, contextlib.redirect_stderr(io.StringIO()) as resumo:
+            resolve_arquivo('PORTFOLIO', self.problemas, compacto=True, saida=saida, com_estatisticas=True,
+                            paralela=portfolio)
+
+        for linha in saida.getvalue().splitlines():
+            self.assertEqual(linha.split(',')[1], self.solucao)
+            self.assertEqual(len(linha.split(',')), 3 + len(Estatisticas.CAMPOS))
+        self.assertRegex(resumo.getvalue(), r'Vitórias no portfólio: DFS: \d+, DLX: \d+')
+
+    # Com cache, problemas repetidos são respondidos sem resolver de novo e a saída continua na ordem da entrada
+    def test_cache(self):
+        problemas = self.problemas * 2
+        for workers in (1, 2):
+            cache = CacheSolucoes()
+            saida = io.StringIO()
+            with contextlib.redirect_stderr(io.StringIO()) as resumo:
+                resolve_arquivo('DLX', problemas, workers=workers, compacto=True, saida=saida, cache=cache)
+
+            linhas = saida.getvalue().splitlines()
+            self.assertEqual([linha.split(',')[0] for linha in linhas], [p.strip() for p in problemas])
+            self.assertTrue(all(linha.split(',')[1] == self.solucao for linha in linhas))
+            self.assertEqual((cache.acertos, cache.falhas), (3, 3))
+            self.assertIn('3 acertos', resumo.getvalue())
+
+    # No modo em lote, as soluções continuam na ordem do arquivo, com ou sem processos extras
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy não está instalado')
+    def test_lote(self):
+        for workers in (1, 2):
+            saida = io.StringIO()
+            with contextlib.redirect_stderr(io.StringIO()):
+                resolve_arquivo('DLX', self.problemas, workers=workers, chunk=2, compacto=True, saida=saida, lote=True)
+
+            linhas = saida.getvalue().splitlines()
+            self.assertEqual([linha.split(',')[0] for linha in linhas], [p.strip() for p in self.problemas])
+            self.assertTrue(all(linha.split(',')[1] == self.solucao for linha in linhas))
+
+
+if __name__ == '__main__':
+    unittest.main()
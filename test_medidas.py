@@ -0,0 +1,15 @@
+import unittest
+from medidas import percentil
+
+
+class MedidasTest(unittest.TestCase):
+    def test_percentil(self):
+        self.assertEqual(percentil([3, 1, 2], 50), 2)
+        self.assertEqual(percentil([1, 2, 3, 4], 50), 2.5)
+        self.assertAlmostEqual(percentil(list(range(101)), 95), 95)
+        self.assertEqual(percentil([7], 95), 7)
+        self.assertIsNone(percentil([], 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
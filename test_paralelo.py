@@ -0,0 +1,85 @@
+import threading
+import unittest
+from paralelo import BuscaParalela, Portfolio, divide
+from sudoku import Sudoku, Tabuleiro, ESGOTADO
+
+
+class ParaleloTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.busca = BuscaParalela(workers=2, partes_por_processo=4)
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            cls.problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.busca.encerra()
+
+    # Os subproblemas são o problema com algumas casas a mais e, juntos, têm exatamente as soluções do problema
+    def test_divide(self):
+        problema = self.problemas[0]
+        subproblemas, solucao = divide(problema, 20)
+        self.assertIsNone(solucao)
+        self.assertGreaterEqual(len(subproblemas), 20)
+        self.assertEqual(len(set(subproblemas)), len(subproblemas))
+        for subproblema in subproblemas:
+            self.assertTrue(all(a == '.' or a == b for a, b in zip(problema, subproblema)))
+            self.assertEqual(Tabuleiro(subproblema).conflitos, 0)
+        self.assertEqual(sum(Sudoku(s).contar_solucoes() for s in subproblemas), 1)
+
+        # Problemas já resolvidos (ou quase) saem direto da divisão; problemas com conflitos não geram nada
+        solucao = Sudoku(problema).dlx()
+        self.assertEqual(divide('.' + solucao[1:], 4), ([], solucao))
+        self.assertEqual(divide('11' + '.' * 79, 4), ([], None))
+
+    # A resposta é a mesma da busca sequencial, e o pool continua funcionando depois de cada cancelamento
+    def test_resolve(self):
+        for algoritmo in ('BACKTRACKING', 'DFS'):
+            for problema in self.problemas:
+                self.assertEqual(self.busca.resolve(problema, algoritmo), Sudoku(problema).dlx())
+            self.assertGreaterEqual(self.busca.n_subproblemas, 8)
+
+        self.assertIsNone(self.busca.resolve('.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244'))
+        self.assertEqual(self.busca.resolve(self.problemas[0], max_nos=1), ESGOTADO)
+        self.assertEqual(self.busca.resolve(self.problemas[0], 'dfs', limite_tempo=0), ESGOTADO)
+        self.assertEqual(self.busca.resolve(self.problemas[0], propagacao='SINGLES'), Sudoku(self.problemas[0]).dlx())
+        with self.assertRaises(ValueError):
+            self.busca.resolve(self.problemas[0], 'A*')
+
+    # O primeiro algoritmo a responder vence, e as vitórias de cada um são contadas
+    def test_portfolio(self):
+        with Portfolio(('dfs', 'DLX', 'DFS')) as portfolio:
+            self.assertEqual(portfolio.algoritmos, ('DFS', 'DLX'))
+            for problema in self.problemas:
+                self.assertEqual(portfolio.resolve(problema), Sudoku(problema).dlx())
+                self.assertIn(portfolio.vencedor, portfolio.algoritmos)
+                self.assertGreater(portfolio.estatisticas['nos_expandidos'], 0)
+            self.assertEqual(sum(portfolio.vitorias.values()), len(self.problemas))
+
+            self.assertIsNone(portfolio.resolve('.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244'))
+            self.assertIsNone(portfolio.vencedor)
+            self.assertEqual(portfolio.resolve(self.problemas[0], max_nos=1), ESGOTADO)
+            self.assertEqual(sum(portfolio.vitorias.values()), len(self.problemas))
+
+        # Respostas que não resolvem o problema (e.g., a solução parcial do AC3) não vencem a corrida
+        with Portfolio(('AC3',)) as portfolio:
+            self.assertIsNone(portfolio.resolve(self.problemas[0]))
+        with self.assertRaises(ValueError):
+            Portfolio(('DFS', 'XYZ'))
+        with self.assertRaises(ValueError):
+            Portfolio(())
+
+    # Um evento de cancelamento ligado interrompe a resolução como se o tempo tivesse acabado
+    def test_cancelamento(self):
+        sudoku = Sudoku(self.problemas[0])
+        sudoku.cancelamento = threading.Event()
+        sudoku.cancelamento.set()
+        self.assertEqual(sudoku.backtracking(), ESGOTADO)
+        self.assertTrue(sudoku.esgotado)
+
+        sudoku.cancelamento.clear()
+        self.assertEqual(sudoku.backtracking()[1], Sudoku(self.problemas[0]).dlx())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import unittest
+from servidor import Servidor
+
+
+class ServidorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.servidor = Servidor(workers=2, max_pendentes=2)
+        await self.servidor.inicia(porta=0)  # Porta livre qualquer
+        with open('arquivos_de_texto/exemplo_problemas.txt') as arqv:
+            self.problemas = [linha.strip() for linha in arqv if linha.strip()]
+        self.solucao = '857349621432861597619752843271583964945126378386497215768915432194238756523674189'
+
+    async def asyncTearDown(self) -> None:
+        await self.servidor.encerra()
+
+    async def conecta(self) -> tuple:
+        return await asyncio.open_connection(*self.servidor.endereco)
+
+    @staticmethod
+    async def pede(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, pedidos: list) -> list:
+        # Envia todos os pedidos de uma vez (pipelining) e lê uma resposta para cada um
+        writer.write(b''.join(json.dumps(pedido).encode() + b'\n' for pedido in pedidos))
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in pedidos]
+
+    # Vários clientes com vários pedidos cada: mais pedidos que "max_pendentes", todos respondidos com o id certo
+    async def test_clientes(self):
+        async def cliente(c: int) -> list:
+            reader, writer = await self.conecta()
+            pedidos = [{'id': f'{c}-{i}', 'problema': p, 'algoritmo': alg}
+                       for i, (p, alg) in enumerate(zip(self.problemas * 2, ['DLX', 'backtracking', 'A*'] * 2))]
+            respostas = await self.pede(reader, writer, pedidos)
+            writer.close()
+            await writer.wait_closed()
+            return respostas
+
+        todas = await asyncio.gather(*(cliente(c) for c in range(3)))
+        for c, respostas in enumerate(todas):
+            self.assertEqual(sorted(r['id'] for r in respostas), sorted(f'{c}-{i}' for i in range(6)))
+            self.assertTrue(all(r['estado'] == 'resolvido' and r['solucao'] == self.solucao for r in respostas))
+            self.assertTrue(all(r['latencia'] >= r['tempo'] >= 0 for r in respostas))
+
+        reader, writer = await self.conecta()
+        [resposta] = await self.pede(reader, writer, [{'id': 'm', 'comando': 'metricas'}])
+        metricas = resposta['metricas']
+        self.assertEqual(metricas['atendidos'], 18)
+        self.assertLessEqual(metricas['pendentes'], 2)
+        self.assertEqual(metricas['clientes'], 1)
+        self.assertIsNotNone(metricas['latencia_p95'])
+        writer.close()
+        await writer.wait_closed()
+
+    # Pedidos inválidos recebem uma mensagem de erro e a conexão continua aberta; limites viram "esgotado"
+    async def test_erros_e_limites(self):
+        reader, writer = await self.conecta()
+        respostas = await self.pede(reader, writer, [
+            'nada',
+            {'id': 1, 'problema': '123'},
+            {'id': 2, 'problema': self.problemas[0], 'algoritmo': 'xyz'},
+            {'id': 3, 'problema': self.problemas[0], 'algoritmo': 'A*', 'max_nos': 10},
+            {'id': 4, 'problema': self.problemas[0], 'stats': True},
+        ])
+        respostas = {r.get('id'): r for r in respostas}
+
+        self.assertIn('erro', respostas[None])
+        self.assertIn('erro', respostas[1])
+        self.assertIn('erro', respostas[2])
+        self.assertEqual((respostas[3]['estado'], respostas[3]['solucao']), ('esgotado', None))
+        self.assertEqual(respostas[4]['solucao'], self.solucao)
+        self.assertGreater(respostas[4]['estatisticas']['nos_expandidos'], 0)
+        self.assertEqual(self.servidor.erros, 3)
+        writer.close()
+        await writer.wait_closed()
+
+    # Campos com tipos errados (listas, objetos) também recebem erro, e a conexão continua atendendo
+    async def test_tipos_invalidos(self):
+        reader, writer = await self.conecta()
+        respostas = await asyncio.wait_for(self.pede(reader, writer, [
+            {'id': 1, 'problema': self.problemas[0], 'max_nos': [1]},
+            {'id': 2, 'problema': self.problemas[0], 'timeout': {'s': 1}},
+            {'id': 3, 'problema': self.problemas[0], 'timeout': 'abc'},
+            {'id': 4, 'problema': None},
+            {'id': 5, 'problema': self.problemas[0], 'timeout': None, 'max_nos': 1000},
+        ]), timeout=10)
+        respostas = {r.get('id'): r for r in respostas}
+
+        for i in range(1, 5):
+            self.assertIn('erro', respostas[i])
+        self.assertIn('max_nos', respostas[1]['erro'])
+        self.assertEqual(respostas[5]['solucao'], self.solucao)
+        self.assertEqual(self.servidor.erros, 4)
+        writer.close()
+        await writer.wait_closed()
+
+    # Conexões ociosas (que não enviam nada) não ocupam vagas: os outros clientes continuam sendo atendidos
+    async def test_conexoes_ociosas(self):
+        ociosas = [await self.conecta() for _ in range(self.servidor.max_pendentes + 1)]
+        reader, writer = await self.conecta()
+        respostas = await asyncio.wait_for(self.pede(reader, writer, [
+            {'id': i, 'problema': p} for i, p in enumerate(self.problemas)]), timeout=10)
+        self.assertTrue(all(r['solucao'] == self.solucao for r in respostas))
+        self.assertEqual(self.servidor._vagas._value, self.servidor.max_pendentes)
+
+        for _, ociosa in ociosas + [(reader, writer)]:
+            ociosa.close()
+            await ociosa.wait_closed()
+
+    # Uma enxurrada de erros e de pedidos de métricas, sem ler as respostas, não acumula tarefas no servidor
+    async def test_enxurrada(self):
+        async def le(n: int) -> list:
+            return [json.loads(await reader.readline()) for _ in range(n)]
+
+        reader, writer = await self.conecta()
+        writer.write(b'nada\n' * 5000 + b''.join(json.dumps({'id': i, 'comando': 'metricas'}).encode() + b'\n'
+                                                  for i in range(30000)))
+        await asyncio.sleep(0.5)  # O cliente não lê as respostas: o servidor para de ler os pedidos
+        self.assertLess(len(asyncio.all_tasks()), 10)
+
+        respostas = await asyncio.wait_for(le(35000), timeout=30)
+        self.assertEqual(sum('erro' in r for r in respostas), 5000)
+        self.assertEqual(sorted(r['id'] for r in respostas if 'metricas' in r), list(range(30000)))
+        [resposta] = await asyncio.wait_for(self.pede(reader, writer, [{'id': 'p', 'problema': self.problemas[0]}]),
+                                            timeout=10)
+        self.assertEqual(resposta['solucao'], self.solucao)
+        self.assertEqual((self.servidor.erros, self.servidor._vagas._value), (5000, self.servidor.max_pendentes))
+        writer.close()
+        await writer.wait_closed()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
+import contextlib
+import importlib.util
+import io
 import unittest
-from sudoku import Sudoku
+from sudoku import Sudoku, Tabuleiro, MotorCSP, Estatisticas, ALGORITMOS, ESGOTADO, MULTIPLAS, TAMANHO_EMPACOTADO
+from sudoku import INVALIDO, Geometria, GEOMETRIA_PADRAO, NIVEIS_PROPAGACAO, empacota, desempacota
+from sudoku import UNIDADES, UNIDADES_DA_CASA, VIZINHOS, MASCARA_VIZINHOS
 
 
 class SudokuTest(unittest.TestCase):
@@ -25,24 +30,203 @@ class SudokuTest(unittest.TestCase):
         self.assertEqual(self.sudoku3.busca_largura(), self.solucao3)
         self.assertEqual(self.sudoku4.busca_largura(), self.solucao4)
 
+    # A BFS guarda as fronteiras empacotadas e deve parar (sem erro) quando o limite de memória é atingido
+    def test_busca_largura_memoria(self):
+        for estado in (self.sudoku4.problema, self.solucao4, '.' * 81):
+            self.assertEqual(len(empacota(estado)), TAMANHO_EMPACOTADO)
+            self.assertEqual(desempacota(empacota(estado)), estado)
+
+        sudoku = Sudoku(self.sudoku4.problema)
+        with contextlib.redirect_stderr(io.StringIO()) as erro:
+            self.assertEqual(sudoku.busca_largura(memoria_max=100_000), 'Não foi possível resolver o problema.')
+        self.assertIsNone(sudoku.solucao)
+        self.assertIn('estados no nível atual', erro.getvalue())
+
     def test_busca_profundidade(self):
         self.assertEqual(self.sudoku1.busca_profundidade(), self.solucao1)
         self.assertEqual(self.sudoku2.busca_profundidade(), self.solucao2)
         self.assertEqual(self.sudoku3.busca_profundidade(), self.solucao3)
         self.assertEqual(self.sudoku4.busca_profundidade(), self.solucao4)
 
+    # A DFS com MRV sobre um único tabuleiro expande poucos nós e a pilha nunca passa do número de casas vazias
+    def test_busca_profundidade_pilha(self):
+        estatisticas = Estatisticas()
+        self.assertEqual(self.sudoku4.busca_profundidade(estatisticas=estatisticas), self.solucao4)
+        self.assertLess(estatisticas.nos_expandidos, 10_000)
+        self.assertLessEqual(estatisticas.fronteira_max, self.sudoku4.problema.count('.'))
+
+        # Problemas sem solução terminam com a mensagem de falha (no primeiro, a casa 8 não tem dígitos possíveis)
+        self.assertEqual(Sudoku('12345678.' + '........9' + '.' * 63).busca_profundidade(),
+                         'Não foi possível resolver o problema.')
+        self.assertEqual(Sudoku('11' + '.' * 79).busca_profundidade(), 'Não foi possível resolver o problema.')
+
     def test_busca_A_estrela(self):
         self.assertEqual(self.sudoku1.busca_A_estrela(), self.solucao1)
         self.assertEqual(self.sudoku2.busca_A_estrela(), self.solucao2)
         self.assertEqual(self.sudoku3.busca_A_estrela(), self.solucao3)
         self.assertEqual(self.sudoku4.busca_A_estrela(), self.solucao4)
 
+    # A fronteira em heap não deve expandir o mesmo estado duas vezes e deve resolver os problemas difíceis do top8
+    def test_busca_A_estrela_fronteira(self):
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+        for problema in problemas:
+            expandidos = []
+            solucao = Sudoku(problema).busca_A_estrela(gancho=lambda e, estado: expandidos.append(estado.estado))
+            self.assertTrue(Sudoku.atingiu_objetivo(solucao))
+            self.assertEqual(len(expandidos), len(set(expandidos)))
+
+        # A casa escolhida é a mais restrita (no sudoku4, a casa 0 tem 3 dígitos possíveis e a casa 2 só 2)
+        tabuleiro = Tabuleiro(self.sudoku4.problema)
+        pos, livres = tabuleiro.mais_restrita()
+        self.assertEqual(len(livres), min(len(tabuleiro.livres(p)) for p in range(81) if tabuleiro.estado[p] == '.'))
+        self.assertEqual(Sudoku.custo(tabuleiro), len(livres))
+
     def test_backtracking(self):
         self.assertEqual(self.sudoku1.backtracking()[1], self.solucao1)
         self.assertEqual(self.sudoku2.backtracking()[1], self.solucao2)
         self.assertEqual(self.sudoku3.backtracking()[1], self.solucao3)
         self.assertEqual(self.sudoku4.backtracking()[1], self.solucao4)
 
+        # Atribuições fora do domínio não têm solução, em qualquer nível de propagação
+        vazia = self.sudoku1.problema.index('.')
+        for propagacao in NIVEIS_PROPAGACAO:
+            for atribuicao in ({vazia: 'Z'}, {vazia: self.solucao1[vazia], 0: 'Z'}):
+                csp = Sudoku.gera_csp(self.sudoku1.problema)
+                self.assertEqual(self.sudoku1.backtracking(csp, atribuicao, propagacao=propagacao), ({}, None))
+
+            # Domínio vazio dado direto ao motor (sem passar pelo backtracking)
+            X, D, C = Sudoku.gera_csp(self.sudoku1.problema)
+            D[vazia] = set()
+            self.assertIsNone(next(MotorCSP((X, D, C), propagacao=propagacao).solucoes(), None))
+
+    def test_dlx(self):
+        self.assertEqual(self.sudoku1.dlx(), self.solucao1)
+        self.assertEqual(self.sudoku2.dlx(), self.solucao2)
+        self.assertEqual(self.sudoku3.dlx(), self.solucao3)
+        self.assertEqual(self.sudoku4.dlx(), self.solucao4)
+
+        # Problema com dois 4 na mesma linha não tem solução
+        sudoku_errado = Sudoku('.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244')
+        self.assertEqual(sudoku_errado.dlx(), 'Não foi possível resolver o problema.')
+        self.assertIsNone(sudoku_errado.solucao)
+
+    # A contagem para no limite; a unicidade só devolve a solução quando ela é única
+    def test_contar_solucoes(self):
+        sem_solucao = Sudoku('.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244')
+        # Os 8 e 6 das casas 0, 6, 18 e 24 formam um retângulo em dois quadrantes: sem eles, dá para trocá-los
+        duas_solucoes = Sudoku(''.join('.' if i in (0, 6, 18, 24) else c for i, c in enumerate(self.solucao4)))
+        quase_vazio = Sudoku(self.solucao1[:9] + '.' * 72)
+
+        for busca in ('DLX', 'BACKTRACKING'):
+            self.assertEqual(self.sudoku4.contar_solucoes(busca=busca), 1)
+            self.assertEqual(self.sudoku4.solucao, self.solucao4)
+            self.assertEqual(sem_solucao.contar_solucoes(busca=busca), 0)
+            self.assertIsNone(sem_solucao.solucao)
+            self.assertEqual(quase_vazio.contar_solucoes(limite=5, busca=busca), 5)
+            self.assertTrue(Sudoku.atingiu_objetivo(quase_vazio.solucao))
+            self.assertEqual(duas_solucoes.contar_solucoes(limite=None, busca=busca), 2)
+
+            self.assertEqual(self.sudoku4.unicidade(busca=busca), self.solucao4)
+            self.assertEqual(quase_vazio.unicidade(busca=busca), MULTIPLAS)
+            self.assertIsNone(quase_vazio.solucao)
+            self.assertEqual(quase_vazio.situacao(), MULTIPLAS)
+            self.assertEqual(sem_solucao.unicidade(busca=busca), 'Não foi possível resolver o problema.')
+            self.assertIsNone(sem_solucao.situacao())
+
+        # Todos os problemas do top50 têm solução única (o backtracking, mais lento, confere só os primeiros)
+        with open('arquivos_de_texto/top50.txt') as arqv:
+            problemas = [linha.strip() for linha in arqv if linha.strip()]
+        for problema in problemas[:10]:
+            self.assertEqual(Sudoku(problema).contar_solucoes(busca='BACKTRACKING'), 1)
+        self.assertEqual([Sudoku(problema).resolve('UNICIDADE') for problema in problemas],
+                         [Sudoku(problema).dlx() for problema in problemas])
+
+    # O resolvedor em lote deve devolver as soluções na ordem da entrada (None para problemas sem solução)
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy não está instalado')
+    def test_resolver_lote(self):
+        sem_solucao = '.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244'
+        problemas = [self.sudoku4.problema, self.sudoku1.problema + '\n', sem_solucao, self.sudoku2.problema,
+                     self.sudoku3.problema]
+        solucoes = [self.solucao4, self.solucao1, None, self.solucao2, self.solucao3]
+
+        self.assertEqual(Sudoku.resolver_lote(problemas), solucoes)
+        self.assertEqual(Sudoku.resolver_lote(problemas, busca='BACKTRACKING', tamanho_bloco=2), solucoes)
+        self.assertEqual(Sudoku.resolver_lote([]), [])
+
+        # Problemas difíceis dependem da busca depois da propagação
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            dificeis = [linha.strip() for linha in arqv if linha.strip()]
+        self.assertEqual(Sudoku.resolver_lote(dificeis), [Sudoku(problema).dlx() for problema in dificeis])
+
+        # Tamanhos diferentes no mesmo bloco são propagados separadamente e voltam na ordem da entrada
+        with open('arquivos_de_texto/problemas_16x16.txt') as arqv:
+            grandes = [linha.strip() for linha in arqv if linha.strip()][:2]
+        misturados = [grandes[0], self.sudoku4.problema, grandes[1]]
+        self.assertEqual(Sudoku.resolver_lote(misturados), [Sudoku(problema).dlx() for problema in misturados])
+
+        # Símbolos minúsculos valem como em Sudoku(problema), e entradas inválidas não interrompem o lote
+        minusculos = [grandes[0].lower(), self.sudoku4.problema.lower()]
+        self.assertEqual(Sudoku.resolver_lote(minusculos), [Sudoku(problema).dlx() for problema in minusculos])
+        self.assertEqual(Sudoku.resolver_lote(['123', grandes[1], 'X' * 81]),
+                         [INVALIDO, Sudoku(grandes[1]).dlx(), INVALIDO])
+
+    # Os índices de cada tamanho de tabuleiro (quadrantes k x k) são calculados uma vez e compartilhados
+    def test_geometria(self):
+        self.assertIs(Geometria.para(3), GEOMETRIA_PADRAO)
+        self.assertIs(GEOMETRIA_PADRAO.vizinhos, VIZINHOS)
+        for k in range(2, 6):
+            geometria = Geometria.para(k)
+            n = k * k
+            self.assertIs(Geometria.do_problema('.' * (n * n)), geometria)
+            self.assertEqual(len(geometria.unidades), 3 * n)
+            self.assertTrue(all(len(set(unidade)) == n for unidade in geometria.unidades))
+            for pos in range(n * n):
+                self.assertEqual(len(geometria.vizinhos[pos]), 3 * (n - 1) - 2 * (k - 1))
+                for u in geometria.unidades_da_casa[pos]:
+                    self.assertIn(pos, geometria.unidades[u])
+            self.assertEqual(geometria.digitos_livres[0], tuple(geometria.simbolos))
+            self.assertEqual(geometria.valores_livres[0b101], (2,) + tuple(range(4, n + 1)))
+            self.assertEqual(geometria.quantidade_livres[0b101], n - 2)
+
+            estado = (geometria.simbolos * n)[:n * n - 1] + '.'
+            self.assertEqual(len(empacota(estado, geometria)), geometria.tamanho_empacotado)
+            self.assertEqual(desempacota(empacota(estado, geometria), geometria), estado)
+
+        self.assertRaises(ValueError, Geometria.do_problema, '.' * 80)
+        self.assertRaises(ValueError, Geometria.para, 6)
+
+    # Tabuleiros 16x16 e 25x25 (símbolos de '1' a '9' e depois letras) pelos mesmos algoritmos
+    def test_tabuleiros_maiores(self):
+        for arquivo in ('arquivos_de_texto/problemas_16x16.txt', 'arquivos_de_texto/problemas_25x25.txt'):
+            with open(arquivo) as arqv:
+                problemas = [linha.strip() for linha in arqv if linha.strip()]
+
+            for problema in problemas:
+                solucao = Sudoku(problema).dlx()
+                self.assertTrue(Sudoku.atingiu_objetivo(solucao))
+                self.assertTrue(all(p == '.' or p == s for p, s in zip(problema, solucao)))
+
+                for algoritmo in ('BACKTRACKING', 'DFS', 'A*'):
+                    sudoku = Sudoku(problema.lower())  # Letras minúsculas também são aceitas
+                    sudoku.resolve(algoritmo)
+                    self.assertTrue(Sudoku.atingiu_objetivo(sudoku.solucao), algoritmo)
+                    self.assertTrue(all(p == '.' or p == s for p, s in zip(problema, sudoku.solucao)))
+
+                self.assertTrue(Sudoku(problema).ac3())
+
+            # A BFS empacota os estados com um byte por casa a partir do 16x16
+            quase_completo = ''.join('.' if pos % 97 == 0 else caracter for pos, caracter in enumerate(solucao))
+            self.assertEqual(Sudoku(quase_completo).busca_largura(), solucao)
+            conflito = quase_completo[0] + solucao[2] + quase_completo[2:]  # Casas 1 e 2 com o mesmo símbolo
+            self.assertEqual(Sudoku(conflito).dlx(), 'Não foi possível resolver o problema.')
+            self.assertIn('+-------', repr(Sudoku(problemas[0])))
+
+        self.assertTrue(Sudoku.atingiu_objetivo('1234341221434321'))
+        self.assertFalse(Sudoku.atingiu_objetivo('1234341221434312'))
+        self.assertFalse(Sudoku.atingiu_objetivo('1' * 80))
+
     # No caso do AC3, deseja-se verificar se é possível tornar os problemas arco-consistentes
     def test_ac3(self):
         # O primeiro inconsistente tem dois 4 em seguidas (na posição 79 e 80)
@@ -60,6 +244,188 @@ class SudokuTest(unittest.TestCase):
         self.assertFalse(sudoku_errado1.ac3())
         self.assertFalse(sudoku_errado2.ac3())
 
+    # As funções de busca devem dar o mesmo resultado para a string e para o Tabuleiro equivalente
+    def test_tabuleiro(self):
+        problema = self.sudoku1.problema
+        tabuleiro = Tabuleiro(problema)
+
+        self.assertEqual(tabuleiro.vazias, problema.count('.'))
+        self.assertEqual(Sudoku.acoes(tabuleiro), Sudoku.acoes(problema))
+        self.assertEqual(Sudoku.acoes(problema), ['2', '6', '9'])
+        self.assertEqual(str(Sudoku.resultado(tabuleiro, '6')), Sudoku.resultado(problema, '6'))
+
+        self.assertTrue(Sudoku.atingiu_objetivo(Tabuleiro(self.solucao1)))
+        self.assertTrue(Sudoku.atingiu_objetivo(self.solucao1))
+        self.assertFalse(Sudoku.atingiu_objetivo(tabuleiro))
+
+        # Trocando os dois primeiros dígitos da solução, o tabuleiro fica cheio mas com repetições nas colunas
+        errado = self.solucao1[1] + self.solucao1[0] + self.solucao1[2:]
+        self.assertFalse(Sudoku.atingiu_objetivo(Tabuleiro(errado)))
+        self.assertFalse(Sudoku.atingiu_objetivo(errado))
+
+        # Preenchendo todas as casas vazias, uma a uma, com o dígito da solução
+        for _ in range(problema.count('.')):
+            pos = tabuleiro.estado.find('.')
+            self.assertIn(self.solucao1[pos], Sudoku.acoes(tabuleiro))
+            tabuleiro = Sudoku.resultado(tabuleiro, self.solucao1[pos])
+        self.assertTrue(Sudoku.atingiu_objetivo(tabuleiro))
+        self.assertEqual(Sudoku.acoes(tabuleiro), [])
+
+    # O índice pré-calculado deve conter, para cada casa, os 20 vizinhos da linha, coluna e quadrante
+    def test_vizinhos(self):
+        self.assertEqual(Sudoku.vizinhos(0), {1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 18, 19, 20, 27, 36, 45, 54, 63, 72})
+        self.assertEqual(Sudoku.vizinhos(40), {36, 37, 38, 39, 41, 42, 43, 44, 4, 13, 22, 31, 49, 58, 67, 76,
+                                               30, 32, 48, 50})
+
+        for no in range(81):
+            self.assertEqual(len(VIZINHOS[no]), 20)
+            self.assertEqual(set(VIZINHOS[no]), Sudoku.vizinhos(no))
+            self.assertEqual(MASCARA_VIZINHOS[no], sum(1 << n for n in VIZINHOS[no]))
+            for u in UNIDADES_DA_CASA[no]:
+                self.assertIn(no, UNIDADES[u])
+                self.assertTrue(set(UNIDADES[u]) - {no} <= Sudoku.vizinhos(no))
+
+    # A revisão só deve remover um valor quando o domínio do vizinho tiver apenas aquele valor
+    def test_revisa(self):
+        X, D, C = Sudoku.gera_csp(self.sudoku1.problema)
+        self.assertIs(C, VIZINHOS)  # Restrições implícitas (nó diferente de cada vizinho)
+
+        # A casa 0 tem domínio {1, ..., 9} e a casa 1 (vizinha) já vale 5
+        revisado, (X, D, C) = Sudoku.revisa((X, D, C), 0, 1)
+        self.assertTrue(revisado)
+        self.assertNotIn('5', D[0])
+        self.assertEqual(len(D[0]), 8)
+
+        # Revisar de novo o mesmo arco não muda nada, assim como revisar contra uma casa vazia
+        self.assertFalse(Sudoku.revisa((X, D, C), 0, 1)[0])
+        self.assertFalse(Sudoku.revisa((X, D, C), 0, 2)[0])
+
+    # Desfazer a trilha deve voltar exatamente aos domínios (e contadores) de antes da atribuição
+    def test_motor_csp(self):
+        motor = MotorCSP(Sudoku.gera_csp(self.sudoku4.problema))
+        self.assertTrue(motor.propaga([no for no in motor.X if len(motor.D[no]) == 1]))
+
+        dominios = {no: set(d) for no, d in motor.D.items()}
+        tamanhos = [set(t) for t in motor.por_tamanho]
+        ocorrencias = [dict(o) for o in motor.ocorrencias]
+
+        no = motor.seleciona_var()
+        self.assertEqual(len(motor.D[no]), min(len(d) for d in motor.D.values() if len(d) > 1))
+        self.assertEqual(sorted(motor.ordena_valores(no)), sorted(motor.D[no]))
+
+        marca = len(motor.trilha)
+        motor.atribui(no, motor.ordena_valores(no)[0])
+        self.assertNotEqual(motor.D, dominios)
+
+        motor.desfaz(marca)
+        self.assertEqual(motor.D, dominios)
+        self.assertEqual(motor.por_tamanho, tamanhos)
+        self.assertEqual(motor.ocorrencias, ocorrencias)
+
+        # O primeiro resultado do gerador é a solução do problema
+        solucao = next(motor.solucoes())
+        self.assertEqual(''.join(solucao[x] for x in motor.X), self.solucao4)
+
+    # Cada nível de propagação deduz o que os anteriores deduzem e mais alguma coisa
+    def test_niveis_propagacao(self):
+        def motor_vazio(nivel: str, remocoes: dict) -> MotorCSP:
+            motor = MotorCSP(Sudoku.gera_csp('.' * 81), propagacao=nivel)
+            for no, valores in remocoes.items():
+                for valor in valores:
+                    motor.remove(no, valor)
+            return motor
+
+        # Par nu: as casas 0 e 1 só aceitam 1 e 2, que saem do resto da linha 0 e do quadrante 0
+        motor = motor_vazio('PARES', {0: '3456789', 1: '3456789'})
+        self.assertGreater(motor.deducoes([]), 0)
+        self.assertTrue(all(not {'1', '2'} & motor.D[no] for no in (2, 8, 9, 20)))
+        self.assertEqual(motor.D[27], set('123456789'))  # A coluna 0 não é afetada
+
+        # Par oculto: 3 e 4 só cabem nas casas 0 e 1 da linha 0, que ficam só com eles
+        motor = motor_vazio('PARES', {no: '34' for no in range(2, 9)})
+        motor.deducoes([])
+        self.assertEqual((motor.D[0], motor.D[1]), ({'3', '4'}, {'3', '4'}))
+
+        # Apontamento: no quadrante 0, o 5 só cabe na linha 0, então sai do restante da linha (só no último nível)
+        remocoes = {no: '5' for no in (9, 10, 11, 18, 19, 20)}
+        motor = motor_vazio('PARES', remocoes)
+        motor.deducoes([])
+        self.assertIn('5', motor.D[8])
+        motor = motor_vazio('APONTAMENTO', remocoes)
+        motor.deducoes([])
+        self.assertTrue(all('5' not in motor.D[no] for no in range(3, 9)))
+
+        # Com singles ocultos, o primeiro problema do top50 sai só com a propagação; no top8, os nós não aumentam
+        with open('arquivos_de_texto/top50.txt') as arqv:
+            problema = arqv.readline().strip()
+        nos = []
+        for nivel in NIVEIS_PROPAGACAO:
+            estatisticas = Estatisticas()
+            self.assertEqual(Sudoku(problema).backtracking(estatisticas=estatisticas, propagacao=nivel)[1],
+                             Sudoku(problema).dlx())
+            nos.append(estatisticas.nos_expandidos)
+        self.assertGreater(nos[0], 0)
+        self.assertEqual(nos[1:], [0] * 3)
+
+        with open('arquivos_de_texto/top8.txt') as arqv:
+            dificeis = [linha.strip() for linha in arqv if linha.strip()]
+        nos = []
+        for nivel in NIVEIS_PROPAGACAO:
+            estatisticas = Estatisticas()
+            for problema in dificeis:
+                self.assertTrue(Sudoku.atingiu_objetivo(
+                    Sudoku(problema).backtracking(estatisticas=estatisticas, propagacao=nivel)[1]))
+            nos.append(estatisticas.nos_expandidos)
+        self.assertEqual(nos, sorted(nos, reverse=True))
+
+        # Problemas sem solução continuam sem solução em todos os níveis
+        sem_solucao = '.5..83.17...1..4..3.4..56.8....3...9.9.8245....6....7...9....5...729..861.36.7244'
+        for nivel in NIVEIS_PROPAGACAO:
+            self.assertIsNone(Sudoku(sem_solucao).backtracking(propagacao=nivel)[1])
+        with self.assertRaises(ValueError):
+            Sudoku(problema).backtracking(propagacao='xyz')
+
+    # Todos os algoritmos devem preencher as estatísticas e chamar o gancho a cada nó expandido
+    def test_estatisticas(self):
+        for algoritmo in ALGORITMOS:
+            chamadas = []
+            estatisticas = Estatisticas()
+            Sudoku(self.sudoku4.problema).resolve(algoritmo, estatisticas=estatisticas,
+                                                  gancho=lambda e, estado: chamadas.append(estado))
+
+            self.assertEqual(estatisticas.algoritmo, algoritmo)
+            self.assertEqual(len(chamadas), estatisticas.nos_expandidos)
+            self.assertGreaterEqual(estatisticas.tempo_busca + estatisticas.tempo_propagacao, 0)
+            if algoritmo == 'AC3':
+                self.assertGreater(estatisticas.revisoes, 0)
+            else:
+                self.assertGreater(estatisticas.nos_expandidos, 0)
+                self.assertGreater(estatisticas.profundidade_max, 0)
+
+        # O backtracking deve registrar a propagação feita a cada atribuição
+        estatisticas = Estatisticas()
+        self.sudoku4.backtracking(estatisticas=estatisticas)
+        self.assertGreater(estatisticas.revisoes, 0)
+        self.assertGreater(estatisticas.tempo_propagacao, 0)
+
+    # Com o limite de nós (ou de tempo) esgotado, todos os algoritmos param e devolvem ESGOTADO com estatísticas parciais
+    def test_limites(self):
+        for algoritmo in ALGORITMOS:
+            sudoku = Sudoku(self.sudoku4.problema)
+            estatisticas = Estatisticas()
+            self.assertEqual(sudoku.resolve(algoritmo, max_nos=2, estatisticas=estatisticas), ESGOTADO)
+            self.assertTrue(sudoku.esgotado)
+            self.assertIsNone(sudoku.solucao)
+            self.assertLessEqual(estatisticas.nos_expandidos, 2)
+
+            # Com limites folgados, a resolução termina normalmente
+            sudoku.resolve(algoritmo, limite_tempo=60, max_nos=10 ** 6)
+            self.assertFalse(sudoku.esgotado)
+
+        sudoku = Sudoku(self.sudoku4.problema)
+        self.assertEqual(sudoku.busca_largura(limite_tempo=0), ESGOTADO)
+        self.assertEqual(sudoku.busca_A_estrela(limite_tempo=60), self.solucao4)
+
     def tearDown(self) -> None:
         pass
 